@@ -0,0 +1,333 @@
+import numpy as np
+
+
+def to_banded(input_matrix: np.array, lower: int, upper: int) -> np.array:
+    """
+    Given a square matrix and its lower and upper bandwidths, returns the matrix in LAPACK
+    style band storage. Row upper + i - j, column j of the band storage holds entry (i, j) of
+    the matrix, so each diagonal of the matrix becomes one row.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square banded matrix.
+    lower : int
+        Number of nonzero diagonals below the main diagonal.
+    upper : int
+        Number of nonzero diagonals above the main diagonal.
+
+    Returns
+    -------
+    np.array
+        Band storage of shape (lower + upper + 1, n).
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square or a bandwidth is negative.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if lower < 0 or upper < 0:
+        raise ValueError("Bandwidths must not be negative")
+    n = input_matrix.shape[0]
+    banded = np.zeros((lower + upper + 1, n))
+    for offset in range(max(-lower, 1 - n), min(upper, n - 1) + 1):
+        diagonal = np.diagonal(input_matrix, offset)
+        if offset >= 0:
+            banded[upper - offset, offset:] = diagonal
+        else:
+            banded[upper - offset, :n + offset] = diagonal
+    return banded
+
+
+def from_banded(banded: np.array, lower: int, upper: int) -> np.array:
+    """
+    Given a matrix in LAPACK style band storage and its lower and upper bandwidths, returns
+    the full square matrix.
+
+    Parameters
+    ----------
+    banded : np.array
+        Band storage of shape (lower + upper + 1, n).
+    lower : int
+        Number of nonzero diagonals below the main diagonal.
+    upper : int
+        Number of nonzero diagonals above the main diagonal.
+
+    Returns
+    -------
+    np.array
+        Full square matrix.
+
+    Raises
+    ------
+    ValueError
+        If the band storage does not have lower + upper + 1 rows.
+    """
+    if banded.shape[0] != lower + upper + 1:
+        raise ValueError("Band storage must have lower + upper + 1 rows")
+    n = banded.shape[1]
+    full = np.zeros((n, n))
+    for offset in range(max(-lower, 1 - n), min(upper, n - 1) + 1):
+        if offset >= 0:
+            full += np.diagflat(banded[upper - offset, offset:], offset)
+        else:
+            full += np.diagflat(banded[upper - offset, :n + offset], offset)
+    return full
+
+
+def _thomas(sub: np.array, diag: np.array, sup: np.array, b: np.array) -> np.array:
+    """
+    Solves tridiagonal systems with the Thomas algorithm along the first axis. Any further
+    axes of the diagonals are independent systems, and any further axes of b beyond those are
+    extra right hand sides.
+
+    Parameters
+    ----------
+    sub : np.array
+        Subdiagonal, with the system index first. The first entry is ignored.
+    diag : np.array
+        Main diagonal, with the system index first.
+    sup : np.array
+        Superdiagonal, with the system index first. The last entry is ignored.
+    b : np.array
+        Dependent values, with the system index first.
+
+    Returns
+    -------
+    np.array
+        Solutions, with the system index first.
+
+    Raises
+    ------
+    ValueError
+        If a zero pivot is encountered.
+    """
+    extra = (np.newaxis,) * (b.ndim - diag.ndim)
+    sub = np.asarray(sub, dtype=np.float64)[(slice(None),) + extra]
+    diag = np.asarray(diag, dtype=np.float64)[(slice(None),) + extra]
+    sup = np.asarray(sup, dtype=np.float64)[(slice(None),) + extra]
+    n = b.shape[0]
+    sup_prime = np.empty(np.broadcast_shapes(sup.shape, diag.shape))
+    sol = np.array(b, dtype=np.float64)
+
+    pivot = diag[0]
+    if np.any(pivot == 0):
+        raise ValueError("Zero pivot encountered")
+    sup_prime[0] = sup[0] / pivot
+    sol[0] /= pivot
+    for i in range(1, n):
+        pivot = diag[i] - sub[i] * sup_prime[i - 1]
+        if np.any(pivot == 0):
+            raise ValueError("Zero pivot encountered")
+        sup_prime[i] = sup[i] / pivot
+        sol[i] = (sol[i] - sub[i] * sol[i - 1]) / pivot
+    for i in range(n - 2, -1, -1):
+        sol[i] -= sup_prime[i] * sol[i + 1]
+    return sol
+
+
+def thomas_algorithm(sub: np.array, diag: np.array, sup: np.array, b: np.array) -> np.array:
+    """
+    Given the three diagonals of a tridiagonal matrix and a vector of dependent values, returns
+    the solution of the system using the Thomas algorithm in O(n) operations. No pivoting is
+    done, so the matrix should be diagonally dominant or symmetric positive definite. A matrix
+    of dependent values can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    sub : np.array
+        Subdiagonal of length n. The first entry is ignored.
+    diag : np.array
+        Main diagonal of length n.
+    sup : np.array
+        Superdiagonal of length n. The last entry is ignored.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the diagonals and the vector of dependent values have a different number of rows,
+        or if a zero pivot is encountered.
+    """
+    if not len(sub) == len(diag) == len(sup) == b.shape[0]:
+        raise ValueError("Diagonals and dependent values must have the same length")
+    return _thomas(sub, diag, sup, b)
+
+
+def batched_thomas_algorithm(sub: np.array, diag: np.array, sup: np.array,
+                             b: np.array) -> np.array:
+    """
+    Given the diagonals of many independent tridiagonal systems, one system per row, and their
+    dependent values, returns the solution of every system. The Thomas algorithm runs once over
+    the system size with every step vectorized over all the systems, so thousands of systems
+    cost about as many Python operations as one.
+
+    Parameters
+    ----------
+    sub : np.array
+        Subdiagonals, shape (N, n). The first column is ignored.
+    diag : np.array
+        Main diagonals, shape (N, n).
+    sup : np.array
+        Superdiagonals, shape (N, n). The last column is ignored.
+    b : np.array
+        Dependent values, shape (N, n).
+
+    Returns
+    -------
+    np.array
+        Solutions, shape (N, n).
+
+    Raises
+    ------
+    ValueError
+        If the inputs do not all have the same two dimensional shape, or if a zero pivot is
+        encountered in any system.
+    """
+    if not (np.ndim(b) == 2 and np.shape(sub) == np.shape(diag) == np.shape(sup) == b.shape):
+        raise ValueError("All inputs must have the same (N, n) shape")
+    return _thomas(np.transpose(sub), np.transpose(diag), np.transpose(sup),
+                   np.transpose(b)).T
+
+
+def banded_lu_factor(banded: np.array, lower: int, upper: int) -> tuple:
+    """
+    Given a matrix in band storage and its lower and upper bandwidths, returns its LU
+    decomposition with partial pivoting in band storage, in O(n * lower * (lower + upper))
+    operations. Pivots are only searched among the lower + 1 rows that can be nonzero, and
+    the row swaps widen the upper bandwidth of U to lower + upper, so the factors are returned
+    with lower extra rows on top. Row lower + upper + i - j, column j holds U for i <= j and
+    the multipliers of L for i > j.
+
+    Parameters
+    ----------
+    banded : np.array
+        Band storage of shape (lower + upper + 1, n) as made by to_banded.
+    lower : int
+        Number of nonzero diagonals below the main diagonal.
+    upper : int
+        Number of nonzero diagonals above the main diagonal.
+
+    Returns
+    -------
+    tuple
+        Factors in band storage of shape (2 * lower + upper + 1, n), and pivot vector where
+        row j was swapped with row pivots[j] at step j.
+
+    Raises
+    ------
+    ValueError
+        If the band storage does not have lower + upper + 1 rows or if the matrix is singular.
+    """
+    if banded.shape[0] != lower + upper + 1:
+        raise ValueError("Band storage must have lower + upper + 1 rows")
+    n = banded.shape[1]
+    width = lower + upper
+    factors = np.zeros((2 * lower + upper + 1, n))
+    factors[lower:] = banded
+    pivots = np.arange(n)
+
+    for j in range(n):
+        below = min(lower, n - 1 - j)
+        last = min(j + width, n - 1)
+        cols = np.arange(j, last + 1)
+        pivot = j + np.argmax(np.abs(factors[width:width + below + 1, j]))
+        if factors[width + pivot - j, j] == 0:
+            raise ValueError("Given matrix is singular")
+        pivots[j] = pivot
+        if pivot != j:
+            row_j = factors[width + j - cols, cols]
+            factors[width + j - cols, cols] = factors[width + pivot - cols, cols]
+            factors[width + pivot - cols, cols] = row_j
+        if below == 0:
+            continue
+        multipliers = factors[width + 1:width + below + 1, j]
+        multipliers /= factors[width, j]
+        # Rank one update of the block below and to the right of the pivot
+        rows = np.arange(j + 1, j + below + 1)[:, np.newaxis]
+        right = cols[np.newaxis, 1:]
+        factors[width + rows - right, right] -= np.outer(multipliers, factors[width + j - right[0],
+                                                                              right[0]])
+    return factors, pivots
+
+
+def banded_lu_solve(factors: np.array, pivots: np.array, lower: int, upper: int,
+                    b: np.array) -> np.array:
+    """
+    Given band LU factors and pivots from banded_lu_factor and a vector of dependent values,
+    returns the solution of the original banded system in O(n * (lower + upper)) operations.
+    A matrix of dependent values can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    factors : np.array
+        Band LU factors from banded_lu_factor.
+    pivots : np.array
+        Pivot vector from banded_lu_factor.
+    lower : int
+        Number of nonzero diagonals below the main diagonal of the original matrix.
+    upper : int
+        Number of nonzero diagonals above the main diagonal of the original matrix.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the factors and the vector of dependent values have a different number of rows.
+    """
+    n = factors.shape[1]
+    if b.shape[0] != n:
+        raise ValueError("Both inputs must have same number of rows")
+    width = lower + upper
+    sol = np.array(b, dtype=np.float64)
+    extra = (slice(None),) + (np.newaxis,) * (sol.ndim - 1)
+
+    for j in range(n):
+        if pivots[j] != j:
+            sol[[j, pivots[j]]] = sol[[pivots[j], j]]
+        below = min(lower, n - 1 - j)
+        sol[j + 1:j + below + 1] -= factors[width + 1:width + below + 1, j][extra] * sol[j]
+    for j in range(n - 1, -1, -1):
+        sol[j] /= factors[width, j]
+        above = min(width, j)
+        sol[j - above:j] -= factors[width - above:width, j][extra] * sol[j]
+    return sol
+
+
+def banded_solve(banded: np.array, lower: int, upper: int, b: np.array) -> np.array:
+    """
+    Given a matrix in band storage, its lower and upper bandwidths, and a vector of dependent
+    values, returns the solution of the system using banded LU with partial pivoting.
+
+    Parameters
+    ----------
+    banded : np.array
+        Band storage of shape (lower + upper + 1, n) as made by to_banded.
+    lower : int
+        Number of nonzero diagonals below the main diagonal.
+    upper : int
+        Number of nonzero diagonals above the main diagonal.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+    """
+    factors, pivots = banded_lu_factor(banded, lower, upper)
+    return banded_lu_solve(factors, pivots, lower, upper, b)
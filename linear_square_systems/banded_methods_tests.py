@@ -0,0 +1,169 @@
+import numpy as np
+import banded_methods
+
+
+def test_band_storage():
+    """
+    Tests conversions to and from band storage.
+    """
+    a = np.array(
+        [[1, 2, 0, 0],
+         [3, 4, 5, 0],
+         [6, 7, 8, 9],
+         [0, 1, 2, 3]]
+    )
+    banded = np.array(
+        [[0, 2, 5, 9],
+         [1, 4, 8, 3],
+         [3, 7, 2, 0],
+         [6, 1, 0, 0]]
+    )
+    np.testing.assert_allclose(
+        banded_methods.to_banded(a, 2, 1),
+        banded,
+        err_msg="Band storage test 1 Fail"
+    )
+    np.testing.assert_allclose(
+        banded_methods.from_banded(banded, 2, 1),
+        a,
+        err_msg="Band storage test 2 Fail"
+    )
+
+    # Bandwidths wider than the matrix
+    a = np.array([[1, 2], [3, 4]])
+    np.testing.assert_allclose(
+        banded_methods.from_banded(banded_methods.to_banded(a, 3, 3), 3, 3),
+        a,
+        err_msg="Band storage test 3 Fail"
+    )
+    np.testing.assert_raises(ValueError, banded_methods.to_banded, np.ones((2, 3)), 1, 1)
+    np.testing.assert_raises(ValueError, banded_methods.from_banded, banded, 1, 1)
+
+
+def test_thomas_algorithm():
+    """
+    Tests Thomas algorithm function.
+    """
+    sub = np.array([0, -1, -1, -1])
+    diag = np.array([2, 2, 2, 2])
+    sup = np.array([-1, -1, -1, 0])
+    b = np.array([1, 0, 0, 1])
+    np.testing.assert_allclose(
+        banded_methods.thomas_algorithm(sub, diag, sup, b),
+        np.array([1, 1, 1, 1]),
+        err_msg="Thomas test 1 Fail"
+    )
+
+    b = np.array(
+        [[1, 0],
+         [0, 0],
+         [0, 0],
+         [1, 5]]
+    )
+    np.testing.assert_allclose(
+        banded_methods.thomas_algorithm(sub, diag, sup, b),
+        np.array(
+            [[1, 1],
+             [1, 2],
+             [1, 3],
+             [1, 4]]
+        ),
+        err_msg="Thomas test 2 Fail"
+    )
+
+    rng = np.random.default_rng(0)
+    n = 50
+    sub, sup = rng.normal(size=n), rng.normal(size=n)
+    diag = 3 + rng.random(n)
+    a = np.diag(diag) + np.diag(sub[1:], -1) + np.diag(sup[:-1], 1)
+    b = rng.normal(size=n)
+    np.testing.assert_allclose(
+        banded_methods.thomas_algorithm(sub, diag, sup, b),
+        np.linalg.solve(a, b),
+        err_msg="Thomas test 3 Fail"
+    )
+    np.testing.assert_raises(ValueError, banded_methods.thomas_algorithm,
+                             sub, np.zeros(n), sup, b)
+    np.testing.assert_raises(ValueError, banded_methods.thomas_algorithm,
+                             sub, diag, sup, b[:-1])
+
+
+def test_batched_thomas_algorithm():
+    """
+    Tests batched Thomas algorithm function.
+    """
+    rng = np.random.default_rng(1)
+    count, n = 1000, 20
+    sub, sup = rng.normal(size=(count, n)), rng.normal(size=(count, n))
+    diag = 3 + rng.random((count, n))
+    b = rng.normal(size=(count, n))
+    sol = banded_methods.batched_thomas_algorithm(sub, diag, sup, b)
+    np.testing.assert_equal(sol.shape, (count, n), err_msg="Batched Thomas test 1 Fail")
+    for k in [0, 499, 999]:
+        np.testing.assert_allclose(
+            sol[k],
+            banded_methods.thomas_algorithm(sub[k], diag[k], sup[k], b[k]),
+            err_msg="Batched Thomas test 2 Fail"
+        )
+    np.testing.assert_raises(ValueError, banded_methods.batched_thomas_algorithm,
+                             sub, diag, sup, b[0])
+
+
+def test_banded_lu():
+    """
+    Tests banded LU factor and solve functions.
+    """
+    # Needs a row swap in the first column
+    a = np.array(
+        [[0, 1, 0, 0],
+         [2, 1, 1, 0],
+         [0, 1, 3, 1],
+         [0, 0, 1, 4]]
+    )
+    b = np.array([1, 4, 5, 5])
+    np.testing.assert_allclose(
+        banded_methods.banded_solve(banded_methods.to_banded(a, 1, 1), 1, 1, b),
+        np.array([1, 1, 1, 1]),
+        err_msg="Banded LU test 1 Fail"
+    )
+
+    rng = np.random.default_rng(2)
+    for lower, upper in [(1, 1), (2, 2), (3, 1), (0, 2)]:
+        n = 30
+        banded = rng.normal(size=(lower + upper + 1, n))
+        banded[upper] += 4
+        a = banded_methods.from_banded(banded, lower, upper)
+        b = rng.normal(size=(n, 3))
+        factors, pivots = banded_methods.banded_lu_factor(banded, lower, upper)
+        np.testing.assert_equal(factors.shape, (2 * lower + upper + 1, n),
+                                err_msg="Banded LU test 2 Fail")
+        np.testing.assert_allclose(
+            banded_methods.banded_lu_solve(factors, pivots, lower, upper, b),
+            np.linalg.solve(a, b),
+            err_msg="Banded LU test 3 Fail"
+        )
+        np.testing.assert_allclose(
+            banded_methods.banded_lu_solve(factors, pivots, lower, upper, b[:, 0]),
+            np.linalg.solve(a, b[:, 0]),
+            err_msg="Banded LU test 4 Fail"
+        )
+
+    a = np.array(
+        [[1, 1, 0],
+         [1, 1, 0],
+         [0, 0, 1]]
+    )
+    np.testing.assert_raises(ValueError, banded_methods.banded_lu_factor,
+                             banded_methods.to_banded(a, 1, 1), 1, 1)
+
+
+if __name__ == "__main__":
+    test_band_storage()
+    print("Band storage tests passed")
+    test_thomas_algorithm()
+    print("Thomas algorithm tests passed")
+    test_batched_thomas_algorithm()
+    print("Batched Thomas algorithm tests passed")
+    test_banded_lu()
+    print("Banded LU tests passed")
+    print("Tests Passed!")
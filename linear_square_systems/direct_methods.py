@@ -1,22 +1,103 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import numpy as np
+from scipy.linalg import solve_triangular
+
+_default_dtype = np.dtype(np.float32)
+
+
+def get_default_dtype() -> np.dtype:
+    """
+    Returns the floating point type used by regular_gaussian_elim, complete_gaussian_elim,
+    lu_decomposition, and the batched routines when no dtype is given.
+
+    Returns
+    -------
+    np.dtype
+        Default floating point type.
+    """
+    return _default_dtype
+
+
+def set_default_dtype(dtype: type) -> None:
+    """
+    Sets the floating point type used by regular_gaussian_elim, complete_gaussian_elim,
+    lu_decomposition, and the batched routines when no dtype is given. The default is float32,
+    which halves memory but loses accuracy on moderately ill conditioned systems, and float64
+    gives full double precision. The factorizations lu_factor and cholesky_factor, and rref,
+    matrix_rank, and null_space, do not follow this setting: they default to float64 and only
+    compute in float32 when it is asked for explicitly.
+
+    Parameters
+    ----------
+    dtype : type
+        Either np.float32 or np.float64.
+
+    Raises
+    ------
+    ValueError
+        If the type is not float32 or float64.
+    """
+    global _default_dtype
+    _default_dtype = _resolve_dtype(dtype)
+
+
+def _resolve_dtype(dtype: type, follow_default: bool = True) -> np.dtype:
+    """
+    Given a floating point type or None, returns the type to compute in, which is the default
+    type for None.
+
+    Parameters
+    ----------
+    dtype : type
+        Either np.float32, np.float64, or None.
+    follow_default : bool, default True
+        If None stands for the default type. Routines that always default to float64 pass
+        False so that None is rejected rather than silently meaning float32. Defaults to True.
+
+    Returns
+    -------
+    np.dtype
+        Floating point type.
+
+    Raises
+    ------
+    ValueError
+        If the type is not float32 or float64, or is None when not following the default.
+    """
+    if dtype is None:
+        if not follow_default:
+            raise ValueError("dtype must be float32 or float64")
+        return _default_dtype
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64")
+    return dtype
 
 
 def back_substitution(upper: np.array, b: np.array) -> np.array:
     """
     Given an upper triangular matrix, a vector of dependent values to solve the system, returns the
     solution vector for the system. If a free variable is encountered, 0 is the value used.
+    A matrix of dependent values can be given instead to solve for every column at once.
+    Each row of the solution is found with one dot product against the rows already solved,
+    in float64.
 
     Parameters
     ----------
     upper : np.array
         Square upper triangular matrix for a linear system.
     b : np.array
-        Vector of dependent values to solve the system.
+        Vector of dependent values to solve the system, or matrix with one right hand side
+        per column.
 
     Returns
     -------
     np.array
-        Solution vector for the system.
+        Solution vector for the system, or matrix with one solution per column.
 
     Raises
     ------
@@ -33,26 +114,91 @@ def back_substitution(upper: np.array, b: np.array) -> np.array:
         raise ValueError("System is not upper triangular")
 
     m = upper.shape[0]
-    augmented = np.column_stack([upper, b])
-    sol = np.array([None] * m).astype(np.float32)
+    sol = np.zeros(b.shape, dtype=np.float64)
     for i in range(m - 1, -1, -1):
-        total = 0
-        for j in range(m - 1, i, -1):
-            total += augmented[i, j] * sol[j]
-
-        x = 0  # Default value
-        if augmented[i, i] == 0:
-            if total == augmented[i, m]:
-                print("x" + str(i) + " is free parameter. Using 0 as default.")
-            else:
-                raise ValueError("No solutions")
+        total = np.dot(upper[i, i + 1:], sol[i + 1:])
+        _solve_row(upper[i, i], total, b[i], sol, i)
+    return sol
+
+
+def forward_substitution(lower: np.array, b: np.array) -> np.array:
+    """
+    Given a lower triangular matrix, a vector of dependent values to solve the system, returns the
+    solution vector for the system. If a free variable is encountered, 0 is the value used.
+    A matrix of dependent values can be given instead to solve for every column at once.
+    Each row of the solution is found with one dot product against the rows already solved,
+    in float64.
+
+    Parameters
+    ----------
+    lower : np.array
+        Square lower triangular matrix for a linear system.
+    b : np.array
+        Vector of dependent values to solve the system, or matrix with one right hand side
+        per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the given lower triangular matrix is not square, if the lower
+        triangular matrix and the vector of dependent values have a different number of rows,
+        if the given matrix is not lower triangular, or if there are no solutions to the system.
+    """
+    if lower.shape[0] != lower.shape[1]:
+        raise ValueError("System is not square")
+    if lower.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    if not np.array_equal(lower, np.tril(lower)):
+        raise ValueError("System is not lower triangular")
+
+    m = lower.shape[0]
+    sol = np.zeros(b.shape, dtype=np.float64)
+    for i in range(m):
+        total = np.dot(lower[i, :i], sol[:i])
+        _solve_row(lower[i, i], total, b[i], sol, i)
+    return sol
+
+
+def _solve_row(pivot: float, total: float or np.array, b_row: float or np.array,
+               sol: np.array, i: int) -> None:
+    """
+    Given the diagonal entry of a triangular system, the dot product of the rest of row i with
+    the solved entries, and the dependent values of row i, writes row i of the solution. If
+    the diagonal entry is 0, the variable is free and 0 is used when the row is consistent.
+
+    Parameters
+    ----------
+    pivot : float
+        Diagonal entry of row i.
+    total : float or np.array
+        Dot product of the off diagonal entries of row i with the solution so far.
+    b_row : float or np.array
+        Dependent values of row i.
+    sol : np.array
+        Solution being written.
+    i : int
+        Row being solved.
+
+    Raises
+    ------
+    ValueError
+        If the diagonal entry is 0 and the row is inconsistent.
+    """
+    if pivot == 0:
+        if np.all(total == b_row):
+            print("x" + str(i) + " is free parameter. Using 0 as default.")
         else:
-            x = (augmented[i, m] - total) / augmented[i, i]
-        sol[i] = float(x)
-    return sol.transpose()
+            raise ValueError("No solutions")
+    else:
+        sol[i] = (b_row - total) / pivot
 
 
-def regular_gaussian_elim(input_matrix: np.array) -> np.array:
+def regular_gaussian_elim(input_matrix: np.array, dtype: type = None) -> np.array:
     """
     Given a regular matrix, performs regular gaussian elimination and returns the reduced matrix.
 
@@ -60,6 +206,9 @@ def regular_gaussian_elim(input_matrix: np.array) -> np.array:
     ----------
     input_matrix : np.array
         A regular matrix to reduce using regular gaussian elimination.
+    dtype : type, optional
+        Floating point type to compute in, np.float32 or np.float64. Defaults to
+        get_default_dtype().
 
     Returns
     -------
@@ -72,54 +221,233 @@ def regular_gaussian_elim(input_matrix: np.array) -> np.array:
         If the given matrix is not regular.
     """
     m = input_matrix.shape[0]
-    reduced = input_matrix.astype(np.float32)
+    dtype = _resolve_dtype(dtype)
+    reduced = input_matrix.astype(dtype)
     for i in range(m - 1):
         if reduced[i][i] == 0:
             raise ValueError("Given matrix is not regular")
 
         for j in range(i + 1, m):
             coef = reduced[j][i] / reduced[i][i]
-            reduced[j] = reduced[j] - (coef * reduced[i].astype(np.float32))
+            reduced[j] = reduced[j] - (coef * reduced[i].astype(dtype))
     return reduced
 
 
-def complete_gaussian_elim(input_matrix: np.array) -> np.array:
+def _row_echelon(reduced: np.array, tolerance: float, block_size: int) -> np.array:
+    """
+    Reduces a matrix to row echelon form in place with partial pivoting and returns the pivot
+    columns. In each column the entry of largest size at or below the current row is swapped
+    up as the pivot, and a column whose largest entry is at or below the tolerance has no
+    pivot and is zeroed below the current row. The columns are handled in panels of
+    block_size: inside a panel the rows below each pivot are eliminated with one outer product,
+    and the columns right of the panel are then updated with one triangular solve and one
+    matrix multiplication.
+
+    Parameters
+    ----------
+    reduced : np.array
+        Matrix to reduce, overwritten with its row echelon form.
+    tolerance : float
+        Largest size of an entry treated as zero.
+    block_size : int
+        Number of columns in each panel.
+
+    Returns
+    -------
+    np.array
+        Pivot column of each nonzero row.
+    """
+    m, n = reduced.shape
+    pivot_columns = []
+    row = 0
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        first_row = row
+        multipliers = np.zeros((m, end - start), dtype=reduced.dtype)
+        for col in range(start, end):
+            if row == m:
+                break
+            pivot = row + np.argmax(np.abs(reduced[row:, col]))
+            if abs(reduced[pivot, col]) <= tolerance:
+                reduced[row:, col] = 0
+                continue
+            if pivot != row:
+                reduced[[row, pivot]] = reduced[[pivot, row]]
+                multipliers[[row, pivot]] = multipliers[[pivot, row]]
+            k = row - first_row
+            multipliers[row + 1:, k] = reduced[row + 1:, col] / reduced[row, col]
+            reduced[row + 1:, col + 1:end] -= np.outer(multipliers[row + 1:, k],
+                                                       reduced[row, col + 1:end])
+            reduced[row + 1:, col] = 0
+            pivot_columns.append(col)
+            row += 1
+        found = row - first_row
+        if found and end < n:
+            panel = multipliers[first_row:row, :found]
+            reduced[first_row:row, end:] = solve_triangular(panel, reduced[first_row:row, end:],
+                                                            lower=True, unit_diagonal=True)
+            reduced[row:, end:] -= multipliers[row:, :found] @ reduced[first_row:row, end:]
+        if row == m:
+            reduced[row:, end:] = 0
+            break
+    return np.array(pivot_columns, dtype=int)
+
+
+def _default_tolerance(matrix: np.array) -> float:
+    """
+    Given a matrix, returns the default size below which entries are treated as zero when
+    finding its rank, max(m, n) * eps times its infinity norm. Rounding errors left in the
+    trailing submatrix by elimination grow with the size of whole rows, not single entries.
+
+    Parameters
+    ----------
+    matrix : np.array
+        Matrix being reduced.
+
+    Returns
+    -------
+    float
+        Tolerance.
+    """
+    row_sums = np.sum(np.abs(matrix), axis=1)
+    return max(matrix.shape) * np.finfo(matrix.dtype).eps * np.max(row_sums, initial=0)
+
+
+def complete_gaussian_elim(input_matrix: np.array, dtype: type = None,
+                           tolerance: float = 0, block_size: int = 64) -> np.array:
     """
     Given a matrix, performs complete Gaussian elimination and returns reduced matrix.
+    Each column is pivoted on its entry of largest size at or below the current row, and the
+    whole trailing submatrix is eliminated at once, one panel of columns at a time.
 
     Parameters
     ----------
     input_matrix : np.array
         Matrix to reduce with complete Gaussian elimination.
+    dtype : type, optional
+        Floating point type to compute in, np.float32 or np.float64. Defaults to
+        get_default_dtype().
+    tolerance : float, default 0
+        Largest size of a pivot treated as zero. Defaults to 0.
+    block_size : int, default 64
+        Number of columns in each panel. Defaults to 64.
 
     Returns
     -------
     np.array
         Reduced matrix.
     """
-    m, n = input_matrix.shape
-    reduced = input_matrix.astype(np.float32)
-    curr_row = 0
-    curr_col = 0
-    while curr_row < m and curr_col < n:
-        swap_row = curr_row + 1
-        while reduced[curr_row][curr_col] == 0 and swap_row < m:
-            reduced[[curr_row, swap_row]] = reduced[[swap_row, curr_row]]
-            swap_row += 1
-
-        if swap_row == m:
-            curr_col += 1
-            continue
-
-        for j in range(curr_row + 1, m):
-            coef = reduced[j][curr_col] / reduced[curr_row][curr_col]
-            reduced[j] = reduced[j] - coef * reduced[curr_row]
-        curr_row += 1
-        curr_col += 1
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    reduced = np.array(input_matrix, dtype=_resolve_dtype(dtype))
+    _row_echelon(reduced, tolerance, block_size)
     return reduced
 
 
-def lu_decomposition(input_matrix: np.array) -> np.array:
+def rref(input_matrix: np.array, tolerance: float = None, dtype: type = np.float64,
+         block_size: int = 64) -> tuple:
+    """
+    Given a matrix, returns its reduced row echelon form and pivot columns. The matrix is first
+    reduced to row echelon form as in complete_gaussian_elim, then the pivot rows are scaled
+    and the entries above each pivot eliminated with one triangular solve.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to reduce.
+    tolerance : float, optional
+        Largest size of a pivot treated as zero. Defaults to max(m, n) * eps times the
+        infinity norm of the matrix.
+    dtype : type, default np.float64
+        Floating point type to compute in, np.float32 or np.float64. It does not follow
+        set_default_dtype. Defaults to np.float64.
+    block_size : int, default 64
+        Number of columns in each panel. Defaults to 64.
+
+    Returns
+    -------
+    tuple
+        Reduced row echelon form and the array of pivot columns.
+    """
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    reduced = np.array(input_matrix, dtype=_resolve_dtype(dtype, follow_default=False))
+    if tolerance is None:
+        tolerance = _default_tolerance(reduced)
+    pivot_columns = _row_echelon(reduced, tolerance, block_size)
+    rank = pivot_columns.size
+    if rank:
+        reduced[:rank] = solve_triangular(reduced[:rank, pivot_columns], reduced[:rank])
+        reduced[:rank, pivot_columns] = np.eye(rank)
+    return reduced, pivot_columns
+
+
+def matrix_rank(input_matrix: np.array, tolerance: float = None, dtype: type = np.float64,
+                block_size: int = 64) -> int:
+    """
+    Given a matrix, returns its numerical rank, the number of pivots larger than the tolerance
+    found by Gaussian elimination with partial pivoting.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to find the rank of.
+    tolerance : float, optional
+        Largest size of a pivot treated as zero. Defaults to max(m, n) * eps times the
+        infinity norm of the matrix.
+    dtype : type, default np.float64
+        Floating point type to compute in, np.float32 or np.float64. It does not follow
+        set_default_dtype. Defaults to np.float64.
+    block_size : int, default 64
+        Number of columns in each panel. Defaults to 64.
+
+    Returns
+    -------
+    int
+        Numerical rank.
+    """
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    reduced = np.array(input_matrix, dtype=_resolve_dtype(dtype, follow_default=False))
+    if tolerance is None:
+        tolerance = _default_tolerance(reduced)
+    return _row_echelon(reduced, tolerance, block_size).size
+
+
+def null_space(input_matrix: np.array, tolerance: float = None, dtype: type = np.float64,
+               block_size: int = 64) -> np.array:
+    """
+    Given a matrix, returns a basis of its null space read off its reduced row echelon form,
+    with one basis vector per free column.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to find the null space of.
+    tolerance : float, optional
+        Largest size of a pivot treated as zero. Defaults to max(m, n) * eps times the
+        infinity norm of the matrix.
+    dtype : type, default np.float64
+        Floating point type to compute in, np.float32 or np.float64. It does not follow
+        set_default_dtype. Defaults to np.float64.
+    block_size : int, default 64
+        Number of columns in each panel. Defaults to 64.
+
+    Returns
+    -------
+    np.array
+        Matrix whose columns are a basis of the null space, shape (n, n - rank).
+    """
+    reduced, pivot_columns = rref(input_matrix, tolerance, dtype, block_size)
+    n = reduced.shape[1]
+    free_columns = np.setdiff1d(np.arange(n), pivot_columns)
+    basis = np.zeros((n, free_columns.size), dtype=reduced.dtype)
+    basis[free_columns, np.arange(free_columns.size)] = 1
+    basis[pivot_columns] = -reduced[:pivot_columns.size, free_columns]
+    return basis
+
+
+def lu_decomposition(input_matrix: np.array, dtype: type = None) -> np.array:
     """
     Given a regular square matrix, decomposes the matrix into lower and upper triangular matrices
     and returns these matrices.
@@ -128,6 +456,9 @@ def lu_decomposition(input_matrix: np.array) -> np.array:
     ----------
     input_matrix : np.array
         Regular matrix to decompose.
+    dtype : type, optional
+        Floating point type to compute the upper matrix in, np.float32 or np.float64.
+        Defaults to get_default_dtype().
 
     Returns
     -------
@@ -144,7 +475,7 @@ def lu_decomposition(input_matrix: np.array) -> np.array:
 
     m = input_matrix.shape[0]
     lower = np.eye(m)
-    upper = input_matrix.astype(np.float32)
+    upper = input_matrix.astype(_resolve_dtype(dtype))
     for i in range(m - 1):
         if upper[i][i] == 0:
             raise ValueError("Given matrix is not regular")
@@ -153,3 +484,2372 @@ def lu_decomposition(input_matrix: np.array) -> np.array:
             lower[j][i] = coef
             upper[j] = upper[j] - coef * upper[i]
     return lower, upper
+
+
+def lu_factor(input_matrix: np.array, block_size: int = 64, overwrite: bool = False,
+              dtype: type = np.float64) -> tuple:
+    """
+    Given a square matrix, computes its LU decomposition with partial pivoting and returns the
+    factors packed into one array along with the row permutation. The strictly lower
+    triangle holds L, whose diagonal of ones is not stored, and the upper triangle holds U, so
+    that input_matrix[perm] = L @ U. The factorization is right looking and blocked: each panel
+    of block_size columns is factored with row swaps, and the rest of the matrix is then updated
+    with one matrix multiplication per panel.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix to decompose.
+    block_size : int, default 64
+        Number of columns in each panel. Defaults to 64.
+    overwrite : bool, default False
+        If the input already has the given dtype, factor it in place instead of copying it.
+        Defaults to False.
+    dtype : type, default np.float64
+        Floating point type to factor in, np.float32 or np.float64. It does not follow
+        set_default_dtype. Defaults to np.float64.
+
+    Returns
+    -------
+    tuple
+        Packed LU factors and the permutation vector.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square or if it is singular.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    dtype = _resolve_dtype(dtype, follow_default=False)
+    if overwrite and input_matrix.dtype == dtype:
+        lu = input_matrix
+    else:
+        lu = np.array(input_matrix, dtype=dtype)
+    perm = np.arange(lu.shape[0])
+    for j, pivot in enumerate(_factor_panel(lu, block_size)):
+        perm[[j, pivot]] = perm[[pivot, j]]
+    return lu, perm
+
+
+def _factor_panel(panel: np.array, block_size: int) -> list:
+    """
+    Computes the LU decomposition with partial pivoting of a square or tall matrix in place,
+    packing L below the diagonal and U on and above it, and returns the row swapped with each
+    row in turn. Each block of block_size columns is factored with row swaps, and the columns
+    right of it are then updated with one triangular solve and one matrix multiplication.
+
+    Parameters
+    ----------
+    panel : np.array
+        Matrix with at least as many rows as columns, overwritten with its factors.
+    block_size : int
+        Number of columns in each block.
+
+    Returns
+    -------
+    list
+        Row swapped with row j at step j, for each column j.
+
+    Raises
+    ------
+    ValueError
+        If a column has no nonzero pivot.
+    """
+    n = panel.shape[1]
+    pivots = []
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        for j in range(start, end):
+            pivot = j + np.argmax(np.abs(panel[j:, j]))
+            if panel[pivot, j] == 0:
+                raise ValueError("Given matrix is singular")
+            if pivot != j:
+                panel[[j, pivot]] = panel[[pivot, j]]
+            pivots.append(pivot)
+            panel[j + 1:, j] /= panel[j, j]
+            # Rank one update of the rest of the block only
+            panel[j + 1:, j + 1:end] -= np.outer(panel[j + 1:, j], panel[j, j + 1:end])
+        if end < n:
+            panel[start:end, end:] = solve_triangular(panel[start:end, start:end],
+                                                      panel[start:end, end:],
+                                                      lower=True, unit_diagonal=True)
+            panel[end:, end:] -= panel[end:, start:end] @ panel[start:end, end:]
+    return pivots
+
+
+def lu_solve(lu: np.array, perm: np.array, b: np.array) -> np.array:
+    """
+    Given packed LU factors and a permutation vector from lu_factor, and a vector of dependent
+    values, returns the solution of the original system in the precision of the factors. A
+    matrix of dependent values can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    lu : np.array
+        Packed LU factors from lu_factor.
+    perm : np.array
+        Permutation vector from lu_factor.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the factors and the vector of dependent values have a different number of rows.
+    """
+    if lu.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    y = solve_triangular(lu, np.asarray(b, dtype=lu.dtype)[perm], lower=True,
+                         unit_diagonal=True)
+    return solve_triangular(lu, y, lower=False)
+
+
+def lu_unpack(lu: np.array) -> tuple:
+    """
+    Given packed LU factors from lu_factor, returns the separate lower and upper triangular
+    matrices.
+
+    Parameters
+    ----------
+    lu : np.array
+        Packed LU factors from lu_factor.
+
+    Returns
+    -------
+    tuple
+        Unit lower triangular and upper triangular matrices.
+    """
+    return np.tril(lu, -1) + np.eye(lu.shape[0]), np.triu(lu)
+
+
+def lu_update(lu: np.array, perm: np.array, u: np.array, v: np.array) -> np.array:
+    """
+    Given packed LU factors and a permutation vector from lu_factor of a matrix A, and vectors
+    u and v, returns the packed LU factors of A + u @ v.T with the same permutation in O(n ** 2)
+    operations using Bennett's algorithm, instead of the O(n ** 3) of factoring again. Matrices
+    u and v with k columns give the factors of A + u @ v.T with k rank one updates. The given
+    factors are not modified. No new row swaps are made, so the factors can lose accuracy
+    when the update makes a pivot small, and update_factorization checks for this.
+
+    Parameters
+    ----------
+    lu : np.array
+        Packed LU factors from lu_factor.
+    perm : np.array
+        Permutation vector from lu_factor.
+    u : np.array
+        Vector of length n, or matrix with k columns.
+    v : np.array
+        Vector of length n, or matrix with k columns.
+
+    Returns
+    -------
+    np.array
+        Packed LU factors of the updated matrix, for the same permutation.
+
+    Raises
+    ------
+    ValueError
+        If u and v do not have n rows and the same shape, or if a pivot becomes zero.
+    """
+    n = lu.shape[0]
+    u = np.asarray(u, dtype=np.float64).reshape(n, -1)
+    v = np.asarray(v, dtype=np.float64).reshape(n, -1)
+    if u.shape != v.shape:
+        raise ValueError("Update vectors must have the same shape")
+    updated = np.array(lu, dtype=np.float64)
+    for x, y in zip(u[perm].T, v.T):
+        x, y = x.copy(), y.copy()
+        for k in range(n):
+            pivot = updated[k, k] + x[k] * y[k]
+            if pivot == 0:
+                raise ValueError("Updated matrix has a zero pivot")
+            row = updated[k, k + 1:] + x[k] * y[k + 1:]
+            column = updated[k + 1:, k].copy()
+            updated[k + 1:, k] = (updated[k, k] * column + y[k] * x[k + 1:]) / pivot
+            x[k + 1:] -= x[k] * column
+            y[k + 1:] -= y[k] / pivot * row
+            updated[k, k] = pivot
+            updated[k, k + 1:] = row
+    return updated
+
+
+def _run_task_graph(tasks: dict, workers: int) -> None:
+    """
+    Runs a dependency graph of tasks on a thread pool. A task is submitted as soon as every
+    task it depends on has finished, so independent tasks run at the same time. The first
+    exception raised by a task stops the scheduling of new tasks and is raised again.
+
+    Parameters
+    ----------
+    tasks : dict
+        Maps each task name to a pair of a function with no arguments and a list of the names
+        of the tasks it depends on.
+    workers : int
+        Number of threads.
+    """
+    waiting = {name: len(deps) for name, (run, deps) in tasks.items()}
+    dependents = {name: [] for name in tasks}
+    for name, (run, deps) in tasks.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {executor.submit(tasks[name][0]): name
+                   for name, count in waiting.items() if count == 0}
+        while running:
+            done, unused = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                future.result()
+                for dependent in dependents[name]:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        running[executor.submit(tasks[dependent][0])] = dependent
+
+
+def tiled_lu_factor(input_matrix: np.array, tile_size: int = 256, workers: int = None,
+                    block_size: int = 64) -> tuple:
+    """
+    Given a square matrix, computes its LU decomposition with partial pivoting using a thread
+    pool and returns the packed factors and permutation exactly as lu_factor does, so that
+    input_matrix[perm] = L @ U. The matrix is split into column tiles of tile_size. The work
+    is a graph of tasks: factoring the panel of each column tile with row swaps, and, for every
+    later column tile, applying those row swaps, solving for its block of U, and updating the
+    rest of it with a matrix multiplication. Each task starts as soon as the tasks it depends
+    on have finished, so the next panel is factored while updates from the last one are still
+    running. NumPy releases the GIL inside matrix multiplication, so the updates run in
+    parallel on separate cores.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix to decompose.
+    tile_size : int, default 256
+        Number of columns in each tile. Defaults to 256.
+    workers : int, optional
+        Number of threads. Defaults to the number of processors.
+    block_size : int, default 64
+        Number of columns in each block when factoring a panel. Defaults to 64.
+
+    Returns
+    -------
+    tuple
+        Packed LU factors and the permutation vector.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square or if it is singular.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if tile_size <= 0 or block_size <= 0:
+        raise ValueError("Tile and block sizes must be positive")
+    lu = np.array(input_matrix, dtype=np.float64)
+    m = lu.shape[0]
+    perm = np.arange(m)
+    bounds = [(start, min(start + tile_size, m)) for start in range(0, m, tile_size)]
+    pivots = [None] * len(bounds)
+
+    def panel(k):
+        start, end = bounds[k]
+        pivots[k] = [start + pivot for pivot in _factor_panel(lu[start:, start:end], block_size)]
+        for j, pivot in zip(range(start, end), pivots[k]):
+            perm[[j, pivot]] = perm[[pivot, j]]
+
+    def update(k, t):
+        start, end = bounds[k]
+        col_start, col_end = bounds[t]
+        block = lu[:, col_start:col_end]
+        for j, pivot in zip(range(start, end), pivots[k]):
+            if pivot != j:
+                block[[j, pivot]] = block[[pivot, j]]
+        block[start:end] = solve_triangular(lu[start:end, start:end], block[start:end],
+                                            lower=True, unit_diagonal=True)
+        block[end:] -= lu[end:, start:end] @ block[start:end]
+
+    tasks = {}
+    for k in range(len(bounds)):
+        tasks["panel", k] = (lambda k=k: panel(k), [("update", k - 1, k)] if k else [])
+        for t in range(k + 1, len(bounds)):
+            deps = [("panel", k)] + ([("update", k - 1, t)] if k else [])
+            tasks["update", k, t] = (lambda k=k, t=t: update(k, t), deps)
+    _run_task_graph(tasks, workers or os.cpu_count() or 1)
+
+    # Swaps from later panels are applied to the finished columns of L once all tasks are done
+    for k in range(1, len(bounds)):
+        start, end = bounds[k]
+        for j, pivot in zip(range(start, end), pivots[k]):
+            if pivot != j:
+                lu[[j, pivot], :start] = lu[[pivot, j], :start]
+    return lu, perm
+
+
+def out_of_core_lu_factor(matrix: np.array, panel_size: int = 1024,
+                          block_size: int = 64) -> np.array:
+    """
+    Given a square matrix stored on disk as an np.memmap, computes its LU decomposition with
+    partial pivoting in place and returns the permutation vector. Afterwards the memmap holds
+    the packed factors exactly as lu_factor returns them, so that matrix[perm] = L @ U for the
+    original matrix. Only a few column panels of panel_size columns are in memory at a time,
+    so matrices larger than memory can be factored.
+
+    The panels are factored from left to right. Each panel is read from disk, and then the
+    L part of every earlier panel is read in turn to update it before it is factored and
+    written back. Row swaps are applied lazily: a panel that has not been factored yet still
+    holds the original rows, so it is put in the current row order with one gather, and the
+    swaps of later panels are applied to the L part of each panel in one last pass. Each
+    panel is about 8 * n * panel_size bytes, and about three are in memory at once. About
+    n ** 3 / (2 * panel_size) entries are read in total, so larger panels mean less I/O.
+    Storing the memmap in Fortran order makes each panel one contiguous read.
+
+    Parameters
+    ----------
+    matrix : np.array
+        Square float64 np.memmap opened in "r+" mode, overwritten with its LU factors.
+    panel_size : int, default 1024
+        Number of columns in each panel. Defaults to 1024.
+    block_size : int, default 64
+        Number of columns in each block when factoring a panel. Defaults to 64.
+
+    Returns
+    -------
+    np.array
+        Permutation vector.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square or if it is singular.
+    """
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if panel_size <= 0 or block_size <= 0:
+        raise ValueError("Panel and block sizes must be positive")
+    m = matrix.shape[0]
+    perm = np.arange(m)
+    bounds = [(start, min(start + panel_size, m)) for start in range(0, m, panel_size)]
+    # Inverse of the row order each panel was written in
+    inverses = []
+
+    for start, end in bounds:
+        panel = np.asarray(matrix[:, start:end], dtype=np.float64)[perm]
+        for (left, right), inverse in zip(bounds, inverses):
+            lower = np.asarray(matrix[left:, left:right], dtype=np.float64)
+            lower = lower[inverse[perm[left:]] - left]
+            panel[left:right] = solve_triangular(lower[:right - left], panel[left:right],
+                                                 lower=True, unit_diagonal=True)
+            panel[right:] -= lower[right - left:] @ panel[left:right]
+        pivots = _factor_panel(panel[start:], block_size)
+        for j, pivot in zip(range(start, end), pivots):
+            perm[[j, start + pivot]] = perm[[start + pivot, j]]
+        matrix[:, start:end] = panel
+        inverse = np.empty(m, dtype=int)
+        inverse[perm] = np.arange(m)
+        inverses.append(inverse)
+
+    # Rows of L below each panel are put in the final row order
+    for (left, right), inverse in zip(bounds[:-1], inverses):
+        lower = np.asarray(matrix[right:, left:right], dtype=np.float64)
+        matrix[right:, left:right] = lower[inverse[perm[right:]] - right]
+    if isinstance(matrix, np.memmap):
+        matrix.flush()
+    return perm
+
+
+def out_of_core_triangular_solve(matrix: np.array, b: np.array, lower: bool,
+                                 unit_diagonal: bool = False,
+                                 panel_size: int = 1024) -> np.array:
+    """
+    Given a square triangular matrix stored on disk as an np.memmap and a vector of dependent
+    values, returns the solution of the system reading the matrix one column panel at a time,
+    so the whole matrix is read once. Only the given triangle is used, so the packed factors
+    left by out_of_core_lu_factor can be solved with directly. A matrix of dependent values
+    can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    matrix : np.array
+        Square triangular matrix, usually an np.memmap.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+    lower : bool
+        Whether to use the lower triangle, otherwise the upper triangle is used.
+    unit_diagonal : bool, default False
+        Whether to take the diagonal as all ones. Defaults to False.
+    panel_size : int, default 1024
+        Number of columns in each panel. Defaults to 1024.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the matrix and the vector of dependent values have a different number of rows.
+    """
+    m = matrix.shape[0]
+    if m != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    if panel_size <= 0:
+        raise ValueError("Panel size must be positive")
+    sol = np.array(b, dtype=np.float64)
+    starts = range(0, m, panel_size) if lower else reversed(range(0, m, panel_size))
+    for start in starts:
+        end = min(start + panel_size, m)
+        if lower:
+            panel = np.asarray(matrix[start:, start:end], dtype=np.float64)
+            sol[start:end] = solve_triangular(panel[:end - start], sol[start:end], lower=True,
+                                              unit_diagonal=unit_diagonal)
+            sol[end:] -= panel[end - start:] @ sol[start:end]
+        else:
+            panel = np.asarray(matrix[:end, start:end], dtype=np.float64)
+            sol[start:end] = solve_triangular(panel[start:], sol[start:end], lower=False,
+                                              unit_diagonal=unit_diagonal)
+            sol[:start] -= panel[:start] @ sol[start:end]
+    return sol
+
+
+def out_of_core_lu_solve(matrix: np.array, perm: np.array, b: np.array,
+                         panel_size: int = 1024) -> np.array:
+    """
+    Given packed LU factors stored on disk by out_of_core_lu_factor, its permutation vector,
+    and a vector of dependent values, returns the solution of the original system. The
+    factors are read twice, one column panel at a time. A matrix of dependent values can be
+    given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    matrix : np.array
+        Packed LU factors from out_of_core_lu_factor, usually an np.memmap.
+    perm : np.array
+        Permutation vector from out_of_core_lu_factor.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+    panel_size : int, default 1024
+        Number of columns in each panel. Defaults to 1024.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the factors and the vector of dependent values have a different number of rows.
+    """
+    if matrix.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    y = out_of_core_triangular_solve(matrix, np.asarray(b)[perm], lower=True,
+                                     unit_diagonal=True, panel_size=panel_size)
+    return out_of_core_triangular_solve(matrix, y, lower=False, panel_size=panel_size)
+
+
+def mixed_precision_solve(input_matrix: np.array, b: np.array, threshold: float = None,
+                          iterations: int = 30) -> tuple:
+    """
+    Given a square matrix and a vector of dependent values, returns the solution of the system
+    to double precision accuracy using mixed precision iterative refinement. The matrix is
+    factored once with lu_factor in float32, which takes half the memory and time of float64.
+    Then the residual b - A @ x is computed in float64 and a correction is solved for with the
+    float32 factors, until the residual is as small as a float64 solve would leave it. This
+    works for matrices whose condition number is well below 1 / eps of float32, about 10^7.
+    A matrix of dependent values can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix of the system.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+    threshold : float, optional
+        Largest allowed ratio of the infinity norm of the residual to
+        norm(A) * norm(x) + norm(b). Defaults to sqrt(n) times eps of float64.
+    iterations : int, default 30
+        Max number of refinement steps. Defaults to 30.
+
+    Returns
+    -------
+    tuple
+        Solution vector for the system, or matrix with one solution per column, and the
+        number of refinement steps taken.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square, if it is singular, if the matrix and the vector of
+        dependent values have a different number of rows, or if the refinement does not reach
+        the threshold, which means the matrix is too ill conditioned for float32 factors.
+    """
+    matrix = np.asarray(input_matrix, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if matrix.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    if threshold is None:
+        threshold = np.sqrt(matrix.shape[0]) * np.finfo(np.float64).eps
+    lu, perm = lu_factor(matrix, dtype=np.float32)
+    matrix_norm = np.max(np.sum(np.abs(matrix), axis=1), initial=0)
+    b_norm = np.max(np.abs(b), axis=0, initial=0)
+
+    sol = lu_solve(lu, perm, b).astype(np.float64)
+    for step in range(iterations + 1):
+        residual = b - matrix @ sol
+        scale = matrix_norm * np.max(np.abs(sol), axis=0, initial=0) + b_norm
+        if np.all(np.max(np.abs(residual), axis=0, initial=0) <= threshold * scale):
+            return sol, step
+        if step < iterations:
+            sol += lu_solve(lu, perm, residual)
+    raise ValueError("Iterative refinement did not converge, matrix is too ill conditioned")
+
+
+def cholesky_factor(input_matrix: np.array, block_size: int = 64, overwrite: bool = False,
+                    dtype: type = np.float64) -> np.array:
+    """
+    Given a symmetric positive definite matrix, returns the lower triangular L of its Cholesky
+    decomposition, input_matrix = L @ L.T. Only the lower triangle of the input is
+    referenced and the upper triangle of the result is zero. The factorization is blocked: each
+    diagonal block of block_size columns is factored column by column, the panel below it is
+    found with one triangular solve, and the lower triangle of the rest of the matrix is
+    updated with one matrix multiplication per block column. Since only the lower triangle is
+    updated, it takes about half the work of lu_factor.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Symmetric positive definite matrix to decompose.
+    block_size : int, default 64
+        Number of columns in each block. Defaults to 64.
+    overwrite : bool, default False
+        If the input already has the given dtype, factor it in place instead of copying it.
+        Defaults to False.
+    dtype : type, default np.float64
+        Floating point type to factor in, np.float32 or np.float64. It does not follow
+        set_default_dtype. Defaults to np.float64.
+
+    Returns
+    -------
+    np.array
+        Lower triangular Cholesky factor.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square, or as soon as a pivot that is not positive is found,
+        naming the order of the leading minor that is not positive definite.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    dtype = _resolve_dtype(dtype, follow_default=False)
+    if overwrite and input_matrix.dtype == dtype:
+        lower = input_matrix
+    else:
+        lower = np.array(input_matrix, dtype=dtype)
+    m = lower.shape[0]
+
+    for start in range(0, m, block_size):
+        end = min(start + block_size, m)
+        for j in range(start, end):
+            if not lower[j, j] > 0:
+                raise ValueError("Given matrix is not positive definite, leading minor of order "
+                                 + str(j + 1) + " is not positive")
+            lower[j, j] = np.sqrt(lower[j, j])
+            lower[j + 1:end, j] /= lower[j, j]
+            # Rank one update of the rest of the diagonal block only
+            lower[j + 1:end, j + 1:end] -= np.outer(lower[j + 1:end, j], lower[j + 1:end, j])
+        lower[start:end, start:end] = np.tril(lower[start:end, start:end])
+        lower[start:end, end:] = 0
+        if end < m:
+            lower[end:, start:end] = solve_triangular(lower[start:end, start:end],
+                                                      lower[end:, start:end].T, lower=True).T
+            panel = lower[end:, start:end]
+            # Update the lower triangle of the rest only, one block column at a time
+            for column in range(end, m, block_size):
+                stop = min(column + block_size, m)
+                lower[column:, column:stop] -= (panel[column - end:]
+                                                @ panel[column - end:stop - end].T)
+    return lower
+
+
+def cholesky_solve(lower: np.array, b: np.array) -> np.array:
+    """
+    Given a lower triangular Cholesky factor from cholesky_factor and a vector of dependent
+    values, returns the solution of the original system in the precision of the factor. A
+    matrix of dependent values can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    lower : np.array
+        Lower triangular Cholesky factor.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the factor and the vector of dependent values have a different number of rows.
+    """
+    if lower.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    y = solve_triangular(lower, np.asarray(b, dtype=lower.dtype), lower=True)
+    return solve_triangular(lower, y, lower=True, trans="T")
+
+
+def cholesky_update(lower: np.array, x: np.array, downdate: bool = False) -> np.array:
+    """
+    Given the lower triangular Cholesky factor L of a matrix A and a vector x, returns the
+    Cholesky factor of A + x @ x.T, or of A - x @ x.T for a downdate, in O(n ** 2) operations
+    with a sweep of Givens rotations, instead of the O(n ** 3) of factoring again. A matrix x
+    with k columns applies k rank one updates. The given factor is not modified.
+
+    Parameters
+    ----------
+    lower : np.array
+        Lower triangular Cholesky factor from cholesky_factor.
+    x : np.array
+        Vector of length n, or matrix with k columns.
+    downdate : bool, default False
+        Whether to subtract x @ x.T instead of adding it. Defaults to False.
+
+    Returns
+    -------
+    np.array
+        Lower triangular Cholesky factor of the updated matrix.
+
+    Raises
+    ------
+    ValueError
+        If x does not have n rows, or if a downdate leaves a matrix that is not positive
+        definite.
+    """
+    n = lower.shape[0]
+    if np.shape(x)[0] != n:
+        raise ValueError("Both inputs must have same number of rows")
+    sign = -1 if downdate else 1
+    updated = np.tril(np.asarray(lower, dtype=np.float64))
+    for column in np.asarray(x, dtype=np.float64).reshape(n, -1).T:
+        column = column.copy()
+        for k in range(n):
+            squared = updated[k, k] ** 2 + sign * column[k] ** 2
+            if squared <= 0:
+                raise ValueError("Downdated matrix is not positive definite")
+            diagonal = np.sqrt(squared)
+            c = diagonal / updated[k, k]
+            s = column[k] / updated[k, k]
+            updated[k, k] = diagonal
+            updated[k + 1:, k] = (updated[k + 1:, k] + sign * s * column[k + 1:]) / c
+            column[k + 1:] = c * column[k + 1:] - s * updated[k + 1:, k]
+    return updated
+
+
+def pivoted_cholesky(input_matrix: np.array, tolerance: float = None) -> tuple:
+    """
+    Given a symmetric positive semidefinite matrix, computes a rank revealing Cholesky
+    decomposition with diagonal pivoting, input_matrix[perm][:, perm] = L @ L.T. At each step
+    the largest remaining diagonal entry is chosen as the pivot, and the factorization stops
+    once it falls below the tolerance, so L has one column per numerically independent
+    direction. Only the columns that are used are read from the lower triangle of the input.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Symmetric positive semidefinite matrix to decompose.
+    tolerance : float, optional
+        Pivots at or below this size are treated as zero. Defaults to n * eps times the
+        largest diagonal entry.
+
+    Returns
+    -------
+    tuple
+        Lower trapezoidal factor with rank columns, the permutation vector, and the numerical
+        rank.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square, or if a remaining diagonal entry is negative beyond
+        the tolerance, meaning the matrix is not positive semidefinite.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    m = input_matrix.shape[0]
+    remaining = np.array(np.diagonal(input_matrix), dtype=np.float64)
+    if tolerance is None:
+        tolerance = m * np.finfo(np.float64).eps * max(np.max(remaining, initial=0), 0)
+    lower = np.zeros((m, m))
+    perm = np.arange(m)
+
+    rank = m
+    for k in range(m):
+        pivot = k + np.argmax(remaining[k:])
+        if remaining[pivot] <= tolerance:
+            rank = k
+            break
+        perm[[k, pivot]] = perm[[pivot, k]]
+        remaining[[k, pivot]] = remaining[[pivot, k]]
+        lower[[k, pivot], :k] = lower[[pivot, k], :k]
+        lower[k, k] = np.sqrt(remaining[k])
+        rows = np.maximum(perm[k + 1:], perm[k])
+        cols = np.minimum(perm[k + 1:], perm[k])
+        lower[k + 1:, k] = (np.asarray(input_matrix[rows, cols], dtype=np.float64)
+                            - lower[k + 1:, :k] @ lower[k, :k]) / lower[k, k]
+        remaining[k + 1:] -= lower[k + 1:, k] ** 2
+    if np.any(remaining[rank:] < -tolerance):
+        raise ValueError("Given matrix is not positive semidefinite")
+    return lower[:, :rank], perm, rank
+
+
+def ldl_factor(input_matrix: np.array, block_size: int = 64, overwrite: bool = False,
+               dtype: type = np.float64) -> tuple:
+    """
+    Given a symmetric matrix, which may be indefinite, computes its LDL decomposition with
+    Bunch-Kaufman pivoting, input_matrix[perm][:, perm] = L @ D @ L.T. L is unit lower
+    triangular and D is block diagonal with 1 by 1 and 2 by 2 blocks, chosen so that the
+    multipliers stay bounded without giving up symmetry. The factors are packed into the lower
+    triangle of one array: the strictly lower triangle holds L, whose diagonal of ones is not
+    stored, and the diagonal holds the diagonal of D, whose subdiagonal is returned on its
+    own. Only the lower triangle of the input is referenced or written. The factorization is
+    partitioned as in LAPACK's sytrf: each panel of block_size columns is factored with the
+    updates of the columns it needs, and the rest of the lower triangle is then updated with
+    one matrix multiplication per block column. A singular matrix still has a decomposition,
+    with a zero in D.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Symmetric matrix to decompose.
+    block_size : int, default 64
+        Number of columns in each panel. Defaults to 64.
+    overwrite : bool, default False
+        If the input already has the given dtype, factor it in place instead of copying it.
+        Defaults to False.
+    dtype : type, default np.float64
+        Floating point type to factor in, np.float32 or np.float64. It does not follow
+        set_default_dtype. Defaults to np.float64.
+
+    Returns
+    -------
+    tuple
+        Packed LDL factors, the subdiagonal of D, which is nonzero only in the first row of
+        each 2 by 2 block, and the permutation vector.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    dtype = _resolve_dtype(dtype, follow_default=False)
+    if overwrite and input_matrix.dtype == dtype:
+        ldl = input_matrix
+    else:
+        ldl = np.array(input_matrix, dtype=dtype)
+    m = ldl.shape[0]
+    off_diagonal = np.zeros(max(m - 1, 0), dtype=dtype)
+    perm = np.arange(m)
+    # A panel needs room for a 2 by 2 pivot
+    work = np.empty((m, max(block_size, 2)), dtype=dtype)
+
+    start = 0
+    while start < m:
+        size = _factor_symmetric_panel(ldl, off_diagonal, perm, work, start)
+        end = start + size
+        # Update the lower triangle of the rest one block column at a time
+        for column in range(end, m, block_size):
+            stop = min(column + block_size, m)
+            update = ldl[column:, start:end] @ work[column:stop, :size].T
+            update[:stop - column] = np.tril(update[:stop - column])
+            ldl[column:, column:stop] -= update
+        start = end
+    return ldl, off_diagonal, perm
+
+
+def _factor_symmetric_panel(ldl: np.array, off_diagonal: np.array, perm: np.array,
+                            work: np.array, start: int) -> int:
+    """
+    Factors the columns of a symmetric matrix from start onward with Bunch-Kaufman pivoting
+    in place, until the panel is full or the matrix is done, and returns the number of
+    columns factored. The columns right of the panel are not updated, instead work holds
+    the factored columns times D, so that the rest of the matrix is updated later with
+    ldl[i, start:end] @ work[j, :size].
+
+    Parameters
+    ----------
+    ldl : np.array
+        Matrix whose lower triangle is overwritten with the packed factors of the panel.
+    off_diagonal : np.array
+        Subdiagonal of D, set for each 2 by 2 pivot of the panel.
+    perm : np.array
+        Permutation vector, updated with the interchanges of the panel.
+    work : np.array
+        Matrix with as many rows as ldl, whose number of columns is the panel width.
+    start : int
+        First column of the panel.
+
+    Returns
+    -------
+    int
+        Number of columns factored, the panel width or one less so a 2 by 2 pivot is not
+        split, or all the remaining columns.
+    """
+    m = ldl.shape[0]
+    width = work.shape[1]
+    alpha = (1 + np.sqrt(17)) / 8
+    last = m if m - start <= width else start + width - 1
+
+    k = start
+    while k < last:
+        j = k - start
+        # Column k updated with the columns already factored in the panel
+        work[k:, j] = ldl[k:, k]
+        work[k:, j] -= ldl[k:, start:k] @ work[k, :j]
+        size = 1
+        pivot = k
+        if k + 1 < m:
+            r = k + 1 + np.argmax(np.abs(work[k + 1:, j]))
+            largest = abs(work[r, j])
+            if largest > 0 and abs(work[k, j]) < alpha * largest:
+                # Column r updated the same way, read from row r and column r of the lower
+                # triangle
+                work[k:r, j + 1] = ldl[r, k:r]
+                work[r:, j + 1] = ldl[r:, r]
+                work[k:, j + 1] -= ldl[k:, start:k] @ work[r, :j]
+                column = np.abs(work[k:, j + 1])
+                column[r - k] = 0
+                sigma = np.max(column)
+                if abs(work[k, j]) * sigma >= alpha * largest ** 2:
+                    pass
+                elif abs(work[r, j + 1]) >= alpha * sigma:
+                    pivot = r
+                    work[k:, j] = work[k:, j + 1]
+                else:
+                    pivot = r
+                    size = 2
+
+        swapped = k + size - 1
+        if pivot != swapped:
+            # Symmetric interchange of rows and columns in the lower triangle only, column
+            # swapped itself is overwritten below
+            ldl[pivot, pivot] = ldl[swapped, swapped]
+            ldl[pivot, swapped + 1:pivot] = ldl[swapped + 1:pivot, swapped]
+            ldl[pivot + 1:, [swapped, pivot]] = ldl[pivot + 1:, [pivot, swapped]]
+            ldl[[swapped, pivot], :swapped] = ldl[[pivot, swapped], :swapped]
+            work[[swapped, pivot], :j + size] = work[[pivot, swapped], :j + size]
+            perm[[swapped, pivot]] = perm[[pivot, swapped]]
+
+        if size == 1:
+            ldl[k:, k] = work[k:, j]
+            if ldl[k, k] != 0:
+                ldl[k + 1:, k] /= ldl[k, k]
+        else:
+            first, coupling, second = work[k, j], work[k + 1, j], work[k + 1, j + 1]
+            determinant = first * second - coupling ** 2
+            ldl[k, k] = first
+            ldl[k + 1, k] = 0
+            ldl[k + 1, k + 1] = second
+            off_diagonal[k] = coupling
+            # Multipliers solve L @ D = W for the two columns of the block
+            ldl[k + 2:, k] = ((second * work[k + 2:, j] - coupling * work[k + 2:, j + 1])
+                              / determinant)
+            ldl[k + 2:, k + 1] = ((first * work[k + 2:, j + 1] - coupling * work[k + 2:, j])
+                                  / determinant)
+        k += size
+    return k - start
+
+
+def ldl_solve(ldl: np.array, off_diagonal: np.array, perm: np.array, b: np.array) -> np.array:
+    """
+    Given the LDL decomposition from ldl_factor and a vector of dependent values, returns the
+    solution of the original system. A matrix of dependent values can be given instead to
+    solve for every column at once.
+
+    Parameters
+    ----------
+    ldl : np.array
+        Packed LDL factors from ldl_factor.
+    off_diagonal : np.array
+        Subdiagonal of D from ldl_factor.
+    perm : np.array
+        Permutation vector from ldl_factor.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the factors and the vector of dependent values have a different number of rows, or
+        if the matrix is singular.
+    """
+    b = np.asarray(b, dtype=ldl.dtype)
+    if ldl.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    diagonal = np.diagonal(ldl)
+    y = solve_triangular(ldl, b[perm], lower=True, unit_diagonal=True)
+    extra = (slice(None),) + (np.newaxis,) * (y.ndim - 1)
+    starts = np.flatnonzero(off_diagonal)
+    single = np.ones(ldl.shape[0], dtype=bool)
+    single[starts] = False
+    single[starts + 1] = False
+    determinants = diagonal[starts] * diagonal[starts + 1] - off_diagonal[starts] ** 2
+    if np.any(diagonal[single] == 0) or np.any(determinants == 0):
+        raise ValueError("Given matrix is singular")
+
+    z = np.empty_like(y)
+    z[single] = y[single] / diagonal[single][extra]
+    z[starts] = (diagonal[starts + 1][extra] * y[starts]
+                 - off_diagonal[starts][extra] * y[starts + 1]) / determinants[extra]
+    z[starts + 1] = (diagonal[starts][extra] * y[starts + 1]
+                     - off_diagonal[starts][extra] * y[starts]) / determinants[extra]
+    w = solve_triangular(ldl, z, lower=True, unit_diagonal=True, trans="T")
+    sol = np.empty_like(w)
+    sol[perm] = w
+    return sol
+
+
+def ldl_inertia(ldl: np.array, off_diagonal: np.array, tolerance: float = None) -> tuple:
+    """
+    Given the LDL decomposition from ldl_factor, returns the inertia of the factored matrix,
+    the number of positive, negative, and zero eigenvalues, which by Sylvester's law is the
+    same as that of D. The number of positive and negative eigenvalues together is the
+    numerical rank.
+
+    Parameters
+    ----------
+    ldl : np.array
+        Packed LDL factors from ldl_factor.
+    off_diagonal : np.array
+        Subdiagonal of D from ldl_factor.
+    tolerance : float, optional
+        Eigenvalues of D at or below this size are counted as zero. Defaults to n * eps times
+        the largest entry of D.
+
+    Returns
+    -------
+    tuple
+        Number of positive, negative, and zero eigenvalues.
+    """
+    diagonal = np.diagonal(ldl)
+    m = diagonal.shape[0]
+    if tolerance is None:
+        scale = max(np.max(np.abs(diagonal), initial=0), np.max(np.abs(off_diagonal), initial=0))
+        tolerance = m * np.finfo(ldl.dtype).eps * scale
+    starts = np.flatnonzero(off_diagonal)
+    single = np.ones(m, dtype=bool)
+    single[starts] = False
+    single[starts + 1] = False
+
+    # Eigenvalues of each 2 by 2 block from its trace and determinant
+    mean = (diagonal[starts] + diagonal[starts + 1]) / 2
+    radius = np.hypot((diagonal[starts] - diagonal[starts + 1]) / 2, off_diagonal[starts])
+    eigenvalues = np.concatenate([diagonal[single], mean + radius, mean - radius])
+    positive = int(np.sum(eigenvalues > tolerance))
+    negative = int(np.sum(eigenvalues < -tolerance))
+    return positive, negative, m - positive - negative
+
+
+def _householder(x: np.array) -> tuple:
+    """
+    Given a vector x, returns the vector v with v[0] = 1, the scalar tau, and beta such that
+    (I - tau * v @ v.T) @ x = beta * e1. Tau is zero when x is already a multiple of e1.
+
+    Parameters
+    ----------
+    x : np.array
+        Vector to reflect.
+
+    Returns
+    -------
+    tuple
+        Householder vector, tau, and beta.
+    """
+    v = np.array(x, dtype=np.float64)
+    alpha = v[0]
+    sigma = np.linalg.norm(v[1:])
+    v[0] = 1
+    if sigma == 0:
+        return v, 0.0, alpha
+    beta = -np.copysign(np.hypot(alpha, sigma), alpha)
+    v[1:] /= alpha - beta
+    return v, (beta - alpha) / beta, beta
+
+
+def _block_reflector(reflectors: np.array, tau: np.array) -> np.array:
+    """
+    Given unit lower triangular Householder vectors as columns and their taus, returns the
+    upper triangular T of the compact WY representation H_1 H_2 ... H_k = I - V @ T @ V.T.
+
+    Parameters
+    ----------
+    reflectors : np.array
+        Householder vectors V, one per column, with ones on the diagonal and zeros above.
+    tau : np.array
+        Tau of each Householder vector.
+
+    Returns
+    -------
+    np.array
+        Upper triangular matrix T.
+    """
+    k = len(tau)
+    t = np.zeros((k, k))
+    products = reflectors.T @ reflectors
+    for i in range(k):
+        t[:i, i] = -tau[i] * (t[:i, :i] @ products[:i, i])
+        t[i, i] = tau[i]
+    return t
+
+
+def _reflector_block(qr: np.array, start: int, end: int) -> np.array:
+    """
+    Given packed QR factors and a range of columns, returns the Householder vectors stored
+    below the diagonal of those columns as the columns of a unit lower triangular matrix,
+    starting from row start, which is the V of the compact WY representation of the block.
+
+    Parameters
+    ----------
+    qr : np.array
+        Packed QR factors with the Householder vectors below the diagonal.
+    start : int
+        First column of the block.
+    end : int
+        Column after the last column of the block.
+
+    Returns
+    -------
+    np.array
+        Matrix V of shape (m - start, end - start) with ones on its diagonal and zeros above.
+    """
+    reflectors = np.tril(qr[start:, start:end], -1)
+    reflectors[np.arange(end - start), np.arange(end - start)] = 1
+    return reflectors
+
+
+def qr_factor(input_matrix: np.array, block_size: int = 32) -> tuple:
+    """
+    Given an m by n matrix, computes its QR decomposition with Householder reflections and
+    returns the packed factors and the block reflectors, so that input_matrix = Q @ R. R is
+    stored on and above the diagonal and the Householder vectors below it, so Q is kept
+    implicit and is applied with apply_q and apply_qt. Each block of block_size columns is
+    factored one reflection at a time, and then applied to the columns right of it all at
+    once in the compact WY form I - V @ T @ V.T, which is three matrix multiplications. As in
+    LAPACK's geqrt, the upper triangular T of every block is kept, so applying Q later does
+    not rebuild it.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to decompose.
+    block_size : int, default 32
+        Number of columns in each block. Defaults to 32.
+
+    Returns
+    -------
+    tuple
+        Packed QR factors, and the block reflectors as an array t of shape
+        (min(block_size, k), k) with k = min(m, n), where t[:end - start, start:end] is the T
+        of the block of columns start to end. The diagonal of each T holds the taus of its
+        reflections.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not two dimensional or the block size is not positive.
+    """
+    if input_matrix.ndim != 2:
+        raise ValueError("Given matrix is not two dimensional")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    qr = np.array(input_matrix, dtype=np.float64)
+    m, n = qr.shape
+    k = min(m, n)
+    tau = np.zeros(k)
+    t = np.zeros((min(block_size, k), k))
+
+    for start in range(0, k, block_size):
+        end = min(start + block_size, k)
+        for j in range(start, end):
+            v, tau[j], qr[j, j] = _householder(qr[j:, j])
+            qr[j + 1:, j] = v[1:]
+            # Reflect the rest of the block only
+            qr[j:, j + 1:end] -= tau[j] * np.outer(v, v @ qr[j:, j + 1:end])
+        reflectors = _reflector_block(qr, start, end)
+        block = _block_reflector(reflectors, tau[start:end])
+        t[:end - start, start:end] = block
+        if end < n:
+            qr[start:, end:] -= reflectors @ (block.T @ (reflectors.T @ qr[start:, end:]))
+    return qr, t
+
+
+def _apply_reflectors(qr: np.array, t: np.array, b: np.array, transpose: bool) -> np.array:
+    """
+    Given packed QR factors, their block reflectors, and a vector or matrix, returns Q @ b or
+    Q.T @ b, applying one block of reflections at a time in compact WY form with the stored
+    T of the block.
+
+    Parameters
+    ----------
+    qr : np.array
+        Packed QR factors.
+    t : np.array
+        Block reflectors from qr_factor or pivoted_qr.
+    b : np.array
+        Vector or matrix with m rows.
+    transpose : bool
+        Whether to apply Q.T instead of Q.
+
+    Returns
+    -------
+    np.array
+        Q @ b, or Q.T @ b if transpose is True.
+
+    Raises
+    ------
+    ValueError
+        If the factors and b have a different number of rows.
+    """
+    if qr.shape[0] != b.shape[0]:
+        raise ValueError("Both inputs must have same number of rows")
+    sol = np.array(b, dtype=np.float64)
+    columns = sol.reshape(sol.shape[0], -1)
+    block_size, k = t.shape
+    starts = range(0, k, max(block_size, 1))
+    for start in (starts if transpose else reversed(starts)):
+        end = min(start + block_size, k)
+        reflectors = _reflector_block(qr, start, end)
+        block = t[:end - start, start:end]
+        columns[start:] -= reflectors @ ((block.T if transpose else block)
+                                         @ (reflectors.T @ columns[start:]))
+    return sol
+
+
+def apply_q(qr: np.array, t: np.array, b: np.array) -> np.array:
+    """
+    Given packed QR factors and block reflectors from qr_factor or pivoted_qr and a vector,
+    returns Q @ b without forming Q. A matrix can be given instead to apply Q to every column.
+
+    Parameters
+    ----------
+    qr : np.array
+        Packed QR factors.
+    t : np.array
+        Block reflectors.
+    b : np.array
+        Vector or matrix with m rows.
+
+    Returns
+    -------
+    np.array
+        Q @ b.
+
+    Raises
+    ------
+    ValueError
+        If the factors and b have a different number of rows.
+    """
+    return _apply_reflectors(qr, t, b, False)
+
+
+def apply_qt(qr: np.array, t: np.array, b: np.array) -> np.array:
+    """
+    Given packed QR factors and block reflectors from qr_factor or pivoted_qr and a vector,
+    returns Q.T @ b without forming Q. A matrix can be given instead to apply Q.T to every
+    column.
+
+    Parameters
+    ----------
+    qr : np.array
+        Packed QR factors.
+    t : np.array
+        Block reflectors.
+    b : np.array
+        Vector or matrix with m rows.
+
+    Returns
+    -------
+    np.array
+        Q.T @ b.
+
+    Raises
+    ------
+    ValueError
+        If the factors and b have a different number of rows.
+    """
+    return _apply_reflectors(qr, t, b, True)
+
+
+def qr_unpack(qr: np.array, t: np.array) -> tuple:
+    """
+    Given packed QR factors and block reflectors, returns the reduced factors: Q with
+    orthonormal columns of shape (m, k) and upper triangular R of shape (k, n), where
+    k = min(m, n).
+
+    Parameters
+    ----------
+    qr : np.array
+        Packed QR factors.
+    t : np.array
+        Block reflectors.
+
+    Returns
+    -------
+    tuple
+        Matrices Q and R.
+    """
+    m, n = qr.shape
+    k = min(m, n)
+    return apply_q(qr, t, np.eye(m, k)), np.triu(qr[:k])
+
+
+def pivoted_qr(input_matrix: np.array, tolerance: float = None, block_size: int = 32) -> tuple:
+    """
+    Given an m by n matrix, computes its QR decomposition with column pivoting and returns the
+    packed factors, the block reflectors, the column permutation, and the numerical rank, so
+    that input_matrix[:, perm] = Q @ R. At each step the remaining column with the largest
+    norm is swapped to the front, so the diagonal of R decreases in size and the rank is the
+    number of diagonal entries above the tolerance. Column norms are downdated after each
+    reflection and recomputed when cancellation makes them inaccurate, as LAPACK does. The
+    reflections are applied one at a time, and grouped into blocks of block_size afterwards
+    so Q can be applied in blocks as for qr_factor.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to decompose.
+    tolerance : float, optional
+        Size at or below which a diagonal entry of R counts as zero. Defaults to
+        max(m, n) * eps * |R[0, 0]|.
+    block_size : int, default 32
+        Number of reflections in each block reflector. Defaults to 32.
+
+    Returns
+    -------
+    tuple
+        Packed QR factors, block reflectors laid out as for qr_factor, column permutation
+        vector, and rank.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not two dimensional or the block size is not positive.
+    """
+    if input_matrix.ndim != 2:
+        raise ValueError("Given matrix is not two dimensional")
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    qr = np.array(input_matrix, dtype=np.float64)
+    m, n = qr.shape
+    k = min(m, n)
+    tau = np.zeros(k)
+    perm = np.arange(n)
+    norms = np.linalg.norm(qr, axis=0)
+    original = norms.copy()
+    threshold = np.sqrt(np.finfo(np.float64).eps)
+
+    for j in range(k):
+        pivot = j + np.argmax(norms[j:])
+        if pivot != j:
+            qr[:, [j, pivot]] = qr[:, [pivot, j]]
+            for values in (perm, norms, original):
+                values[[j, pivot]] = values[[pivot, j]]
+        v, tau[j], qr[j, j] = _householder(qr[j:, j])
+        qr[j + 1:, j] = v[1:]
+        qr[j:, j + 1:] -= tau[j] * np.outer(v, v @ qr[j:, j + 1:])
+
+        rest = norms[j + 1:]
+        nonzero = rest != 0
+        ratio = np.ones_like(rest)
+        ratio[nonzero] = np.maximum(1 - (qr[j, j + 1:][nonzero] / rest[nonzero]) ** 2, 0)
+        stale = nonzero & (ratio * (rest / np.where(nonzero, original[j + 1:], 1)) ** 2
+                           <= threshold)
+        rest *= np.sqrt(ratio)
+        stale_columns = j + 1 + np.flatnonzero(stale)
+        rest[stale] = np.linalg.norm(qr[j + 1:, stale_columns], axis=0)
+        original[stale_columns] = rest[stale]
+
+    t = np.zeros((min(block_size, k), k))
+    for start in range(0, k, block_size):
+        end = min(start + block_size, k)
+        t[:end - start, start:end] = _block_reflector(_reflector_block(qr, start, end),
+                                                      tau[start:end])
+
+    diagonal = np.abs(np.diagonal(qr))
+    if tolerance is None:
+        tolerance = max(m, n) * np.finfo(np.float64).eps * (diagonal[0] if k else 0)
+    return qr, t, perm, int(np.sum(diagonal > tolerance))
+
+
+def qr_solve(qr: np.array, t: np.array, b: np.array, perm: np.array = None,
+             rank: int = None) -> np.array:
+    """
+    Given packed QR factors and block reflectors of an m by n matrix with m >= n and a vector
+    of dependent values, returns the least squares solution of the system, which is the
+    solution when the matrix is square. With the permutation and rank from pivoted_qr, the
+    basic solution is returned, which uses only the first rank columns of R and sets the
+    other variables to zero. A matrix of dependent values can be given instead to solve for
+    every column at once.
+
+    Parameters
+    ----------
+    qr : np.array
+        Packed QR factors from qr_factor or pivoted_qr.
+    t : np.array
+        Block reflectors from qr_factor or pivoted_qr.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+    perm : np.array, optional
+        Column permutation vector from pivoted_qr.
+    rank : int, optional
+        Rank from pivoted_qr. Defaults to n.
+
+    Returns
+    -------
+    np.array
+        Least squares solution vector, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer rows than columns, the factors and the vector of dependent values
+        have a different number of rows, or R has a zero on its diagonal within the rank.
+    """
+    m, n = qr.shape
+    if m < n:
+        raise ValueError("Given matrix has fewer rows than columns")
+    rank = n if rank is None else rank
+    if np.any(np.diagonal(qr)[:rank] == 0):
+        raise ValueError("Given matrix is rank deficient")
+    y = apply_qt(qr, t, b)
+    sol = np.zeros((n,) + y.shape[1:])
+    sol[:rank] = solve_triangular(qr[:rank, :rank], y[:rank], lower=False)
+    if perm is None:
+        return sol
+    unpermuted = np.empty_like(sol)
+    unpermuted[perm] = sol
+    return unpermuted
+
+
+def qr_least_squares(input_matrix: np.array, b: np.array, pivoting: bool = False,
+                     tolerance: float = None) -> np.array:
+    """
+    Given an m by n matrix with m >= n and a vector of dependent values, returns the least
+    squares solution to input_matrix @ x = b using Householder QR. Unlike solving the normal
+    equations, the condition number is not squared. With pivoting, the rank is found with
+    pivoted_qr and the basic solution is returned, so rank deficient matrices can be used.
+    A matrix of dependent values can be given instead to solve for every column at once.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Coefficient matrix.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+    pivoting : bool, default False
+        Whether to use column pivoting. Defaults to False.
+    tolerance : float, optional
+        Rank tolerance for pivoted_qr.
+
+    Returns
+    -------
+    np.array
+        Least squares solution vector, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer rows than columns, the inputs have a different number of rows, or
+        the matrix is rank deficient without pivoting.
+    """
+    if pivoting:
+        qr, t, perm, rank = pivoted_qr(input_matrix, tolerance)
+        return qr_solve(qr, t, b, perm, rank)
+    return qr_solve(*qr_factor(input_matrix), b)
+
+
+def _check_batch(matrices: np.array) -> None:
+    """
+    Raises a ValueError unless the given array is a stack of square matrices, shape (N, m, m).
+
+    Parameters
+    ----------
+    matrices : np.array
+        Array to check.
+    """
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError("Given array is not a stack of square matrices")
+
+
+def _swap_rows(rows: np.array, i: int, pivot_row: np.array) -> None:
+    """
+    Given a C contiguous array with the row index first and the batch index last, swaps row i
+    with row pivot_row[k] for each member k of the batch, in place. The pivot rows are
+    gathered and scattered through flat indices into the array's buffer.
+
+    Parameters
+    ----------
+    rows : np.array
+        C contiguous array of shape (m, ..., N).
+    i : int
+        Row to swap.
+    pivot_row : np.array
+        Row to swap with for each member of the batch.
+    """
+    row_size = rows[0].size
+    index = (np.arange(row_size).reshape(-1, pivot_row.size)
+             + pivot_row * row_size).ravel()
+    flat = rows.reshape(-1)
+    swapped = flat[index]
+    flat[index] = rows[i].ravel()
+    rows[i] = swapped.reshape(rows.shape[1:])
+
+
+def batched_regular_gaussian_elim(matrices: np.array, dtype: type = None) -> tuple:
+    """
+    Given a stack of regular matrices of shape (N, m, m), performs regular gaussian elimination
+    on every matrix at once and returns the reduced matrices. Each elimination step is done
+    for the whole stack with array operations, so the Python work grows with m and not N.
+    Instead of raising on a matrix that is not regular, its flag is set and the matrix is left
+    partly reduced.
+
+    Parameters
+    ----------
+    matrices : np.array
+        Stack of regular matrices, shape (N, m, m).
+    dtype : type, optional
+        Floating point type to compute in, np.float32 or np.float64. Defaults to
+        get_default_dtype().
+
+    Returns
+    -------
+    tuple
+        Reduced matrices, and a boolean array that is True for each matrix that is not regular.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices.
+    """
+    _check_batch(matrices)
+    # Batch index last so every step works on contiguous runs of N values
+    reduced = np.array(np.moveaxis(matrices, 0, -1), dtype=_resolve_dtype(dtype), order="C")
+    m, count = reduced.shape[1:]
+    not_regular = np.zeros(count, dtype=bool)
+    for i in range(m - 1):
+        pivot = reduced[i, i]
+        zero = pivot == 0
+        not_regular |= zero
+        coef = reduced[i + 1:, i] / np.where(zero, 1, pivot)
+        coef[:, not_regular] = 0
+        reduced[i + 1:] -= coef[:, np.newaxis] * reduced[i]
+    return np.moveaxis(reduced, -1, 0), not_regular
+
+
+def batched_lu_factor(matrices: np.array, dtype: type = None) -> tuple:
+    """
+    Given a stack of square matrices of shape (N, m, m), computes the LU decomposition with
+    partial pivoting of every matrix at once and returns the factors packed as in lu_factor,
+    so that matrices[k][perm[k]] = L @ U for the L and U packed in lu[k]. Each matrix picks
+    its own pivot rows, and each elimination step is done for the whole stack with array
+    operations, so the Python work grows with m and not N. Instead of raising on a singular
+    matrix, its flag is set and its remaining columns are eliminated with zero multipliers.
+
+    Parameters
+    ----------
+    matrices : np.array
+        Stack of square matrices, shape (N, m, m).
+    dtype : type, optional
+        Floating point type to compute in, np.float32 or np.float64. Defaults to
+        get_default_dtype().
+
+    Returns
+    -------
+    tuple
+        Packed LU factors of shape (N, m, m), permutation vectors of shape (N, m), and a
+        boolean array that is True for each singular matrix.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices.
+    """
+    _check_batch(matrices)
+    # Batch index last so every step works on contiguous runs of N values
+    lu = np.array(np.moveaxis(matrices, 0, -1), dtype=_resolve_dtype(dtype), order="C")
+    m, count = lu.shape[1:]
+    perm = np.repeat(np.arange(m)[:, np.newaxis], count, axis=1)
+    singular = np.zeros(count, dtype=bool)
+
+    for i in range(m):
+        pivot_row = i + np.argmax(np.abs(lu[i:, i]), axis=0)
+        _swap_rows(lu, i, pivot_row)
+        _swap_rows(perm, i, pivot_row)
+        pivot = lu[i, i]
+        zero = pivot == 0
+        singular |= zero
+        lu[i + 1:, i] /= np.where(zero, 1, pivot)
+        lu[i + 1:, i][:, zero] = 0
+        lu[i + 1:, i + 1:] -= lu[i + 1:, i, np.newaxis] * lu[i, i + 1:]
+    return np.moveaxis(lu, -1, 0), perm.T, singular
+
+
+def batched_lu_decomposition(matrices: np.array, dtype: type = None) -> tuple:
+    """
+    Given a stack of square matrices of shape (N, m, m), computes the LU decomposition with
+    partial pivoting of every matrix at once with batched_lu_factor and returns the separate
+    factors, so that matrices[k][perm[k]] = lower[k] @ upper[k].
+
+    Parameters
+    ----------
+    matrices : np.array
+        Stack of square matrices, shape (N, m, m).
+    dtype : type, optional
+        Floating point type to compute in, np.float32 or np.float64. Defaults to
+        get_default_dtype().
+
+    Returns
+    -------
+    tuple
+        Unit lower triangular matrices, upper triangular matrices, permutation vectors of shape
+        (N, m), and a boolean array that is True for each singular matrix.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices.
+    """
+    lu, perm, singular = batched_lu_factor(matrices, dtype=dtype)
+    m = lu.shape[1]
+    below = np.tri(m, k=-1, dtype=bool)
+    lower = np.where(below, lu, np.eye(m, dtype=lu.dtype))
+    upper = np.where(below, 0, lu)
+    return lower, upper, perm, singular
+
+
+def _batched_triangular_solve(triangular: np.array, b: np.array, upper: bool,
+                              unit_diagonal: bool = False) -> tuple:
+    """
+    Solves a stack of triangular systems one row at a time, with each row found for the
+    whole stack at once. Only the triangle being solved with is read. Rows with a zero
+    diagonal entry are set to 0 and flagged.
+
+    Parameters
+    ----------
+    triangular : np.array
+        Stack of triangular matrices, shape (N, m, m).
+    b : np.array
+        Dependent values, shape (N, m) or (N, m, k).
+    upper : bool
+        If the matrices are upper triangular, otherwise lower triangular.
+    unit_diagonal : bool, default False
+        If the diagonal is taken to be all ones instead of read. Defaults to False.
+
+    Returns
+    -------
+    tuple
+        Solutions with the shape of b, and a boolean array that is True for each system with a
+        zero diagonal entry.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices or if the matrices and the dependent
+        values have a different number of rows.
+    """
+    _check_batch(triangular)
+    if b.ndim not in (2, 3) or b.shape[:2] != triangular.shape[:2]:
+        raise ValueError("Both inputs must have same number of rows")
+    dtype = np.result_type(triangular.dtype, b.dtype, np.float32)
+    vector = b.ndim == 2
+    # Batch index last so every step works on contiguous runs of N values
+    matrix = np.ascontiguousarray(np.moveaxis(triangular, 0, -1))
+    sol = np.array(np.moveaxis(b[..., np.newaxis] if vector else b, 0, -1), dtype=dtype,
+                   order="C")
+    m, count = matrix.shape[1:]
+    singular = np.zeros(count, dtype=bool)
+
+    for i in (range(m - 1, -1, -1) if upper else range(m)):
+        known = slice(i + 1, m) if upper else slice(0, i)
+        sol[i] -= np.sum(matrix[i, known, np.newaxis] * sol[known], axis=0)
+        if unit_diagonal:
+            continue
+        pivot = matrix[i, i]
+        zero = pivot == 0
+        singular |= zero
+        sol[i] /= np.where(zero, 1, pivot)
+        sol[i][:, zero] = 0
+    sol = np.moveaxis(sol, -1, 0)
+    return (sol[..., 0] if vector else sol), singular
+
+
+def batched_back_substitution(upper: np.array, b: np.array) -> tuple:
+    """
+    Given a stack of upper triangular matrices of shape (N, m, m) and their dependent values,
+    returns the solution of every system, with each row solved for the whole stack at once.
+    Dependent values of shape (N, m, k) solve k right hand sides for every matrix. Instead of
+    printing or raising on a zero diagonal entry, that variable is set to 0 and the system is
+    flagged.
+
+    Parameters
+    ----------
+    upper : np.array
+        Stack of upper triangular matrices, shape (N, m, m).
+    b : np.array
+        Dependent values, shape (N, m) or (N, m, k).
+
+    Returns
+    -------
+    tuple
+        Solutions with the shape of b, and a boolean array that is True for each system with a
+        zero diagonal entry.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices or if the matrices and the dependent
+        values have a different number of rows.
+    """
+    return _batched_triangular_solve(upper, b, upper=True)
+
+
+def batched_forward_substitution(lower: np.array, b: np.array) -> tuple:
+    """
+    Given a stack of lower triangular matrices of shape (N, m, m) and their dependent values,
+    returns the solution of every system, with each row solved for the whole stack at once.
+    Dependent values of shape (N, m, k) solve k right hand sides for every matrix. Instead of
+    printing or raising on a zero diagonal entry, that variable is set to 0 and the system is
+    flagged.
+
+    Parameters
+    ----------
+    lower : np.array
+        Stack of lower triangular matrices, shape (N, m, m).
+    b : np.array
+        Dependent values, shape (N, m) or (N, m, k).
+
+    Returns
+    -------
+    tuple
+        Solutions with the shape of b, and a boolean array that is True for each system with a
+        zero diagonal entry.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices or if the matrices and the dependent
+        values have a different number of rows.
+    """
+    return _batched_triangular_solve(lower, b, upper=False)
+
+
+def batched_lu_solve(lu: np.array, perm: np.array, b: np.array) -> tuple:
+    """
+    Given packed LU factors and permutation vectors from batched_lu_factor and the dependent
+    values of every system, returns the solution of every system with batched forward and
+    back substitution.
+
+    Parameters
+    ----------
+    lu : np.array
+        Packed LU factors from batched_lu_factor, shape (N, m, m).
+    perm : np.array
+        Permutation vectors from batched_lu_factor, shape (N, m).
+    b : np.array
+        Dependent values, shape (N, m) or (N, m, k).
+
+    Returns
+    -------
+    tuple
+        Solutions with the shape of b, and a boolean array that is True for each system with a
+        zero pivot.
+
+    Raises
+    ------
+    ValueError
+        If the factors and the dependent values have a different number of rows.
+    """
+    if b.ndim not in (2, 3) or b.shape[:2] != lu.shape[:2]:
+        raise ValueError("Both inputs must have same number of rows")
+    permuted = np.take_along_axis(b, perm if b.ndim == 2 else perm[:, :, np.newaxis], axis=1)
+    y, unused = _batched_triangular_solve(lu, permuted.astype(lu.dtype), upper=False,
+                                          unit_diagonal=True)
+    return _batched_triangular_solve(lu, y, upper=True)
+
+
+def batched_solve(matrices: np.array, b: np.array, dtype: type = None) -> tuple:
+    """
+    Given a stack of square matrices of shape (N, m, m) and their dependent values, returns
+    the solution of every system using batched_lu_factor followed by batched_lu_solve.
+    Singular systems are flagged and their solutions should not be used.
+
+    Parameters
+    ----------
+    matrices : np.array
+        Stack of square matrices, shape (N, m, m).
+    b : np.array
+        Dependent values, shape (N, m) or (N, m, k).
+    dtype : type, optional
+        Floating point type to compute in, np.float32 or np.float64. Defaults to
+        get_default_dtype().
+
+    Returns
+    -------
+    tuple
+        Solutions with the shape of b, and a boolean array that is True for each singular
+        matrix.
+
+    Raises
+    ------
+    ValueError
+        If the input is not a stack of square matrices or if the matrices and the dependent
+        values have a different number of rows.
+    """
+    lu, perm, singular = batched_lu_factor(matrices, dtype=dtype)
+    sol, zero_pivot = batched_lu_solve(lu, perm, b)
+    return sol, singular | zero_pivot
+
+
+class Factorization:
+    """
+    Factorization of a square matrix that can be reused to solve systems with many right hand
+    sides. Symmetric positive definite matrices are factored with cholesky_factor,
+    A = L @ L.T, and all others with the pivoted LU decomposition of lu_factor.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix to factor.
+    method : str, default "auto"
+        One of "lu", "cholesky", or "auto", which tries Cholesky for symmetric matrices and
+        falls back to LU. Defaults to "auto".
+    block_size : int, default 64
+        Block width for the Cholesky or LU factorization. Defaults to 64.
+
+    Attributes
+    ----------
+    method : str
+        Factorization used, either "lu" or "cholesky".
+    factors : np.array
+        Packed LU factors, or the lower triangular Cholesky factor.
+    perm : np.array
+        Row permutation of the LU factorization, or None for Cholesky.
+    norm : float
+        1-norm of the factored matrix, used by condition_estimate.
+    updates : int
+        Number of rank one updates applied by update_factorization since the matrix was
+        last factored from scratch.
+
+    Raises
+    ------
+    ValueError
+        If the matrix is not square, if it is singular, if the method is not recognized, or
+        if Cholesky is requested for a matrix that is not symmetric positive definite.
+    """
+
+    def __init__(self, input_matrix: np.array, method: str = "auto", block_size: int = 64):
+        if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+            raise ValueError("Given matrix is not square")
+        if method not in ("auto", "lu", "cholesky"):
+            raise ValueError("Unknown method: " + str(method))
+        self.perm = None
+        self.norm = np.linalg.norm(input_matrix, 1)
+        self.updates = 0
+        if method != "lu" and np.array_equal(input_matrix, input_matrix.T):
+            try:
+                self.factors = cholesky_factor(input_matrix, block_size=block_size)
+                self.method = "cholesky"
+                return
+            except ValueError:
+                pass
+        if method == "cholesky":
+            raise ValueError("Given matrix is not symmetric positive definite")
+        self.factors, self.perm = lu_factor(input_matrix, block_size=block_size)
+        self.method = "lu"
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Shape of the factored matrix.
+        """
+        return self.factors.shape
+
+    def solve(self, b: np.array, transpose: bool = False) -> np.array:
+        """
+        Given a vector of dependent values, returns the solution of the factored system. A
+        matrix of dependent values can be given instead to solve for every column at once.
+
+        Parameters
+        ----------
+        b : np.array
+            Vector of dependent values, or matrix with one right hand side per column.
+        transpose : bool, default False
+            Solve the system with the transpose of the factored matrix instead.
+            Defaults to False.
+
+        Returns
+        -------
+        np.array
+            Solution vector for the system, or matrix with one solution per column.
+
+        Raises
+        ------
+        ValueError
+            If the matrix and the vector of dependent values have a different number of rows.
+        """
+        b = np.asarray(b, dtype=np.float64)
+        if self.factors.shape[0] != b.shape[0]:
+            raise ValueError("Both inputs must have same number of rows")
+        if self.method == "cholesky":
+            return cholesky_solve(self.factors, b)
+        if not transpose:
+            return lu_solve(self.factors, self.perm, b)
+        # A.T = U.T @ L.T @ P, so solve with U.T, then L.T, then undo the permutation
+        z = solve_triangular(self.factors, b, lower=False, trans="T")
+        w = solve_triangular(self.factors, z, lower=True, unit_diagonal=True, trans="T")
+        sol = np.empty_like(w)
+        sol[self.perm] = w
+        return sol
+
+    def logdet(self) -> tuple:
+        """
+        Returns the sign and the natural log of the absolute value of the determinant of the
+        factored matrix, from the diagonal of the factors in O(n) operations. Unlike det,
+        this does not overflow or underflow for large matrices.
+
+        Returns
+        -------
+        tuple
+            Sign of the determinant, 1.0 or -1.0, and log of its absolute value.
+        """
+        diagonal = np.diagonal(self.factors)
+        if self.method == "cholesky":
+            return 1.0, 2 * np.sum(np.log(diagonal))
+        sign = _permutation_sign(self.perm) * np.prod(np.sign(diagonal))
+        return float(sign), np.sum(np.log(np.abs(diagonal)))
+
+    def det(self) -> float:
+        """
+        Returns the determinant of the factored matrix in O(n) operations.
+
+        Returns
+        -------
+        float
+            Determinant of the matrix.
+        """
+        sign, log_abs = self.logdet()
+        return sign * np.exp(log_abs)
+
+    def inv(self) -> np.array:
+        """
+        Returns the inverse of the factored matrix by solving with the identity, which takes
+        O(n ** 3) operations. Solving with the factorization is cheaper and more accurate
+        than multiplying by the inverse, so this should only be used when the entries of the
+        inverse are needed.
+
+        Returns
+        -------
+        np.array
+            Inverse of the matrix.
+        """
+        return self.solve(np.eye(self.shape[0]))
+
+    def condition_estimate(self) -> float:
+        """
+        Returns an estimate of the 1-norm condition number of the factored matrix,
+        norm(A, 1) * norm(inv(A), 1), in O(n ** 2) operations. The norm of the inverse is
+        estimated with the Hager and Higham method, which uses a few solves with the
+        factorization and its transpose. The estimate is a lower bound that is almost always
+        within a factor of 3 of the true value.
+
+        Returns
+        -------
+        float
+            Estimated 1-norm condition number.
+        """
+        return self.norm * _inverse_norm_estimate(self.solve, self.shape[0])
+
+
+class WoodburyFactorization:
+    """
+    Solver for A + U @ V.T that reuses a Factorization of A through the Sherman-Morrison-
+    Woodbury formula. With k columns in U and V, setting up costs k solves with A, and each
+    solve after that costs one solve with A plus O(n * k) operations, instead of factoring
+    A + U @ V.T again in O(n ** 3). The factorization of A is not modified.
+
+    Parameters
+    ----------
+    factorization : Factorization
+        Factorization of A.
+    u : np.array
+        Vector of length n, or matrix with k columns.
+    v : np.array
+        Vector of length n, or matrix with k columns.
+
+    Attributes
+    ----------
+    factorization : Factorization
+        Factorization of A.
+    u : np.array
+        U as a matrix with k columns.
+    v : np.array
+        V as a matrix with k columns.
+
+    Raises
+    ------
+    ValueError
+        If U and V do not have n rows and the same shape, or if A + U @ V.T is singular.
+    """
+
+    def __init__(self, factorization: Factorization, u: np.array, v: np.array):
+        n = factorization.shape[0]
+        self.factorization = factorization
+        self.u = np.asarray(u, dtype=np.float64).reshape(n, -1)
+        self.v = np.asarray(v, dtype=np.float64).reshape(n, -1)
+        if self.u.shape != self.v.shape:
+            raise ValueError("Update vectors must have the same shape")
+        self._solved_u = factorization.solve(self.u)
+        self._solved_v = factorization.solve(self.v, transpose=True)
+        # Capacitance matrix I + V.T @ inv(A) @ U
+        capacitance = np.eye(self.u.shape[1]) + self.v.T @ self._solved_u
+        try:
+            self._capacitance = lu_factor(capacitance)
+        except ValueError:
+            raise ValueError("Updated matrix is singular")
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Shape of the updated matrix.
+        """
+        return self.factorization.shape
+
+    def solve(self, b: np.array, transpose: bool = False) -> np.array:
+        """
+        Given a vector of dependent values, returns the solution of the system with A + U @ V.T.
+        A matrix of dependent values can be given instead to solve for every column at once.
+
+        Parameters
+        ----------
+        b : np.array
+            Vector of dependent values, or matrix with one right hand side per column.
+        transpose : bool, default False
+            Solve the system with the transpose of the updated matrix instead.
+            Defaults to False.
+
+        Returns
+        -------
+        np.array
+            Solution vector for the system, or matrix with one solution per column.
+
+        Raises
+        ------
+        ValueError
+            If the matrix and the vector of dependent values have a different number of rows.
+        """
+        y = self.factorization.solve(b, transpose=transpose)
+        lu, perm = self._capacitance
+        if not transpose:
+            return y - self._solved_u @ lu_solve(lu, perm, self.v.T @ y)
+        # (A + U @ V.T).T = A.T + V @ U.T, whose capacitance matrix is the transpose
+        z = solve_triangular(lu, self.u.T @ y, lower=False, trans="T")
+        w = solve_triangular(lu, z, lower=True, unit_diagonal=True, trans="T")
+        correction = np.empty_like(w)
+        correction[perm] = w
+        return y - self._solved_v @ correction
+
+
+def woodbury_solve(factorization: Factorization, u: np.array, v: np.array,
+                   b: np.array) -> np.array:
+    """
+    Given a Factorization of A, the low rank update U @ V.T, and a vector of dependent
+    values, returns the solution of the system with A + U @ V.T without refactoring. Use
+    WoodburyFactorization directly to solve with the same update more than once.
+
+    Parameters
+    ----------
+    factorization : Factorization
+        Factorization of A.
+    u : np.array
+        Vector of length n, or matrix with k columns.
+    v : np.array
+        Vector of length n, or matrix with k columns.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+
+    Raises
+    ------
+    ValueError
+        If the shapes do not match or if A + U @ V.T is singular.
+    """
+    return WoodburyFactorization(factorization, u, v).solve(b)
+
+
+def update_factorization(factorization: Factorization, input_matrix: np.array, u: np.array,
+                         v: np.array, drift_tolerance: float = 1e-10) -> Factorization:
+    """
+    Given a Factorization of a matrix A, the matrix itself, and a low rank update U @ V.T,
+    returns a new Factorization of A + U @ V.T in O(n ** 2 * k) operations. Changing row i
+    of A by d is the update u = e_i, v = d, and changing a column is the transpose of that.
+    A Cholesky factorization is updated with cholesky_update when V is U, or downdated when
+    V is -U, and any other update is made to the LU factors with lu_update. Rounding error
+    from the updates accumulates, and LU updates cannot pivot, so after updating the
+    backward error of a solve is checked against drift_tolerance, and the matrix is factored
+    again from scratch if it is too large. The given factorization is not modified, so
+    cached factorizations from factorize can be updated safely.
+
+    Parameters
+    ----------
+    factorization : Factorization
+        Factorization of A.
+    input_matrix : np.array
+        The matrix A.
+    u : np.array
+        Vector of length n, or matrix with k columns.
+    v : np.array
+        Vector of length n, or matrix with k columns.
+    drift_tolerance : float, default 1e-10
+        Largest relative backward error accepted before refactoring. Defaults to 1e-10.
+
+    Returns
+    -------
+    Factorization
+        Factorization of A + U @ V.T.
+
+    Raises
+    ------
+    ValueError
+        If the shapes do not match or if A + U @ V.T is singular.
+    """
+    n = factorization.shape[0]
+    if input_matrix.shape != factorization.shape:
+        raise ValueError("Given matrix does not match the factorization")
+    u = np.asarray(u, dtype=np.float64).reshape(n, -1)
+    v = np.asarray(v, dtype=np.float64).reshape(n, -1)
+    if u.shape != v.shape:
+        raise ValueError("Update vectors must have the same shape")
+    updated_matrix = input_matrix + u @ v.T
+
+    updated = Factorization.__new__(Factorization)
+    updated.method, updated.perm = factorization.method, factorization.perm
+    updated.norm = np.linalg.norm(updated_matrix, 1)
+    updated.updates = factorization.updates + u.shape[1]
+    try:
+        if factorization.method == "cholesky" and np.array_equal(u, v):
+            updated.factors = cholesky_update(factorization.factors, u)
+        elif factorization.method == "cholesky" and np.array_equal(u, -v):
+            updated.factors = cholesky_update(factorization.factors, u, downdate=True)
+        else:
+            lu, perm = factorization.factors, factorization.perm
+            if factorization.method == "cholesky":
+                # A = L @ L.T is the LU decomposition with L scaled to a unit diagonal
+                diagonal = np.diagonal(lu)
+                lu = np.tril(lu, -1) / diagonal + (np.tril(lu) * diagonal).T
+                perm = np.arange(n)
+            updated.method, updated.perm = "lu", perm
+            updated.factors = lu_update(lu, perm, u, v)
+    except ValueError:
+        return Factorization(updated_matrix)
+
+    # Backward error of solving for a known vector
+    x = (-1.0) ** np.arange(n)
+    b = updated_matrix @ x
+    sol = updated.solve(b)
+    scale = np.linalg.norm(updated_matrix, np.inf) * np.max(np.abs(sol)) + np.max(np.abs(b))
+    if not np.all(np.isfinite(sol)) or (np.max(np.abs(updated_matrix @ sol - b))
+                                         > drift_tolerance * scale):
+        return Factorization(updated_matrix)
+    return updated
+
+
+def _permutation_sign(perm: np.array) -> int:
+    """
+    Returns the sign of a permutation vector, 1 for even and -1 for odd, from the number of
+    its cycles.
+
+    Parameters
+    ----------
+    perm : np.array
+        Permutation vector.
+
+    Returns
+    -------
+    int
+        Sign of the permutation.
+    """
+    visited = np.zeros(len(perm), dtype=bool)
+    cycles = 0
+    for start in range(len(perm)):
+        if visited[start]:
+            continue
+        cycles += 1
+        i = start
+        while not visited[i]:
+            visited[i] = True
+            i = perm[i]
+    return -1 if (len(perm) - cycles) % 2 else 1
+
+
+def _inverse_norm_estimate(solve: callable, n: int, iterations: int = 5) -> float:
+    """
+    Estimates the 1-norm of the inverse of a matrix from solves with it and its transpose
+    using Hager's method with Higham's improvements, as in LAPACK's xLACON. Starting from a
+    vector of equal entries, it takes gradient steps toward the unit vector that maximizes
+    norm(inv(A) @ x, 1), and the result is compared against one solve with an alternating
+    vector that catches matrices the gradient steps miss.
+
+    Parameters
+    ----------
+    solve : callable
+        Function solve(b, transpose) returning inv(A) @ b, or inv(A).T @ b if transpose.
+    n : int
+        Size of the matrix.
+    iterations : int, default 5
+        Maximum number of gradient steps. Defaults to 5.
+
+    Returns
+    -------
+    float
+        Estimate of norm(inv(A), 1).
+    """
+    x = np.full(n, 1 / n)
+    estimate = 0
+    for k in range(iterations):
+        y = solve(x, False)
+        estimate = np.sum(np.abs(y))
+        z = solve(np.where(y >= 0, 1.0, -1.0), True)
+        j = np.argmax(np.abs(z))
+        if k > 0 and np.abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n)
+        x[j] = 1
+    alternating = (-1.0) ** np.arange(n) * (1 + np.arange(n) / max(n - 1, 1))
+    return max(estimate, 2 * np.sum(np.abs(solve(alternating, False))) / (3 * n))
+
+
+_factorization_cache = OrderedDict()
+_factorization_cache_lock = threading.Lock()
+_factorization_cache_size = 8
+
+
+def _matrix_key(input_matrix: np.array, method: str) -> tuple:
+    """
+    Given a matrix and a factorization method, returns a cache key made from a hash of the
+    matrix contents along with its shape, dtype, and the method.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to make a key for.
+    method : str
+        Factorization method.
+
+    Returns
+    -------
+    tuple
+        Hashable cache key.
+    """
+    contiguous = np.ascontiguousarray(input_matrix)
+    digest = hashlib.blake2b(contiguous.data, digest_size=16).hexdigest()
+    return digest, contiguous.shape, contiguous.dtype.str, method
+
+
+def factorize(input_matrix: np.array, method: str = "auto") -> Factorization:
+    """
+    Given a square matrix, returns a Factorization of it. The most recently used
+    factorizations are cached by a hash of the matrix contents, so passing a matrix with
+    exactly the same entries again reuses the existing factorization instead of refactoring.
+    Cached factorizations are shared and should not be modified.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix to factor.
+    method : str, default "auto"
+        One of "lu", "cholesky", or "auto". Defaults to "auto".
+
+    Returns
+    -------
+    Factorization
+        Factorization of the matrix.
+    """
+    input_matrix = np.asarray(input_matrix)
+    key = _matrix_key(input_matrix, method)
+    with _factorization_cache_lock:
+        if key in _factorization_cache:
+            _factorization_cache.move_to_end(key)
+            return _factorization_cache[key]
+    factorization = Factorization(input_matrix, method=method)
+    with _factorization_cache_lock:
+        _factorization_cache[key] = factorization
+        while len(_factorization_cache) > _factorization_cache_size:
+            _factorization_cache.popitem(last=False)
+    return factorization
+
+
+def set_factorization_cache_size(size: int) -> None:
+    """
+    Sets the number of factorizations kept by factorize, dropping the least recently used
+    ones if the cache is now too large. A size of 0 turns caching off.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of cached factorizations.
+
+    Raises
+    ------
+    ValueError
+        If the size is negative.
+    """
+    global _factorization_cache_size
+    if size < 0:
+        raise ValueError("Cache size must not be negative")
+    with _factorization_cache_lock:
+        _factorization_cache_size = size
+        while len(_factorization_cache) > size:
+            _factorization_cache.popitem(last=False)
+
+
+def clear_factorization_cache() -> None:
+    """
+    Removes every factorization cached by factorize.
+    """
+    with _factorization_cache_lock:
+        _factorization_cache.clear()
+
+
+def logdet(input_matrix: np.array) -> tuple:
+    """
+    Given a square matrix, returns the sign and the natural log of the absolute value of its
+    determinant, using the cached factorization from factorize. A singular matrix gives a
+    sign of 0.0 and a log of -inf.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix.
+
+    Returns
+    -------
+    tuple
+        Sign of the determinant and log of its absolute value.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    try:
+        return factorize(input_matrix).logdet()
+    except ValueError:
+        return 0.0, -np.inf
+
+
+def det(input_matrix: np.array) -> float:
+    """
+    Given a square matrix, returns its determinant, using the cached factorization from
+    factorize. A singular matrix gives 0.0.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix.
+
+    Returns
+    -------
+    float
+        Determinant of the matrix.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square.
+    """
+    sign, log_abs = logdet(input_matrix)
+    return sign * np.exp(log_abs)
+
+
+def inv(input_matrix: np.array) -> np.array:
+    """
+    Given a square matrix, returns its inverse, using the cached factorization from
+    factorize. Prefer solving with factorize(input_matrix).solve when only products with the
+    inverse are needed.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix.
+
+    Returns
+    -------
+    np.array
+        Inverse of the matrix.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square or if it is singular.
+    """
+    return factorize(input_matrix).inv()
+
+
+def condition_estimate(input_matrix: np.array) -> float:
+    """
+    Given a square matrix, returns an estimate of its 1-norm condition number in O(n ** 2)
+    operations on top of the cached factorization from factorize, so checking a matrix that
+    was already factored to solve with costs almost nothing. A singular matrix gives inf.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Square matrix.
+
+    Returns
+    -------
+    float
+        Estimated 1-norm condition number.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square.
+    """
+    if input_matrix.ndim != 2 or input_matrix.shape[0] != input_matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    try:
+        return factorize(input_matrix).condition_estimate()
+    except ValueError:
+        return np.inf
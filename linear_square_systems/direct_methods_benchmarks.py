@@ -0,0 +1,347 @@
+import os
+import tempfile
+import time
+import numpy as np
+import direct_methods
+
+
+def time_call(run: callable, repeats: int = 3) -> float:
+    """
+    Returns the best time in seconds of calling the given function with no arguments.
+
+    Parameters
+    ----------
+    run : callable
+        Function to time.
+    repeats : int, default 3
+        Number of calls to take the best of. Defaults to 3.
+
+    Returns
+    -------
+    float
+        Best time of one call in seconds.
+    """
+    best = np.inf
+    for i in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def nested_loop_back_substitution(upper: np.array, b: np.array) -> np.array:
+    """
+    Back substitution with a doubly nested Python loop in float32, kept as the baseline the
+    row dot product version is compared against.
+
+    Parameters
+    ----------
+    upper : np.array
+        Square upper triangular matrix with a nonzero diagonal.
+    b : np.array
+        Vector of dependent values.
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system.
+    """
+    m = upper.shape[0]
+    augmented = np.column_stack([upper, b])
+    sol = np.zeros(m, dtype=np.float32)
+    for i in range(m - 1, -1, -1):
+        total = 0
+        for j in range(m - 1, i, -1):
+            total += augmented[i, j] * sol[j]
+        sol[i] = (augmented[i, m] - total) / augmented[i, i]
+    return sol
+
+
+def row_by_row_gaussian_elim(input_matrix: np.array) -> np.array:
+    """
+    Complete Gaussian elimination that swaps rows one at a time until a nonzero pivot is found
+    and eliminates one row per Python iteration in float32, kept as the baseline the panel
+    version is compared against.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix to reduce.
+
+    Returns
+    -------
+    np.array
+        Reduced matrix.
+    """
+    m, n = input_matrix.shape
+    reduced = input_matrix.astype(np.float32)
+    curr_row = 0
+    curr_col = 0
+    while curr_row < m and curr_col < n:
+        swap_row = curr_row + 1
+        while reduced[curr_row][curr_col] == 0 and swap_row < m:
+            reduced[[curr_row, swap_row]] = reduced[[swap_row, curr_row]]
+            swap_row += 1
+
+        if swap_row == m:
+            curr_col += 1
+            continue
+
+        for j in range(curr_row + 1, m):
+            coef = reduced[j][curr_col] / reduced[curr_row][curr_col]
+            reduced[j] = reduced[j] - coef * reduced[curr_row]
+        curr_row += 1
+        curr_col += 1
+    return reduced
+
+
+def back_substitution_benchmark():
+    """
+    Compares the nested loop back substitution against the row dot product version, and one
+    call with 16 right hand sides against 16 separate calls.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>16}{:>16}{:>16}{:>16}{:>12}".format(
+        "n", "nested (s)", "row dot (s)", "16 calls (s)", "16 RHS (s)", "error"))
+    for n in [10, 1000, 5000]:
+        upper = np.triu(rng.normal(size=(n, n))) + n * np.eye(n)
+        b = rng.normal(size=n)
+        many_b = rng.normal(size=(n, 16))
+
+        if n <= 1000:
+            nested_time = time_call(lambda: nested_loop_back_substitution(upper, b), repeats=1)
+        else:
+            nested_time = np.nan
+        row_time = time_call(lambda: direct_methods.back_substitution(upper, b))
+        separate_time = time_call(lambda: [direct_methods.back_substitution(upper, many_b[:, k])
+                                           for k in range(16)], repeats=1)
+        batched_time = time_call(lambda: direct_methods.back_substitution(upper, many_b))
+        error = np.max(np.abs(upper @ direct_methods.back_substitution(upper, b) - b))
+        print("{:>6}{:>16.4f}{:>16.4f}{:>16.4f}{:>16.4f}{:>12.1e}".format(
+            n, nested_time, row_time, separate_time, batched_time, error))
+
+
+def lu_benchmark():
+    """
+    Compares the row by row lu_decomposition against the blocked, pivoted lu_factor.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>22}{:>16}".format("n", "lu_decomposition (s)", "lu_factor (s)"))
+    for n in [200, 1000, 4000]:
+        a = rng.normal(size=(n, n))
+        if n <= 1000:
+            row_time = time_call(lambda: direct_methods.lu_decomposition(a), repeats=1)
+        else:
+            row_time = np.nan
+        blocked_time = time_call(lambda: direct_methods.lu_factor(a), repeats=1)
+        print("{:>6}{:>22.4f}{:>16.4f}".format(n, row_time, blocked_time))
+
+
+def tiled_lu_benchmark():
+    """
+    Reports the time and speedup of tiled_lu_factor over one worker for each worker count, next
+    to lu_factor.
+    """
+    rng = np.random.default_rng(0)
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    print("{} processors".format(os.cpu_count()))
+    print("{:>6}{:>16}{:>10}{:>14}{:>12}".format(
+        "n", "lu_factor (s)", "workers", "tiled (s)", "speedup"))
+    for n in [1000, 4000]:
+        a = rng.normal(size=(n, n))
+        blocked_time = time_call(lambda: direct_methods.lu_factor(a), repeats=1)
+        for workers in counts:
+            tiled_time = time_call(lambda: direct_methods.tiled_lu_factor(a, workers=workers),
+                                   repeats=1)
+            if workers == 1:
+                single_time = tiled_time
+            print("{:>6}{:>16.4f}{:>10}{:>14.4f}{:>12.2f}".format(
+                n, blocked_time, workers, tiled_time, single_time / tiled_time))
+
+
+def out_of_core_lu_benchmark():
+    """
+    Compares out_of_core_lu_factor on a memmap for several panel sizes against lu_factor in
+    memory, with the number of entries read from disk.
+    """
+    rng = np.random.default_rng(0)
+    n = 4000
+    a = rng.normal(size=(n, n))
+    print("{:>6}{:>8}{:>14}{:>16}{:>14}".format(
+        "n", "panel", "time (s)", "read (GB)", "memory (MB)"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "matrix.npy")
+        for panel_size in [250, 500, 1000, 2000]:
+            matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n, n),
+                                               fortran_order=True)
+            matrix[:] = a
+            matrix.flush()
+            ooc_time = time_call(lambda: direct_methods.out_of_core_lu_factor(matrix, panel_size),
+                                 repeats=1)
+            del matrix
+            panels = -(-n // panel_size)
+            read = sum(n * panel_size + k * (n - k * panel_size / 2) * panel_size
+                       for k in range(panels)) * 8 / 1e9
+            print("{:>6}{:>8}{:>14.4f}{:>16.2f}{:>14.0f}".format(
+                n, panel_size, ooc_time, read, 3 * n * panel_size * 8 / 1e6))
+    blocked_time = time_call(lambda: direct_methods.lu_factor(a), repeats=1)
+    print("{:>6}{:>8}{:>14.4f}{:>16}{:>14.0f}".format(n, "memory", blocked_time, "-",
+                                                       n * n * 8 / 1e6))
+
+
+def qr_benchmark():
+    """
+    Compares least squares through the normal equations against qr_least_squares on time and
+    error for polynomial fits whose Vandermonde matrices get more ill conditioned.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>12}{:>8}{:>16}{:>12}{:>14}{:>14}".format(
+        "shape", "degree", "normal (s)", "qr (s)", "normal err", "qr err"))
+    for m, degree in [(2000, 5), (2000, 10), (20000, 15)]:
+        a = np.vander(np.linspace(0, 1, m), degree + 1, increasing=True)
+        x = rng.normal(size=degree + 1)
+        b = a @ x
+        normal_time = time_call(lambda: np.linalg.solve(a.T @ a, a.T @ b))
+        qr_time = time_call(lambda: direct_methods.qr_least_squares(a, b))
+        normal_error = np.max(np.abs(np.linalg.solve(a.T @ a, a.T @ b) - x))
+        qr_error = np.max(np.abs(direct_methods.qr_least_squares(a, b) - x))
+        print("{:>12}{:>8}{:>16.4f}{:>12.4f}{:>14.1e}{:>14.1e}".format(
+            str(m) + "x" + str(degree + 1), degree, normal_time, qr_time, normal_error,
+            qr_error))
+
+
+def cholesky_benchmark():
+    """
+    Compares the blocked Cholesky and the pivoted LDL factorizations against lu_factor on
+    symmetric positive definite matrices.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>16}{:>16}{:>16}{:>18}{:>14}".format(
+        "n", "lu_factor (s)", "cholesky (s)", "ldl (s)", "cholesky speedup", "ldl speedup"))
+    for n in [200, 1000, 4000]:
+        c = rng.normal(size=(n, n))
+        a = c @ c.T + n * np.eye(n)
+        lu_time = time_call(lambda: direct_methods.lu_factor(a), repeats=1)
+        cholesky_time = time_call(lambda: direct_methods.cholesky_factor(a), repeats=1)
+        ldl_time = time_call(lambda: direct_methods.ldl_factor(a), repeats=1)
+        print("{:>6}{:>16.4f}{:>16.4f}{:>16.4f}{:>18.2f}{:>14.2f}".format(
+            n, lu_time, cholesky_time, ldl_time, lu_time / cholesky_time, lu_time / ldl_time))
+
+
+def mixed_precision_benchmark():
+    """
+    Compares a float64 lu_factor solve against mixed precision iterative refinement on time
+    and error.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>16}{:>16}{:>8}{:>14}{:>14}".format(
+        "n", "float64 (s)", "mixed (s)", "steps", "float64 err", "mixed err"))
+    for n in [200, 1000, 4000]:
+        a = rng.normal(size=(n, n))
+        x = rng.normal(size=n)
+        b = a @ x
+        double_time = time_call(lambda: direct_methods.lu_solve(*direct_methods.lu_factor(a), b),
+                                repeats=1)
+        mixed_time = time_call(lambda: direct_methods.mixed_precision_solve(a, b), repeats=1)
+        sol, steps = direct_methods.mixed_precision_solve(a, b)
+        double_error = np.max(np.abs(direct_methods.lu_solve(*direct_methods.lu_factor(a), b) - x))
+        print("{:>6}{:>16.4f}{:>16.4f}{:>8}{:>14.1e}{:>14.1e}".format(
+            n, double_time, mixed_time, steps, double_error, np.max(np.abs(sol - x))))
+
+
+def batched_benchmark():
+    """
+    Compares solving a stack of small systems one lu_decomposition at a time against
+    batched_solve and np.linalg.solve.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>10}{:>4}{:>16}{:>16}{:>16}".format(
+        "N", "m", "loop (s)", "batched (s)", "numpy (s)"))
+    for count, m in [(10000, 4), (100000, 8), (1000000, 8), (100000, 16)]:
+        a = rng.normal(size=(count, m, m)) + m * np.eye(m)
+        b = rng.normal(size=(count, m))
+        # The loop is timed on 1000 matrices and scaled up
+        loop_time = time_call(lambda: [direct_methods.lu_decomposition(a[k])
+                                       for k in range(1000)], repeats=1) * count / 1000
+        batched_time = time_call(lambda: direct_methods.batched_solve(a, b), repeats=1)
+        numpy_time = time_call(lambda: np.linalg.solve(a, b[:, :, np.newaxis]), repeats=1)
+        print("{:>10}{:>4}{:>16.4f}{:>16.4f}{:>16.4f}".format(
+            count, m, loop_time, batched_time, numpy_time))
+
+
+def condition_benchmark():
+    """
+    Compares computing the log determinant and exact 1-norm condition number with NumPy
+    against logdet and condition_estimate on a matrix that has already been factored.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>14}{:>16}{:>16}{:>12}".format(
+        "n", "numpy (s)", "factorize (s)", "estimate (s)", "ratio"))
+    for n in [200, 1000, 3000]:
+        a = rng.normal(size=(n, n))
+        numpy_time = time_call(lambda: (np.linalg.slogdet(a), np.linalg.cond(a, 1)), repeats=1)
+        direct_methods.clear_factorization_cache()
+        factor_time = time_call(lambda: direct_methods.factorize(a), repeats=1)
+        estimate_time = time_call(lambda: (direct_methods.logdet(a),
+                                           direct_methods.condition_estimate(a)), repeats=1)
+        ratio = direct_methods.condition_estimate(a) / np.linalg.cond(a, 1)
+        print("{:>6}{:>14.4f}{:>16.4f}{:>16.4f}{:>12.3f}".format(
+            n, numpy_time, factor_time, estimate_time, ratio))
+    direct_methods.clear_factorization_cache()
+
+
+def update_benchmark():
+    """
+    Compares factoring again after changing one row of a matrix against update_factorization
+    and a Woodbury solve that reuse the factorization of the original matrix.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>16}{:>14}{:>16}{:>12}".format(
+        "n", "refactor (s)", "update (s)", "woodbury (s)", "error"))
+    for n in [200, 1000, 3000]:
+        a = rng.normal(size=(n, n))
+        b = rng.normal(size=n)
+        u = np.eye(n)[n // 2]
+        v = rng.normal(size=n)
+        factorization = direct_methods.Factorization(a)
+        refactor_time = time_call(lambda: direct_methods.Factorization(a + np.outer(u, v))
+                                  .solve(b), repeats=1)
+        update_time = time_call(lambda: direct_methods.update_factorization(factorization, a, u, v)
+                                .solve(b), repeats=1)
+        woodbury_time = time_call(lambda: direct_methods.woodbury_solve(factorization, u, v, b),
+                                  repeats=1)
+        sol = direct_methods.update_factorization(factorization, a, u, v).solve(b)
+        print("{:>6}{:>16.4f}{:>14.4f}{:>16.4f}{:>12.1e}".format(
+            n, refactor_time, update_time, woodbury_time,
+            np.max(np.abs((a + np.outer(u, v)) @ sol - b))))
+
+
+def rank_benchmark():
+    """
+    Compares the row by row elimination against matrix_rank on rank deficient matrices.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>12}{:>16}{:>16}{:>8}".format("shape", "row by row (s)", "panel (s)", "rank"))
+    for m, n in [(200, 300), (500, 750), (2000, 3000)]:
+        a = rng.normal(size=(m, m // 2)) @ rng.normal(size=(m // 2, n))
+        if m <= 500:
+            row_time = time_call(lambda: row_by_row_gaussian_elim(a), repeats=1)
+        else:
+            row_time = np.nan
+        panel_time = time_call(lambda: direct_methods.matrix_rank(a), repeats=1)
+        print("{:>12}{:>16.4f}{:>16.4f}{:>8}".format(
+            str(m) + "x" + str(n), row_time, panel_time, direct_methods.matrix_rank(a)))
+
+
+if __name__ == "__main__":
+    back_substitution_benchmark()
+    lu_benchmark()
+    tiled_lu_benchmark()
+    out_of_core_lu_benchmark()
+    rank_benchmark()
+    qr_benchmark()
+    cholesky_benchmark()
+    mixed_precision_benchmark()
+    batched_benchmark()
+    condition_benchmark()
+    update_benchmark()
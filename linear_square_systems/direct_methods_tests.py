@@ -1,3 +1,5 @@
+import os
+import tempfile
 import numpy as np
 import direct_methods
 
@@ -115,6 +117,128 @@ def test_back_substitution():
     np.testing.assert_raises(ValueError, direct_methods.back_substitution, a, b)
 
 
+def test_back_substitution_multiple_rhs():
+    """
+    Tests back substitution with several right hand sides and float64 accuracy.
+    """
+    a = np.array(
+        [[3, 2, 1],
+         [0, 3, 2],
+         [0, 0, 3]]
+    )
+    b = np.array(
+        [[1, 0, 1],
+         [2, 0, 1],
+         [3, 0, 1]]
+    )
+    sol = np.array(
+        [[0, 0, 4 / 27],
+         [0, 0, 1 / 9],
+         [1, 0, 1 / 3]]
+    )
+    np.testing.assert_allclose(
+        direct_methods.back_substitution(a, b),
+        sol,
+        atol=1e-15,
+        err_msg="Back Sub Multiple RHS Test 1 Error"
+    )
+
+    # Needs more precision than float32 has
+    a = np.array(
+        [[1, 1e8],
+         [0, 1]]
+    )
+    b = np.array([1e8 + 3, 1])
+    np.testing.assert_allclose(
+        direct_methods.back_substitution(a, b),
+        np.array([3, 1]),
+        err_msg="Back Sub Multiple RHS Test 2 Error"
+    )
+
+    rng = np.random.default_rng(0)
+    a = np.triu(rng.normal(size=(50, 50))) + 10 * np.eye(50)
+    b = rng.normal(size=(50, 4))
+    np.testing.assert_allclose(
+        direct_methods.back_substitution(a, b),
+        np.linalg.solve(a, b),
+        err_msg="Back Sub Multiple RHS Test 3 Error"
+    )
+
+
+def test_forward_substitution():
+    """
+    Tests forward substitution function.
+    """
+    a = np.array(
+        [[1, 0, 0],
+         [1, 1, 0],
+         [1, 1, 1]]
+    )
+    b = np.array([1, 2, 3]).transpose()
+    sol = np.array([1, 1, 1])
+    np.testing.assert_allclose(
+        direct_methods.forward_substitution(a, b),
+        sol,
+        err_msg="Forward Sub Test 1 Error"
+    )
+
+    a = np.array(
+        [[3, 0, 0],
+         [2, 3, 0],
+         [1, 2, 3]]
+    )
+    b = np.array([1, 1, 1]).transpose()
+    sol = np.array([1 / 3, 1 / 9, 4 / 27])
+    np.testing.assert_allclose(
+        direct_methods.forward_substitution(a, b),
+        sol,
+        err_msg="Forward Sub Test 2 Error"
+    )
+
+    b = np.array(
+        [[1, 3],
+         [1, 5],
+         [1, 6]]
+    )
+    sol = np.array(
+        [[1 / 3, 1],
+         [1 / 9, 1],
+         [4 / 27, 1]]
+    )
+    np.testing.assert_allclose(
+        direct_methods.forward_substitution(a, b),
+        sol,
+        err_msg="Forward Sub Test 3 Error"
+    )
+
+    # Free variable uses 0
+    a = np.array(
+        [[0, 0],
+         [2, 1]]
+    )
+    b = np.array([0, 1]).transpose()
+    np.testing.assert_allclose(
+        direct_methods.forward_substitution(a, b),
+        np.array([0, 1]),
+        err_msg="Forward Sub Test 4 Error"
+    )
+
+    # checks error if no sols
+    b = np.array([1, 1]).transpose()
+    np.testing.assert_raises(ValueError, direct_methods.forward_substitution, a, b)
+
+    # check error if not lower triangular
+    a = np.array(
+        [[1, 2],
+         [1, 7]]
+    )
+    np.testing.assert_raises(ValueError, direct_methods.forward_substitution, a, b)
+
+    # checks error if a and b are not the same height
+    a = np.eye(3)
+    np.testing.assert_raises(ValueError, direct_methods.forward_substitution, a, b)
+
+
 def test_regular_gaussian_elimination():
     """
     Tests regular Gaussian elimination function.
@@ -292,6 +416,7 @@ def test_complete_gaussian_elimination():
         err_msg="Complete GE Test 5 Fail"
     )
 
+    # The largest entry in each column is the pivot, so rows are not rotated into place
     a = np.array(
         [[1, 1, 2, 1, 1],
          [1, 1, 1, 3, 2],
@@ -300,8 +425,8 @@ def test_complete_gaussian_elimination():
     )
     sol = np.array(
         [[1, 1, 2, 1, 1],
-         [0, 0, -1, 0, 3],
-         [0, 0, 0, 2, -2],
+         [0, 0, -1, 2, 1],
+         [0, 0, 0, -2, 2],
          [0, 0, 0, 0, 2]]
     )
     np.testing.assert_allclose(
@@ -310,6 +435,72 @@ def test_complete_gaussian_elimination():
         err_msg="Complete GE Test 6 Fail"
     )
 
+    # Panels smaller than the matrix give the same reduction
+    rng = np.random.default_rng(6)
+    a = rng.normal(size=(9, 4)) @ rng.normal(size=(4, 12))
+    np.testing.assert_allclose(
+        direct_methods.complete_gaussian_elim(a, dtype=np.float64, tolerance=1e-10, block_size=3),
+        direct_methods.complete_gaussian_elim(a, dtype=np.float64, tolerance=1e-10),
+        atol=1e-10,
+        err_msg="Complete GE Test 7 Fail"
+    )
+
+
+def test_rref():
+    """
+    Tests reduced row echelon form, rank, and null space functions.
+    """
+    a = np.array(
+        [[1, 2, 1, 4],
+         [2, 4, 0, 6],
+         [1, 2, 2, 5]]
+    )
+    reduced, pivot_columns = direct_methods.rref(a)
+    np.testing.assert_allclose(
+        reduced,
+        np.array(
+            [[1, 2, 0, 3],
+             [0, 0, 1, 1],
+             [0, 0, 0, 0]]
+        ),
+        atol=1e-15,
+        err_msg="RREF Test 1 Fail"
+    )
+    np.testing.assert_equal(pivot_columns, np.array([0, 2]), err_msg="RREF Test 2 Fail")
+    np.testing.assert_equal(direct_methods.matrix_rank(a), 2, err_msg="RREF Test 3 Fail")
+    np.testing.assert_allclose(
+        direct_methods.null_space(a),
+        np.array(
+            [[-2, -3],
+             [1, 0],
+             [0, -1],
+             [0, 1]]
+        ),
+        atol=1e-15,
+        err_msg="RREF Test 4 Fail"
+    )
+
+    # Rank deficient matrices across several panels
+    rng = np.random.default_rng(7)
+    for rank in [0, 1, 5, 20]:
+        a = rng.normal(size=(30, rank)) @ rng.normal(size=(rank, 45))
+        np.testing.assert_equal(direct_methods.matrix_rank(a, block_size=8), rank,
+                                err_msg="RREF Test 5 Fail")
+        basis = direct_methods.null_space(a, block_size=8)
+        np.testing.assert_equal(basis.shape, (45, 45 - rank), err_msg="RREF Test 6 Fail")
+        np.testing.assert_allclose(a @ basis, 0, atol=1e-9, err_msg="RREF Test 7 Fail")
+        np.testing.assert_equal(np.linalg.matrix_rank(basis), 45 - rank,
+                                err_msg="RREF Test 8 Fail")
+
+    # A tolerance treats tiny pivots as zero
+    a = np.array(
+        [[1, 1],
+         [1, 1 + 1e-12]]
+    )
+    np.testing.assert_equal(direct_methods.matrix_rank(a), 2, err_msg="RREF Test 9 Fail")
+    np.testing.assert_equal(direct_methods.matrix_rank(a, tolerance=1e-9), 1,
+                            err_msg="RREF Test 10 Fail")
+
 
 def test_lu_decomposition():
     """
@@ -384,13 +575,717 @@ def test_lu_decomposition():
     np.testing.assert_raises(ValueError, direct_methods.lu_decomposition, a)
 
 
+def test_lu_factor():
+    """
+    Tests pivoted blocked LU factorization and solve functions.
+    """
+    # Needs a row swap, which lu_decomposition can not do
+    a = np.array(
+        [[0, 1],
+         [2, 3]]
+    )
+    lu, perm = direct_methods.lu_factor(a)
+    np.testing.assert_equal(perm, np.array([1, 0]), err_msg="LU factor test 1 Fail")
+    np.testing.assert_allclose(
+        lu,
+        np.array([[2, 3], [0, 1]]),
+        err_msg="LU factor test 2 Fail"
+    )
+    np.testing.assert_allclose(
+        direct_methods.lu_solve(lu, perm, np.array([1, 5])),
+        np.array([1, 1]),
+        err_msg="LU factor test 3 Fail"
+    )
+
+    a = np.array(
+        [[5, 3, 6],
+         [5, 4, 2],
+         [2, 6, 4]]
+    )
+    lu, perm = direct_methods.lu_factor(a)
+    lower, upper = direct_methods.lu_unpack(lu)
+    np.testing.assert_allclose(lower @ upper, a[perm], err_msg="LU factor test 4 Fail")
+    np.testing.assert_equal(np.all(np.abs(lower) <= 1), True, err_msg="LU factor test 5 Fail")
+
+    # Sizes around the block size, with several right hand sides
+    rng = np.random.default_rng(0)
+    for n in [1, 7, 8, 9, 30]:
+        a = rng.normal(size=(n, n))
+        b = rng.normal(size=(n, 3))
+        lu, perm = direct_methods.lu_factor(a, block_size=8)
+        lower, upper = direct_methods.lu_unpack(lu)
+        np.testing.assert_allclose(lower @ upper, a[perm], atol=1e-12,
+                                   err_msg="LU factor test 6 Fail")
+        np.testing.assert_allclose(direct_methods.lu_solve(lu, perm, b), np.linalg.solve(a, b),
+                                   err_msg="LU factor test 7 Fail")
+
+    # Factoring in place reuses the input array
+    a = rng.normal(size=(10, 10))
+    lu, perm = direct_methods.lu_factor(a, overwrite=True)
+    np.testing.assert_equal(lu is a, True, err_msg="LU factor test 8 Fail")
+
+    # Test Error with singular matrix
+    a = np.array(
+        [[5, 3, 6],
+         [5, 3, 6],
+         [2, 6, 4]]
+    )
+    np.testing.assert_raises(ValueError, direct_methods.lu_factor, a)
+
+    # Test Error with non-square matrix
+    a = np.array(
+        [[1, 2, 5],
+         [3, 4, 3]]
+    )
+    np.testing.assert_raises(ValueError, direct_methods.lu_factor, a)
+
+
+def test_tiled_lu_factor():
+    """
+    Tests multithreaded tiled LU factor function.
+    """
+    rng = np.random.default_rng(4)
+    for n, tile_size in [(1, 4), (7, 4), (30, 8), (50, 16), (65, 64)]:
+        a = rng.normal(size=(n, n))
+        lu, perm = direct_methods.lu_factor(a)
+        for workers in [1, 4]:
+            tiled_lu, tiled_perm = direct_methods.tiled_lu_factor(a, tile_size=tile_size,
+                                                                  workers=workers, block_size=4)
+            np.testing.assert_equal(tiled_perm, perm, err_msg="Tiled LU test 1 Fail")
+            np.testing.assert_allclose(tiled_lu, lu, atol=1e-12, err_msg="Tiled LU test 2 Fail")
+
+    a = np.array(
+        [[1, 2, 3],
+         [2, 4, 6],
+         [1, 0, 1]]
+    )
+    np.testing.assert_raises(ValueError, direct_methods.tiled_lu_factor, a, tile_size=1)
+    np.testing.assert_raises(ValueError, direct_methods.tiled_lu_factor, np.ones((2, 3)))
+    np.testing.assert_raises(ValueError, direct_methods.tiled_lu_factor, np.eye(3), tile_size=0)
+
+
+def test_out_of_core_lu():
+    """
+    Tests out of core LU factor and solve functions on memmaps.
+    """
+    rng = np.random.default_rng(5)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "matrix.npy")
+        for n, panel_size in [(1, 4), (7, 3), (50, 8), (65, 64)]:
+            a = rng.normal(size=(n, n))
+            b = rng.normal(size=(n, 2))
+            lu, perm = direct_methods.lu_factor(a)
+            matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(n, n),
+                                               fortran_order=True)
+            matrix[:] = a
+            ooc_perm = direct_methods.out_of_core_lu_factor(matrix, panel_size=panel_size,
+                                                            block_size=4)
+            np.testing.assert_equal(ooc_perm, perm, err_msg="Out of core LU test 1 Fail")
+            np.testing.assert_allclose(matrix, lu, atol=1e-12,
+                                       err_msg="Out of core LU test 2 Fail")
+            np.testing.assert_allclose(
+                direct_methods.out_of_core_lu_solve(matrix, ooc_perm, b, panel_size=panel_size),
+                np.linalg.solve(a, b),
+                err_msg="Out of core LU test 3 Fail"
+            )
+            del matrix
+
+    # Triangular solves on an in memory array
+    upper = np.triu(rng.normal(size=(20, 20))) + 20 * np.eye(20)
+    b = rng.normal(size=20)
+    np.testing.assert_allclose(
+        direct_methods.out_of_core_triangular_solve(upper, b, lower=False, panel_size=6),
+        np.linalg.solve(upper, b),
+        err_msg="Out of core LU test 4 Fail"
+    )
+    np.testing.assert_allclose(
+        direct_methods.out_of_core_triangular_solve(upper.T, b, lower=True, panel_size=6),
+        np.linalg.solve(upper.T, b),
+        err_msg="Out of core LU test 5 Fail"
+    )
+
+    a = np.array(
+        [[1, 2, 3],
+         [2, 4, 6],
+         [1, 0, 1]],
+        dtype=np.float64
+    )
+    np.testing.assert_raises(ValueError, direct_methods.out_of_core_lu_factor, a, panel_size=1)
+    np.testing.assert_raises(ValueError, direct_methods.out_of_core_lu_factor, np.ones((2, 3)))
+    np.testing.assert_raises(ValueError, direct_methods.out_of_core_triangular_solve, upper,
+                             b[:-1], lower=False)
+
+
+def test_dtype_policy():
+    """
+    Tests default and per call floating point types.
+    """
+    a = np.array(
+        [[1, 2],
+         [3, 4]]
+    )
+    np.testing.assert_equal(direct_methods.get_default_dtype(), np.float32,
+                            err_msg="Dtype test 1 Fail")
+    np.testing.assert_equal(direct_methods.regular_gaussian_elim(a).dtype, np.float32,
+                            err_msg="Dtype test 2 Fail")
+    np.testing.assert_equal(direct_methods.regular_gaussian_elim(a, dtype=np.float64).dtype,
+                            np.float64, err_msg="Dtype test 3 Fail")
+    np.testing.assert_equal(direct_methods.lu_factor(a, dtype=np.float32)[0].dtype, np.float32,
+                            err_msg="Dtype test 4 Fail")
+
+    direct_methods.set_default_dtype(np.float64)
+    np.testing.assert_equal(direct_methods.complete_gaussian_elim(a).dtype, np.float64,
+                            err_msg="Dtype test 5 Fail")
+    np.testing.assert_equal(direct_methods.lu_decomposition(a)[1].dtype, np.float64,
+                            err_msg="Dtype test 6 Fail")
+    direct_methods.set_default_dtype(np.float32)
+
+    # float64 keeps digits that float32 loses
+    a = np.array(
+        [[1, 1],
+         [1, 1 + 1e-9]]
+    )
+    np.testing.assert_allclose(
+        direct_methods.regular_gaussian_elim(a, dtype=np.float64),
+        np.array([[1, 1], [0, 1e-9]]),
+        atol=1e-20,
+        err_msg="Dtype test 7 Fail"
+    )
+    np.testing.assert_raises(ValueError, direct_methods.set_default_dtype, np.int32)
+    np.testing.assert_raises(ValueError, direct_methods.lu_decomposition, a, dtype=np.float16)
+
+    # The factorizations default to float64 whatever the module default, and None is rejected
+    spd = np.array(
+        [[4, 1],
+         [1, 3]]
+    )
+    np.testing.assert_equal(
+        (direct_methods.lu_factor(spd)[0].dtype, direct_methods.cholesky_factor(spd).dtype,
+         direct_methods.rref(spd)[0].dtype),
+        (np.float64, np.float64, np.float64),
+        err_msg="Dtype test 8 Fail"
+    )
+    np.testing.assert_raises(ValueError, direct_methods.lu_factor, spd, dtype=None)
+    np.testing.assert_raises(ValueError, direct_methods.cholesky_factor, spd, dtype=None)
+    np.testing.assert_raises(ValueError, direct_methods.matrix_rank, spd, dtype=None)
+
+
+def test_mixed_precision_solve():
+    """
+    Tests mixed precision iterative refinement solve function.
+    """
+    a = np.array(
+        [[5, 3, 6],
+         [5, 4, 2],
+         [2, 6, 4]]
+    )
+    sol, steps = direct_methods.mixed_precision_solve(a, a @ np.array([1, 2, 3]))
+    np.testing.assert_allclose(sol, np.array([1, 2, 3]), rtol=1e-15,
+                               err_msg="Mixed precision test 1 Fail")
+
+    # Reaches float64 accuracy where a float32 solve does not
+    rng = np.random.default_rng(4)
+    q, r = np.linalg.qr(rng.normal(size=(60, 60)))
+    a = q @ np.diag(np.logspace(0, -5, 60)) @ q.T
+    x = rng.normal(size=(60, 2))
+    sol, steps = direct_methods.mixed_precision_solve(a, a @ x)
+    lu, perm = direct_methods.lu_factor(a, dtype=np.float32)
+    np.testing.assert_allclose(sol, x, rtol=1e-9, err_msg="Mixed precision test 2 Fail")
+    np.testing.assert_equal(np.max(np.abs(direct_methods.lu_solve(lu, perm, a @ x) - x)) > 1e-4,
+                            True, err_msg="Mixed precision test 3 Fail")
+    np.testing.assert_equal(0 < steps <= 5, True, err_msg="Mixed precision test 4 Fail")
+
+    # Test Error when the matrix is too ill conditioned for float32 factors
+    a = q @ np.diag(np.logspace(0, -10, 60)) @ q.T
+    np.testing.assert_raises(ValueError, direct_methods.mixed_precision_solve, a, np.ones(60))
+
+
+def test_cholesky_factor():
+    """
+    Tests blocked Cholesky factorization and solve functions.
+    """
+    a = np.array(
+        [[4, 2, -2],
+         [2, 10, 2],
+         [-2, 2, 6]]
+    )
+    lower = direct_methods.cholesky_factor(a)
+    np.testing.assert_allclose(
+        lower,
+        np.array(
+            [[2, 0, 0],
+             [1, 3, 0],
+             [-1, 1, 2]]
+        ),
+        err_msg="Cholesky test 1 Fail"
+    )
+    np.testing.assert_allclose(
+        direct_methods.cholesky_solve(lower, np.array([4, 14, 6])),
+        np.array([1, 1, 1]),
+        err_msg="Cholesky test 2 Fail"
+    )
+
+    # Only the lower triangle is read
+    np.testing.assert_allclose(
+        direct_methods.cholesky_factor(np.tril(a)),
+        lower,
+        err_msg="Cholesky test 3 Fail"
+    )
+
+    # Sizes around the block size, with several right hand sides
+    rng = np.random.default_rng(0)
+    for n in [1, 7, 8, 9, 30]:
+        c = rng.normal(size=(n, n))
+        a = c @ c.T + n * np.eye(n)
+        b = rng.normal(size=(n, 3))
+        lower = direct_methods.cholesky_factor(a, block_size=8)
+        np.testing.assert_allclose(lower, np.linalg.cholesky(a), atol=1e-12,
+                                   err_msg="Cholesky test 4 Fail")
+        np.testing.assert_allclose(direct_methods.cholesky_solve(lower, b), np.linalg.solve(a, b),
+                                   err_msg="Cholesky test 5 Fail")
+
+    # Test Error naming the first leading minor that is not positive definite
+    a = np.array(
+        [[1, 2, 0],
+         [2, 1, 0],
+         [0, 0, 1]]
+    )
+    with np.testing.assert_raises_regex(ValueError, "order 2"):
+        direct_methods.cholesky_factor(a)
+    np.testing.assert_raises(ValueError, direct_methods.cholesky_factor, np.ones((2, 3)))
+
+
+def test_pivoted_cholesky():
+    """
+    Tests rank revealing pivoted Cholesky function.
+    """
+    a = np.array(
+        [[1, 2, 3],
+         [2, 4, 6],
+         [3, 6, 9]]
+    )
+    lower, perm, rank = direct_methods.pivoted_cholesky(a)
+    np.testing.assert_equal(rank, 1, err_msg="Pivoted Cholesky test 1 Fail")
+    np.testing.assert_equal(perm[0], 2, err_msg="Pivoted Cholesky test 2 Fail")
+    np.testing.assert_allclose(lower @ lower.T, a[perm][:, perm],
+                               err_msg="Pivoted Cholesky test 3 Fail")
+
+    rng = np.random.default_rng(1)
+    c = rng.normal(size=(20, 6))
+    a = c @ c.T
+    lower, perm, rank = direct_methods.pivoted_cholesky(a)
+    np.testing.assert_equal(rank, 6, err_msg="Pivoted Cholesky test 4 Fail")
+    np.testing.assert_allclose(lower @ lower.T, a[perm][:, perm], atol=1e-12,
+                               err_msg="Pivoted Cholesky test 5 Fail")
+    np.testing.assert_raises(ValueError, direct_methods.pivoted_cholesky, np.diag([1, -1]))
+
+
+def test_ldl_factor():
+    """
+    Tests pivoted LDL factorization, solve, and inertia functions.
+    """
+    # Zero diagonal needs a 2 by 2 pivot
+    a = np.array(
+        [[0, 1],
+         [1, 0]]
+    )
+    ldl, off_diagonal, perm = direct_methods.ldl_factor(a)
+    np.testing.assert_allclose(ldl, np.array([[0, 1], [0, 0]]), err_msg="LDL test 1 Fail")
+    np.testing.assert_allclose(off_diagonal, np.array([1]), err_msg="LDL test 2 Fail")
+    np.testing.assert_allclose(
+        direct_methods.ldl_solve(ldl, off_diagonal, perm, [2, 3]),
+        np.array([3, 2]),
+        err_msg="LDL test 3 Fail"
+    )
+    np.testing.assert_equal(direct_methods.ldl_inertia(ldl, off_diagonal), (1, 1, 0),
+                            err_msg="LDL test 4 Fail")
+
+    # Sizes around the panel width, with the upper triangle never read or written
+    rng = np.random.default_rng(2)
+    for n in [1, 5, 40]:
+        c = rng.normal(size=(n, n))
+        a = c + c.T
+        b = rng.normal(size=(n, 2))
+        upper = np.triu(np.full((n, n), 7.0), 1)
+        ldl, off_diagonal, perm = direct_methods.ldl_factor(np.tril(a) + upper, block_size=8)
+        lower = np.tril(ldl, -1) + np.eye(n)
+        d = np.diag(np.diagonal(ldl)) + np.diag(off_diagonal, -1) + np.diag(off_diagonal, 1)
+        np.testing.assert_allclose(lower @ d @ lower.T, a[perm][:, perm], atol=1e-12,
+                                   err_msg="LDL test 5 Fail")
+        np.testing.assert_allclose(
+            direct_methods.ldl_solve(ldl, off_diagonal, perm, b),
+            np.linalg.solve(a, b),
+            err_msg="LDL test 6 Fail"
+        )
+        eigenvalues = np.linalg.eigvalsh(a)
+        np.testing.assert_equal(
+            direct_methods.ldl_inertia(ldl, off_diagonal),
+            (np.sum(eigenvalues > 0), np.sum(eigenvalues < 0), 0),
+            err_msg="LDL test 7 Fail"
+        )
+        np.testing.assert_equal(np.triu(ldl, 1), upper, err_msg="LDL test 9 Fail")
+
+    # Rank deficient indefinite matrix
+    c = rng.normal(size=(10, 4))
+    e = rng.normal(size=(10, 3))
+    ldl, off_diagonal, perm = direct_methods.ldl_factor(c @ c.T - e @ e.T, block_size=3)
+    np.testing.assert_equal(direct_methods.ldl_inertia(ldl, off_diagonal), (4, 3, 3),
+                            err_msg="LDL test 8 Fail")
+    np.testing.assert_raises(ValueError, direct_methods.ldl_solve, np.diag([1, 0]),
+                             np.array([0]), np.arange(2), np.ones(2))
+
+    # Factored in place when asked to
+    a = np.array([[4.0, 0], [2, 3]])
+    ldl, off_diagonal, perm = direct_methods.ldl_factor(a, overwrite=True)
+    np.testing.assert_equal(ldl is a, True, err_msg="LDL test 10 Fail")
+    np.testing.assert_allclose(a, np.array([[4, 0], [0.5, 2]]), err_msg="LDL test 11 Fail")
+
+
+def test_qr_factor():
+    """
+    Tests Householder QR factor, apply, and least squares functions.
+    """
+    a = np.array(
+        [[3, 0],
+         [4, 5],
+         [0, 0]]
+    )
+    qr, t = direct_methods.qr_factor(a)
+    q, r = direct_methods.qr_unpack(qr, t)
+    np.testing.assert_allclose(np.abs(r), np.array([[5, 4], [0, 3]]), atol=1e-15,
+                               err_msg="QR factor test 1 Fail")
+    np.testing.assert_allclose(q @ r, a, atol=1e-15, err_msg="QR factor test 2 Fail")
+
+    # Tall, wide, and square matrices around the block size
+    rng = np.random.default_rng(6)
+    for m, n in [(1, 1), (9, 9), (30, 7), (7, 30), (40, 25)]:
+        a = rng.normal(size=(m, n))
+        b = rng.normal(size=(m, 3))
+        qr, t = direct_methods.qr_factor(a, block_size=4)
+        q, r = direct_methods.qr_unpack(qr, t)
+        np.testing.assert_allclose(q @ r, a, atol=1e-13, err_msg="QR factor test 3 Fail")
+        np.testing.assert_allclose(q.T @ q, np.eye(min(m, n)), atol=1e-13,
+                                   err_msg="QR factor test 4 Fail")
+        full_q = direct_methods.apply_q(qr, t, np.eye(m))
+        np.testing.assert_allclose(direct_methods.apply_qt(qr, t, b), full_q.T @ b, atol=1e-12,
+                                   err_msg="QR factor test 5 Fail")
+        np.testing.assert_allclose(direct_methods.apply_q(qr, t, b[:, 0]),
+                                   direct_methods.apply_q(qr, t, b)[:, 0],
+                                   err_msg="QR factor test 6 Fail")
+        # Stored blocks are the product of the reflections, whose taus are on the diagonals
+        k = min(m, n)
+        product = np.eye(m)
+        for j in range(k):
+            v = np.concatenate([np.zeros(j), [1], qr[j + 1:, j]])
+            product = product @ (np.eye(m) - t[j % 4, j] * np.outer(v, v))
+        np.testing.assert_equal(t.shape, (min(4, k), k), err_msg="QR factor test 8 Fail")
+        np.testing.assert_allclose(full_q, product, atol=1e-13, err_msg="QR factor test 9 Fail")
+        if m >= n:
+            np.testing.assert_allclose(direct_methods.qr_least_squares(a, b),
+                                       np.linalg.lstsq(a, b, rcond=None)[0], atol=1e-12,
+                                       err_msg="QR factor test 7 Fail")
+
+    np.testing.assert_raises(ValueError, direct_methods.qr_least_squares, np.ones((2, 3)),
+                             np.ones(2))
+    np.testing.assert_raises(ValueError, direct_methods.qr_least_squares,
+                             np.array([[1, 0], [1, 0], [1, 0]]), np.ones(3))
+    np.testing.assert_raises(ValueError, direct_methods.apply_q, qr, t, np.ones(2))
+
+
+def test_pivoted_qr():
+    """
+    Tests column pivoted QR function.
+    """
+    rng = np.random.default_rng(7)
+    a = rng.normal(size=(30, 20))
+    qr, t, perm, rank = direct_methods.pivoted_qr(a, block_size=8)
+    q, r = direct_methods.qr_unpack(qr, t)
+    np.testing.assert_allclose(q @ r, a[:, perm], atol=1e-13, err_msg="Pivoted QR test 1 Fail")
+    np.testing.assert_equal(rank, 20, err_msg="Pivoted QR test 2 Fail")
+    np.testing.assert_equal(np.all(np.diff(np.abs(np.diagonal(r))) <= 0), True,
+                            err_msg="Pivoted QR test 3 Fail")
+
+    # Rank deficient matrix has a consistent basic solution
+    a = rng.normal(size=(40, 6)) @ rng.normal(size=(6, 15))
+    b = a @ rng.normal(size=15)
+    qr, t, perm, rank = direct_methods.pivoted_qr(a)
+    np.testing.assert_equal(rank, 6, err_msg="Pivoted QR test 4 Fail")
+    sol = direct_methods.qr_least_squares(a, b, pivoting=True)
+    np.testing.assert_allclose(a @ sol, b, atol=1e-10, err_msg="Pivoted QR test 5 Fail")
+    np.testing.assert_equal(np.count_nonzero(sol), 6, err_msg="Pivoted QR test 6 Fail")
+    np.testing.assert_equal(direct_methods.pivoted_qr(np.zeros((3, 2)))[3], 0,
+                            err_msg="Pivoted QR test 7 Fail")
+
+
+def test_batched_methods():
+    """
+    Tests batched elimination, LU decomposition, substitution, and solve functions.
+    """
+    a = np.array([
+        [[2, 1],
+         [4, 3]],
+        [[0, 1],
+         [2, 3]],
+        [[1, 2],
+         [2, 4]],
+    ])
+    reduced, not_regular = direct_methods.batched_regular_gaussian_elim(a)
+    np.testing.assert_allclose(reduced[0], np.array([[2, 1], [0, 1]]),
+                               err_msg="Batched test 1 Fail")
+    np.testing.assert_equal(not_regular, np.array([False, True, False]),
+                            err_msg="Batched test 2 Fail")
+
+    # Each matrix picks its own pivot, and singular matrices are flagged instead of raising
+    lower, upper, perm, singular = direct_methods.batched_lu_decomposition(a)
+    np.testing.assert_equal(perm, np.array([[1, 0], [1, 0], [1, 0]]),
+                            err_msg="Batched test 3 Fail")
+    np.testing.assert_equal(singular, np.array([False, False, True]),
+                            err_msg="Batched test 4 Fail")
+    np.testing.assert_allclose(lower @ upper, a[np.arange(3)[:, np.newaxis], perm],
+                               err_msg="Batched test 5 Fail")
+    sol, singular = direct_methods.batched_solve(a, np.array([[3, 7], [1, 5], [3, 6]]))
+    np.testing.assert_allclose(sol[:2], np.array([[1, 1], [1, 1]]), err_msg="Batched test 6 Fail")
+    np.testing.assert_equal(singular, np.array([False, False, True]),
+                            err_msg="Batched test 7 Fail")
+
+    rng = np.random.default_rng(5)
+    a = rng.normal(size=(500, 7, 7))
+    b = rng.normal(size=(500, 7, 2))
+    lu, perm, singular = direct_methods.batched_lu_factor(a, dtype=np.float64)
+    np.testing.assert_equal(lu.dtype, np.float64, err_msg="Batched test 8 Fail")
+    for k in [0, 123, 499]:
+        single_lu, single_perm = direct_methods.lu_factor(a[k])
+        np.testing.assert_allclose(lu[k], single_lu, atol=1e-12, err_msg="Batched test 9 Fail")
+        np.testing.assert_equal(perm[k], single_perm, err_msg="Batched test 10 Fail")
+    sol, singular = direct_methods.batched_lu_solve(lu, perm, b)
+    np.testing.assert_allclose(sol, np.linalg.solve(a, b), atol=1e-10,
+                               err_msg="Batched test 11 Fail")
+    np.testing.assert_equal(np.any(singular), False, err_msg="Batched test 12 Fail")
+
+    # Triangular solves with one and several right hand sides
+    upper = np.triu(a) + 3 * np.eye(7)
+    sol, singular = direct_methods.batched_back_substitution(upper, b[:, :, 0])
+    np.testing.assert_allclose(sol, np.linalg.solve(upper, b[:, :, :1])[:, :, 0], atol=1e-10,
+                               err_msg="Batched test 13 Fail")
+    lower = np.tril(a) + 3 * np.eye(7)
+    sol, singular = direct_methods.batched_forward_substitution(lower, b)
+    np.testing.assert_allclose(sol, np.linalg.solve(lower, b), atol=1e-10,
+                               err_msg="Batched test 14 Fail")
+    upper[4, 2, 2] = 0
+    sol, singular = direct_methods.batched_back_substitution(upper, b)
+    np.testing.assert_equal(np.flatnonzero(singular), np.array([4]),
+                            err_msg="Batched test 15 Fail")
+
+    np.testing.assert_raises(ValueError, direct_methods.batched_lu_factor, np.ones((3, 2, 4)))
+    np.testing.assert_raises(ValueError, direct_methods.batched_solve, a, b[:, :3])
+
+
+def test_factorization():
+    """
+    Tests reusable factorization object and factorization cache.
+    """
+    rng = np.random.default_rng(1)
+    a = rng.normal(size=(20, 20))
+    spd = a @ a.T + 20 * np.eye(20)
+    b = rng.normal(size=(20, 3))
+
+    factorization = direct_methods.Factorization(a)
+    np.testing.assert_equal(factorization.method, "lu", err_msg="Factorization test 1 Fail")
+    np.testing.assert_allclose(factorization.solve(b), np.linalg.solve(a, b),
+                               err_msg="Factorization test 2 Fail")
+    np.testing.assert_allclose(factorization.solve(b[:, 0], transpose=True),
+                               np.linalg.solve(a.T, b[:, 0]),
+                               err_msg="Factorization test 3 Fail")
+
+    factorization = direct_methods.Factorization(spd)
+    np.testing.assert_equal(factorization.method, "cholesky", err_msg="Factorization test 4 Fail")
+    np.testing.assert_allclose(factorization.solve(b), np.linalg.solve(spd, b),
+                               err_msg="Factorization test 5 Fail")
+    np.testing.assert_allclose(factorization.solve(b, transpose=True), np.linalg.solve(spd, b),
+                               err_msg="Factorization test 6 Fail")
+    np.testing.assert_equal(direct_methods.Factorization(spd, method="lu").method, "lu",
+                            err_msg="Factorization test 7 Fail")
+
+    np.testing.assert_raises(ValueError, direct_methods.Factorization, a, method="cholesky")
+    np.testing.assert_raises(ValueError, direct_methods.Factorization, a, method="qr")
+    np.testing.assert_raises(ValueError, direct_methods.Factorization, a[:3])
+    np.testing.assert_raises(ValueError, factorization.solve, b[:3])
+
+    # Identical contents reuse the cached factorization, even from a different array
+    direct_methods.clear_factorization_cache()
+    first = direct_methods.factorize(a)
+    np.testing.assert_equal(direct_methods.factorize(a.copy()) is first, True,
+                            err_msg="Factorization test 8 Fail")
+    changed = a.copy()
+    changed[0, 0] += 1
+    np.testing.assert_equal(direct_methods.factorize(changed) is first, False,
+                            err_msg="Factorization test 9 Fail")
+    np.testing.assert_equal(direct_methods.factorize(a, method="lu") is first, False,
+                            err_msg="Factorization test 10 Fail")
+
+    # Least recently used factorizations are dropped
+    direct_methods.set_factorization_cache_size(1)
+    direct_methods.factorize(spd)
+    np.testing.assert_equal(direct_methods.factorize(a) is first, False,
+                            err_msg="Factorization test 11 Fail")
+    direct_methods.set_factorization_cache_size(8)
+    direct_methods.clear_factorization_cache()
+
+    # Dependent values given as a list
+    np.testing.assert_allclose(direct_methods.factorize(a).solve(b[:, 0].tolist()),
+                               np.linalg.solve(a, b[:, 0]), err_msg="Factorization test 12 Fail")
+    np.testing.assert_raises(ValueError, direct_methods.factorize(a).solve, [1, 2])
+    direct_methods.clear_factorization_cache()
+
+
+def test_determinant_and_condition():
+    """
+    Tests determinant, inverse, and condition estimate functions.
+    """
+    a = np.array(
+        [[0, 2, 1],
+         [1, 1, 0],
+         [3, 0, 1]]
+    )
+    direct_methods.clear_factorization_cache()
+    np.testing.assert_allclose(direct_methods.det(a), -5, err_msg="Determinant test 1 Fail")
+    np.testing.assert_allclose(direct_methods.logdet(a), (-1, np.log(5)),
+                               err_msg="Determinant test 2 Fail")
+    np.testing.assert_allclose(direct_methods.inv(a) @ a, np.eye(3), atol=1e-15,
+                               err_msg="Determinant test 3 Fail")
+    np.testing.assert_allclose(direct_methods.condition_estimate(a), np.linalg.cond(a, 1),
+                               err_msg="Determinant test 4 Fail")
+
+    rng = np.random.default_rng(8)
+    c = rng.normal(size=(40, 40))
+    for matrix in [c, c @ c.T + np.eye(40)]:
+        factorization = direct_methods.Factorization(matrix)
+        np.testing.assert_allclose(factorization.logdet(), np.linalg.slogdet(matrix),
+                                   err_msg="Determinant test 5 Fail")
+        np.testing.assert_allclose(factorization.det(), np.linalg.det(matrix),
+                                   err_msg="Determinant test 6 Fail")
+        estimate = factorization.condition_estimate()
+        exact = np.linalg.cond(matrix, 1)
+        np.testing.assert_equal(exact / 3 <= estimate <= exact * (1 + 1e-10), True,
+                                err_msg="Determinant test 7 Fail")
+
+    # Ill conditioned Hilbert matrix
+    hilbert = 1 / (np.arange(8)[:, np.newaxis] + np.arange(8) + 1)
+    np.testing.assert_allclose(direct_methods.condition_estimate(hilbert),
+                               np.linalg.cond(hilbert, 1), rtol=1e-3,
+                               err_msg="Determinant test 8 Fail")
+
+    # Singular matrices
+    np.testing.assert_equal(direct_methods.det(np.ones((3, 3))), 0,
+                            err_msg="Determinant test 9 Fail")
+    np.testing.assert_equal(direct_methods.logdet(np.ones((3, 3))), (0, -np.inf),
+                            err_msg="Determinant test 10 Fail")
+    np.testing.assert_equal(direct_methods.condition_estimate(np.ones((3, 3))), np.inf,
+                            err_msg="Determinant test 11 Fail")
+    np.testing.assert_raises(ValueError, direct_methods.inv, np.ones((3, 3)))
+    np.testing.assert_raises(ValueError, direct_methods.det, np.ones((2, 3)))
+    direct_methods.clear_factorization_cache()
+def test_low_rank_updates():
+    """
+    Tests Woodbury solves, LU and Cholesky updates, and updating factorizations.
+    """
+    rng = np.random.default_rng(9)
+    n = 30
+    a = rng.normal(size=(n, n))
+    spd = a @ a.T + n * np.eye(n)
+    u, v = rng.normal(size=(n, 2)), rng.normal(size=(n, 2))
+    b = rng.normal(size=(n, 3))
+
+    factorization = direct_methods.Factorization(a)
+    woodbury = direct_methods.WoodburyFactorization(factorization, u, v)
+    np.testing.assert_allclose(woodbury.solve(b), np.linalg.solve(a + u @ v.T, b),
+                               err_msg="Low rank update test 1 Fail")
+    np.testing.assert_allclose(woodbury.solve(b[:, 0], transpose=True),
+                               np.linalg.solve((a + u @ v.T).T, b[:, 0]),
+                               err_msg="Low rank update test 2 Fail")
+    np.testing.assert_allclose(direct_methods.woodbury_solve(factorization, u[:, 0], v[:, 0], b),
+                               np.linalg.solve(a + np.outer(u[:, 0], v[:, 0]), b),
+                               err_msg="Low rank update test 3 Fail")
+
+    lu, perm = direct_methods.lu_factor(a)
+    lower, upper = direct_methods.lu_unpack(direct_methods.lu_update(lu, perm, u, v))
+    np.testing.assert_allclose(lower @ upper, (a + u @ v.T)[perm], atol=1e-12,
+                               err_msg="Low rank update test 4 Fail")
+    cholesky = direct_methods.cholesky_factor(spd)
+    updated = direct_methods.cholesky_update(cholesky, u)
+    np.testing.assert_allclose(updated @ updated.T, spd + u @ u.T,
+                               err_msg="Low rank update test 5 Fail")
+    np.testing.assert_allclose(direct_methods.cholesky_update(updated, u, downdate=True),
+                               np.tril(cholesky), atol=1e-12,
+                               err_msg="Low rank update test 6 Fail")
+    np.testing.assert_raises(ValueError, direct_methods.cholesky_update, cholesky, 10 * spd[0],
+                             downdate=True)
+
+    # Updated factorizations are new objects and match refactoring
+    for matrix, update_u, update_v, method in [(a, u, v, "lu"), (spd, u, u, "cholesky"),
+                                               (spd, u / 4, -u / 4, "cholesky"), (spd, u, v, "lu")]:
+        base = direct_methods.Factorization(matrix)
+        updated = direct_methods.update_factorization(base, matrix, update_u, update_v)
+        np.testing.assert_equal((updated.method, updated.updates, base.updates), (method, 2, 0),
+                                err_msg="Low rank update test 7 Fail")
+        np.testing.assert_allclose(updated.solve(b),
+                                   np.linalg.solve(matrix + update_u @ update_v.T, b),
+                                   err_msg="Low rank update test 8 Fail")
+
+    # A row change that leaves a tiny pivot is caught by the drift check and refactored
+    row = factorization.perm[0]
+    change = np.zeros(n)
+    change[0] = 1e-12 - a[row, 0]
+    np.testing.assert_equal(direct_methods.update_factorization(
+        factorization, a, np.eye(n)[row], change).updates, 0, err_msg="Low rank update test 9 Fail")
+    np.testing.assert_equal(direct_methods.update_factorization(
+        factorization, a, np.eye(n)[row], change, drift_tolerance=np.inf).updates, 1,
+        err_msg="Low rank update test 10 Fail")
+    np.testing.assert_raises(ValueError, direct_methods.WoodburyFactorization, factorization,
+                             u, v[:, 0])
+
+
 if __name__ == "__main__":
     test_back_substitution()
     print("Back sub tests passed")
+    test_back_substitution_multiple_rhs()
+    print("Back sub multiple RHS tests passed")
+    test_forward_substitution()
+    print("Forward sub tests passed")
     test_regular_gaussian_elimination()
     print("Regular GE tests passed")
     test_complete_gaussian_elimination()
     print("Complete GE tests passed")
+    test_rref()
+    print("RREF tests passed")
     test_lu_decomposition()
     print("LU decomposition tests passed")
+    test_lu_factor()
+    print("LU factor tests passed")
+    test_tiled_lu_factor()
+    print("Tiled LU factor tests passed")
+    test_out_of_core_lu()
+    print("Out of core LU tests passed")
+    test_dtype_policy()
+    print("Dtype policy tests passed")
+    test_mixed_precision_solve()
+    print("Mixed precision tests passed")
+    test_cholesky_factor()
+    print("Cholesky factor tests passed")
+    test_pivoted_cholesky()
+    print("Pivoted Cholesky tests passed")
+    test_ldl_factor()
+    print("LDL factor tests passed")
+    test_qr_factor()
+    print("QR factor tests passed")
+    test_pivoted_qr()
+    print("Pivoted QR tests passed")
+    test_batched_methods()
+    print("Batched tests passed")
+    test_factorization()
+    print("Factorization tests passed")
+    test_determinant_and_condition()
+    print("Determinant and condition tests passed")
+    test_low_rank_updates()
+    print("Low rank update tests passed")
     print("Tests Passed!")
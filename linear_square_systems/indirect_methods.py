@@ -1,4 +1,8 @@
+from typing import NamedTuple
 import numpy as np
+import scipy.sparse
+from scipy.linalg import solve_triangular
+from scipy.sparse.linalg import splu
 
 
 def iterate_matrix(input_matrix: np.array, b: np.array, x0: np.array = None,
@@ -13,7 +17,7 @@ def iterate_matrix(input_matrix: np.array, b: np.array, x0: np.array = None,
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix to multiply current approximation by in iteration.
     b : np.array
         Vector to add in iteration scheme.
@@ -31,13 +35,47 @@ def iterate_matrix(input_matrix: np.array, b: np.array, x0: np.array = None,
     """
     if x0 is None:
         x0 = np.zeros(b.shape)
+
+    def step(x):
+        x[:] = input_matrix @ x + b
+
+    return iterate_function(step, x0, threshold=threshold, iterations=iterations)
+
+
+def iterate_function(step: callable, x0: np.array, threshold: float = 1e-5,
+                     iterations: int = 30) -> np.array:
+    """
+    Given a function that updates the current approximation in place, an initial guess, a given
+    minimum threshold for consecutive approximations to stop iterating, and a maximum number of
+    iterations to stop iterating, calls the function each iteration until a stop condition is
+    reached. This lets iteration schemes sweep through the matrix entries directly instead of
+    forming an iteration matrix. The initial guess is not modified.
+
+    Parameters
+    ----------
+    step : callable
+        Function step(x) that overwrites x with the next approximation.
+    x0 : np.array
+        Initial guess for iteration.
+    threshold: float, default 1e-5
+        Minimum distance between two vector approximations for iteration to stop. Defaults to 1e-5.
+    iterations: int, default 30
+        Maximum number of iterations before stopping. Defaults to 30.
+
+    Returns
+    -------
+    np.array
+        Vector of final iteration output.
+    """
+    x0 = np.asarray(x0, dtype=np.float64)
     iteration = 1
-    x1 = np.matmul(input_matrix, x0) + b
+    x1 = x0.copy()
+    step(x1)
     dist = np.linalg.norm(x1 - x0)
 
     while iteration < iterations and dist >= threshold:
-        x0 = x1
-        x1 = np.matmul(input_matrix, x0) + b
+        x0 = x1.copy()
+        step(x1)
         dist = np.linalg.norm(x1 - x0)
         iteration += 1
 
@@ -50,13 +88,130 @@ def iterate_matrix(input_matrix: np.array, b: np.array, x0: np.array = None,
     return x1
 
 
+def _nonzero_diagonal(input_matrix: np.array) -> np.array:
+    """
+    Returns the diagonal of the given matrix as a float vector.
+
+    Raises
+    ------
+    ValueError
+        If the diagonal has a zero.
+    """
+    diagonal = input_matrix.diagonal().astype(np.float64)
+    if np.any(diagonal == 0):
+        raise ValueError("Given matrix has a zero on its diagonal")
+    return diagonal
+
+
+def sor_sweep(input_matrix: np.array, b: np.array, x: np.array, w: float = 1.0,
+              backward: bool = False) -> np.array:
+    """
+    Given a matrix representing the system to be solved, a b vector of dependent values, a
+    current approximation, and a relaxation parameter, performs one Successive Over-Relaxation
+    sweep in place, updating each entry of x in turn from the newest values of the others.
+    A relaxation parameter of 1 gives a Gauss-Seidel sweep. The sweep goes from the first row
+    to the last, or from the last to the first if backward. Each row of the matrix is read once,
+    so a sweep costs the same as a matrix vector product and no iteration matrix is formed.
+    A scipy sparse matrix is swept with a sparse triangular solve instead of a loop over rows,
+    and only its nonzero entries are stored. The iteration functions set this up once rather
+    than on every sweep.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Matrix representing system to solve, with no zeros on its diagonal.
+    b : np.array
+        Vector of dependent values for solving the system.
+    x : np.array
+        Float vector of the current approximation, overwritten with the next one.
+    w : float, default 1.0
+        Relaxation parameter. Defaults to 1.0.
+    backward : bool, default False
+        Whether to sweep from the last row to the first. Defaults to False.
+
+    Returns
+    -------
+    np.array
+        The updated vector x.
+    """
+    if scipy.sparse.issparse(input_matrix):
+        _sweep_step(input_matrix, b, w, backward)(x)
+        return x
+    diagonal = np.diagonal(input_matrix)
+    rows = range(input_matrix.shape[0] - 1, -1, -1) if backward else range(input_matrix.shape[0])
+    for i in rows:
+        x[i] += w * (b[i] - np.dot(input_matrix[i], x)) / diagonal[i]
+    return x
+
+
+def _triangular_solver(triangle) -> callable:
+    """
+    Given a sparse triangular matrix with a nonzero diagonal, returns a function that solves
+    systems with it. SuperLU with the natural ordering and diagonal pivots does no row swaps
+    and makes no fill on a triangular matrix, so this only copies the triangle into SuperLU's
+    format once, and each solve is then a compiled triangular solve.
+
+    Parameters
+    ----------
+    triangle : scipy.sparse matrix
+        Lower or upper triangular matrix.
+
+    Returns
+    -------
+    callable
+        Function solve(rhs) returning inv(triangle) @ rhs.
+    """
+    factorization = splu(scipy.sparse.csc_matrix(triangle), permc_spec="NATURAL",
+                         diag_pivot_thresh=0, options={"SymmetricMode": True})
+    return factorization.solve
+
+
+def _sweep_step(input_matrix, b: np.array, w: float, backward: bool) -> callable:
+    """
+    Returns a function that performs one SOR sweep of x in place, for passing to
+    iterate_function. For a scipy sparse matrix, the splitting A = L + D + U is computed once in
+    CSR form, and each sweep solves the sparse triangular system
+    (D + w * L) @ x_new = w * b - (w * U + (w - 1) * D) @ x, or the same with L and U swapped
+    for a backward sweep, which is the same update as the row by row sweep in O(nnz) memory.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Matrix representing system to solve, with no zeros on its diagonal.
+    b : np.array
+        Vector of dependent values for solving the system.
+    w : float
+        Relaxation parameter.
+    backward : bool
+        Whether to sweep from the last row to the first.
+
+    Returns
+    -------
+    callable
+        Function step(x) that overwrites x with the result of one sweep.
+    """
+    if not scipy.sparse.issparse(input_matrix):
+        return lambda x: sor_sweep(input_matrix, b, x, w=w, backward=backward)
+    matrix = scipy.sparse.csr_matrix(input_matrix, dtype=np.float64)
+    diagonal = matrix.diagonal()
+    strict_lower = scipy.sparse.tril(matrix, -1, format="csr")
+    strict_upper = scipy.sparse.triu(matrix, 1, format="csr")
+    near, far = (strict_upper, strict_lower) if backward else (strict_lower, strict_upper)
+    solve = _triangular_solver(w * near + scipy.sparse.diags(diagonal))
+
+    def step(x):
+        x[:] = solve(w * b - w * (far @ x) - (w - 1) * diagonal * x)
+
+    return step
+
+
 def is_diagonally_dominant(input_matrix: np.array) -> bool:
     """
     Given a matrix, returns if the matrix is strictly diagonally dominant.
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix to evaluate.
 
     Returns
@@ -64,10 +219,8 @@ def is_diagonally_dominant(input_matrix: np.array) -> bool:
     bool
         If given matrix is strictly diagonally dominant.
     """
-    for i in range(input_matrix.shape[0]):
-        if 2 * abs(input_matrix[i][i]) <= sum(abs(input_matrix[i])):
-            return False
-    return True
+    row_sums = np.asarray(abs(input_matrix).sum(axis=1)).ravel()
+    return bool(np.all(2 * np.abs(input_matrix.diagonal()) > row_sums))
 
 
 def conclude(input_matrix: np.array, b: np.array, final: np.array) -> None:
@@ -78,7 +231,7 @@ def conclude(input_matrix: np.array, b: np.array, final: np.array) -> None:
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix representing system that was attempted to be solved.
     b : np.array
         Vector of dependent values for solving the system.
@@ -89,7 +242,7 @@ def conclude(input_matrix: np.array, b: np.array, final: np.array) -> None:
     -------
     None
     """
-    predicted = np.matmul(input_matrix, final)
+    predicted = input_matrix @ final
     output_dist = np.linalg.norm(predicted - b)
     print("The vector arrived at: " + str(final) + " predicts a b vector of " + str(predicted))
     print("The distance between actual: " + str(b) + " and predicted is " + str(output_dist))
@@ -108,7 +261,7 @@ def neumann_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix representing system to solve.
     b : np.array
         Vector of dependent values for solving the system.
@@ -126,8 +279,11 @@ def neumann_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
     """
     if x0 is None:
         x0 = np.zeros(b.shape)
-    iter_mat = np.eye(input_matrix.shape[0]) - input_matrix
-    final = iterate_matrix(iter_mat, b, x0=x0, threshold=threshold, iterations=iterations)
+
+    def step(x):
+        x += b - input_matrix @ x
+
+    final = iterate_function(step, x0, threshold=threshold, iterations=iterations)
     conclude(input_matrix, b, final)
     return final
 
@@ -145,7 +301,7 @@ def jacobi_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix representing system to solve.
     b : np.array
         Vector of dependent values for solving the system.
@@ -160,23 +316,27 @@ def jacobi_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
     -------
     np.array
         Vector of final iteration output.
+
+    Raises
+    ------
+    ValueError
+        If the matrix has a zero on its diagonal.
     """
     if x0 is None:
         x0 = np.zeros(b.shape)
-    lower = np.tril(input_matrix, -1)
-    upper = np.triu(input_matrix, 1)
-    diagonal = np.diagflat(np.diagonal(input_matrix))
-    diag_inverse = np.linalg.inv(diagonal)
-    iter_mat = -np.matmul(diag_inverse, (lower + upper))
-    c = np.matmul(diag_inverse, b)
-
-    final = iterate_matrix(iter_mat, c, x0=x0, threshold=threshold, iterations=iterations)
+    diagonal = _nonzero_diagonal(input_matrix)
+
+    def step(x):
+        x += (b - input_matrix @ x) / diagonal
+
+    final = iterate_function(step, x0, threshold=threshold, iterations=iterations)
     conclude(input_matrix, b, final)
     return final
 
 
 def gauss_seidel_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
-                           threshold: float = 1e-5, iterations: int = 30) -> np.array:
+                           threshold: float = 1e-5, iterations: int = 30,
+                           backward: bool = False) -> np.array:
     """
     Given a matrix representing the system to be solved, a b vector of dependent values for
     solving the system, an initial guess, a given minimum threshold for consecutive approximations
@@ -184,11 +344,12 @@ def gauss_seidel_iteration(input_matrix: np.array, b: np.array, x0: np.array = N
     Gauss-Seidel iteration scheme on system to approximate a solution
     until a stop condition is reached. The minimum threshold, maximum number of iterations,
     and initial guess can be specified but default to 1e-5, 30, and the zero vector respectively.
+    Each iteration is a sor_sweep in place, forward or backward.
     The final approximation reached is returned.
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix representing system to solve.
     b : np.array
         Vector of dependent values for solving the system.
@@ -198,30 +359,32 @@ def gauss_seidel_iteration(input_matrix: np.array, b: np.array, x0: np.array = N
         Minimum distance between two vector approximations for iteration to stop. Defaults to 1e-5.
     iterations : int, default 30
         Maximum number of iterations before stopping. Defaults to 30.
+    backward : bool, default False
+        Whether to sweep from the last row to the first. Defaults to False.
 
     Returns
     -------
     np.array
         Vector of final iteration output.
+
+    Raises
+    ------
+    ValueError
+        If the matrix has a zero on its diagonal.
     """
     if x0 is None:
         x0 = np.zeros(b.shape)
-    lower = np.tril(input_matrix, -1)
-    upper = np.triu(input_matrix, 1)
-    diagonal = np.diagflat(np.diagonal(input_matrix))
-
-    ld_inverse = np.linalg.inv(lower + diagonal)
-    iter_mat = -np.matmul(ld_inverse, upper)
-    c = np.matmul(ld_inverse, b)
-
-    final = iterate_matrix(iter_mat, c, x0=x0, threshold=threshold, iterations=iterations)
+    _nonzero_diagonal(input_matrix)
+    final = iterate_function(_sweep_step(input_matrix, b, 1.0, backward), x0,
+                             threshold=threshold, iterations=iterations)
 
     conclude(input_matrix, b, final)
     return final
 
 
 def sor_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
-                  threshold: float = 1e-5, iterations: int = 30, w: float = 1.5) -> np.array:
+                  threshold: float = 1e-5, iterations: int = 30, w: float = 1.5,
+                  backward: bool = False) -> np.array:
     """
     Given a matrix representing the system to be solved, a b vector of dependent values for
     solving the system, an initial guess, a given minimum threshold
@@ -230,11 +393,12 @@ def sor_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
     on system to approximate a solution until a stop condition is reached. The minimum threshold,
     maximum number of iterations, initial guess, and relaxation parameter can be specified but
     default to 1e-5, 30, the zero vector, and 1.5 respectively.
+    Each iteration is a sor_sweep in place, forward or backward.
     The final approximation reached is returned.
 
     Parameters
     ----------
-    input_matrix : np.array
+    input_matrix : np.array or scipy.sparse matrix
         Matrix representing system to solve.
     b : np.array
         Vector of dependent values for solving the system.
@@ -246,22 +410,337 @@ def sor_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
         Maximum number of iterations before stopping. Defaults to 30.
     w : float, default 1.5
         Relaxation parameter. Defaults to 1.5.
+    backward : bool, default False
+        Whether to sweep from the last row to the first. Defaults to False.
 
     Returns
     -------
     np.array
         Vector of final iteration output.
+
+    Raises
+    ------
+    ValueError
+        If the matrix has a zero on its diagonal.
     """
     if x0 is None:
         x0 = np.zeros(b.shape)
-    lower = np.tril(input_matrix, -1)
-    upper = np.triu(input_matrix, 1)
-    diagonal = np.diagflat(np.diagonal(input_matrix))
+    _nonzero_diagonal(input_matrix)
+    final = iterate_function(_sweep_step(input_matrix, b, w, backward), x0,
+                             threshold=threshold, iterations=iterations)
+    conclude(input_matrix, b, final)
+    return final
+
 
-    weighted_ld_inverse = np.linalg.inv(w * lower + diagonal)
-    iter_mat = -np.matmul(weighted_ld_inverse, w * upper + (w - 1) * diagonal)
-    c = np.matmul(weighted_ld_inverse, w * b)
+def ssor_iteration(input_matrix: np.array, b: np.array, x0: np.array = None,
+                   threshold: float = 1e-5, iterations: int = 30, w: float = 1.5) -> np.array:
+    """
+    Given a matrix representing the system to be solved, a b vector of dependent values for
+    solving the system, an initial guess, a given minimum threshold
+    for consecutive approximations to stop iterating, a maximum number of iterations to stop
+    iterating, and a relaxation parameter, performs Symmetric Successive Over-Relaxation
+    iteration scheme on system to approximate a solution until a stop condition is reached.
+    Each iteration is a forward sor_sweep followed by a backward one, which for a symmetric
+    matrix gives a symmetric iteration. The minimum threshold, maximum number of iterations,
+    initial guess, and relaxation parameter can be specified but default to 1e-5, 30, the zero
+    vector, and 1.5 respectively.
+    The final approximation reached is returned.
 
-    final = iterate_matrix(iter_mat, c, x0=x0, threshold=threshold, iterations=iterations)
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Matrix representing system to solve.
+    b : np.array
+        Vector of dependent values for solving the system.
+    x0 : np.array, optional
+        Initial guess for solution. Defaults to the zero vector.
+    threshold : float, default 1e-5
+        Minimum distance between two vector approximations for iteration to stop. Defaults to 1e-5.
+    iterations : int, default 30
+        Maximum number of iterations before stopping. Defaults to 30.
+    w : float, default 1.5
+        Relaxation parameter. Defaults to 1.5.
+
+    Returns
+    -------
+    np.array
+        Vector of final iteration output.
+
+    Raises
+    ------
+    ValueError
+        If the matrix has a zero on its diagonal.
+    """
+    if x0 is None:
+        x0 = np.zeros(b.shape)
+    _nonzero_diagonal(input_matrix)
+    forward = _sweep_step(input_matrix, b, w, False)
+    backward = _sweep_step(input_matrix, b, w, True)
+
+    def step(x):
+        forward(x)
+        backward(x)
+
+    final = iterate_function(step, x0, threshold=threshold, iterations=iterations)
     conclude(input_matrix, b, final)
     return final
+
+
+class CGResult(NamedTuple):
+    """
+    Result of a preconditioned conjugate gradient solve.
+
+    Attributes
+    ----------
+    x : np.array
+        Approximate solution.
+    iterations : int
+        Number of iterations performed.
+    residuals : np.array
+        2-norm of the residual b - A @ x before the first iteration and after each one.
+    converged : bool
+        If the residual threshold was reached before the iteration limit.
+    """
+    x: np.array
+    iterations: int
+    residuals: np.array
+    converged: bool
+
+
+def jacobi_preconditioner(input_matrix) -> callable:
+    """
+    Given a symmetric positive definite matrix, returns the Jacobi preconditioner for
+    conjugate_gradient, which divides by the diagonal.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Symmetric positive definite matrix.
+
+    Returns
+    -------
+    callable
+        Function precondition(r, out) that writes inv(D) @ r into out.
+
+    Raises
+    ------
+    ValueError
+        If the matrix has a zero on its diagonal.
+    """
+    diagonal = _nonzero_diagonal(input_matrix)
+
+    def precondition(r, out):
+        np.divide(r, diagonal, out=out)
+
+    return precondition
+
+
+def ssor_preconditioner(input_matrix, w: float = 1.0) -> callable:
+    """
+    Given a symmetric positive definite matrix and a relaxation parameter between 0 and 2,
+    returns the SSOR preconditioner for conjugate_gradient,
+    M = w / (2 - w) * (D / w + L) @ inv(D / w) @ (D / w + U), which is applied with one
+    forward and one backward triangular solve. The triangles are kept sparse for a scipy sparse
+    matrix.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Symmetric positive definite matrix.
+    w : float, default 1.0
+        Relaxation parameter. Defaults to 1.0.
+
+    Returns
+    -------
+    callable
+        Function precondition(r, out) that writes inv(M) @ r into out.
+
+    Raises
+    ------
+    ValueError
+        If the matrix has a zero on its diagonal or w is not between 0 and 2.
+    """
+    if not 0 < w < 2:
+        raise ValueError("Relaxation parameter must be between 0 and 2")
+    scaled = _nonzero_diagonal(input_matrix) / w
+    if scipy.sparse.issparse(input_matrix):
+        matrix = scipy.sparse.csr_matrix(input_matrix, dtype=np.float64)
+        diagonal = scipy.sparse.diags(scaled)
+        solve_lower = _triangular_solver(scipy.sparse.tril(matrix, -1) + diagonal)
+        solve_upper = _triangular_solver(scipy.sparse.triu(matrix, 1) + diagonal)
+    else:
+        lower = np.tril(input_matrix, -1) + np.diag(scaled)
+        upper = np.triu(input_matrix, 1) + np.diag(scaled)
+
+        def solve_lower(rhs):
+            return solve_triangular(lower, rhs, lower=True)
+
+        def solve_upper(rhs):
+            return solve_triangular(upper, rhs, lower=False)
+
+    def precondition(r, out):
+        out[:] = solve_upper(scaled * solve_lower(r))
+        out *= (2 - w) / w
+
+    return precondition
+
+
+def incomplete_cholesky_preconditioner(input_matrix, shift: float = 0.0) -> callable:
+    """
+    Given a symmetric positive definite matrix, returns the zero fill incomplete Cholesky
+    preconditioner IC(0) for conjugate_gradient. The factor L is computed row by row like a
+    Cholesky factor, except that entries outside the nonzero pattern of the lower triangle of
+    the matrix are dropped, so L takes no more memory than the matrix, and it is applied with
+    two sparse triangular solves. IC(0) can break down on a matrix that is not diagonally
+    dominant, and a small shift added to the diagonal usually fixes this.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Symmetric positive definite matrix.
+    shift : float, default 0.0
+        Relative amount added to the diagonal before factoring, a_ii * (1 + shift).
+        Defaults to 0.0.
+
+    Returns
+    -------
+    callable
+        Function precondition(r, out) that writes inv(L @ L.T) @ r into out.
+
+    Raises
+    ------
+    ValueError
+        If the factorization breaks down with a nonpositive pivot.
+    """
+    lower = scipy.sparse.tril(scipy.sparse.csr_matrix(input_matrix, dtype=np.float64),
+                              format="csr")
+    lower.sum_duplicates()
+    lower.sort_indices()
+    # The rows are short, so they are walked as lists, which is much faster than numpy calls
+    indptr, indices, data = lower.indptr.tolist(), lower.indices.tolist(), lower.data.tolist()
+    # Row i of L scattered by column, so rows are merged by lookups instead of searches
+    work = [0.0] * lower.shape[0]
+    for i in range(lower.shape[0]):
+        start, end = indptr[i], indptr[i + 1]
+        if end == start or indices[end - 1] != i:
+            raise ValueError("Incomplete Cholesky broke down")
+        pivot = data[end - 1] * (1 + shift)
+        for position in range(start, end - 1):
+            j = indices[position]
+            # Dot product of rows i and j of L, where work is zero off the pattern of row i
+            total = 0.0
+            for other in range(indptr[j], indptr[j + 1] - 1):
+                total += data[other] * work[indices[other]]
+            value = (data[position] - total) / data[indptr[j + 1] - 1]
+            data[position] = value
+            work[j] = value
+            pivot -= value * value
+        for position in range(start, end - 1):
+            work[indices[position]] = 0.0
+        if pivot <= 0:
+            raise ValueError("Incomplete Cholesky broke down")
+        data[end - 1] = pivot ** 0.5
+    factor = scipy.sparse.csr_matrix((np.array(data), lower.indices, lower.indptr),
+                                     shape=lower.shape)
+    solve_lower = _triangular_solver(factor)
+    solve_upper = _triangular_solver(factor.T)
+
+    def precondition(r, out):
+        out[:] = solve_upper(solve_lower(r))
+
+    return precondition
+
+
+def conjugate_gradient(input_matrix, b: np.array, x0: np.array = None, threshold: float = 1e-5,
+                       iterations: int = None, preconditioner=None) -> CGResult:
+    """
+    Given a symmetric positive definite matrix, or a function that multiplies by one, and a b
+    vector of dependent values, solves the system with the preconditioned conjugate gradient
+    method until the 2-norm of the residual b - A @ x is at most threshold times the 2-norm of
+    b or the maximum number of iterations is reached. Each iteration costs one product with the
+    matrix and one application of the preconditioner, and all the work vectors are allocated
+    once and updated in place. A good preconditioner M approximates A while being cheap to
+    solve with, and the number of iterations depends on the condition number of inv(M) @ A
+    instead of A.
+
+    Parameters
+    ----------
+    input_matrix : np.array, scipy.sparse matrix, or callable
+        Symmetric positive definite matrix, or a function matvec(x) returning A @ x.
+    b : np.array
+        Vector of dependent values for solving the system.
+    x0 : np.array, optional
+        Initial guess for solution. Defaults to the zero vector.
+    threshold : float, default 1e-5
+        Relative residual for iteration to stop. Defaults to 1e-5.
+    iterations : int, optional
+        Maximum number of iterations. Defaults to the number of unknowns.
+    preconditioner : str or callable, optional
+        One of "jacobi", "ssor", or "incomplete_cholesky" to build that preconditioner from the
+        matrix, or a function precondition(r, out) that writes inv(M) @ r into out. Defaults to
+        no preconditioning.
+
+    Returns
+    -------
+    CGResult
+        Solution, iteration count, residual history, and whether it converged.
+
+    Raises
+    ------
+    ValueError
+        If the preconditioner is not recognized or needs a matrix, or if the matrix is found
+        not to be positive definite.
+    """
+    b = np.asarray(b, dtype=np.float64)
+    n = b.shape[0]
+    if callable(input_matrix):
+        matvec = input_matrix
+    elif isinstance(input_matrix, np.ndarray):
+        def matvec(vector):
+            return np.matmul(input_matrix, vector, out=product)
+    else:
+        def matvec(vector):
+            return input_matrix @ vector
+
+    builders = {"jacobi": jacobi_preconditioner, "ssor": ssor_preconditioner,
+                "incomplete_cholesky": incomplete_cholesky_preconditioner}
+    if isinstance(preconditioner, str):
+        if preconditioner not in builders:
+            raise ValueError("Unknown preconditioner: " + preconditioner)
+        if callable(input_matrix):
+            raise ValueError("Preconditioner " + preconditioner + " needs a matrix")
+        preconditioner = builders[preconditioner](input_matrix)
+    if preconditioner is None:
+        def preconditioner(r, out):
+            out[:] = r
+    if iterations is None:
+        iterations = n
+
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=np.float64)
+    product = np.empty(n)
+    work = np.empty(n)
+    z = np.empty(n)
+    r = b - matvec(x)
+    preconditioner(r, z)
+    direction = z.copy()
+    rz = r @ z
+    residuals = [np.linalg.norm(r)]
+    stop = threshold * np.linalg.norm(b)
+    iteration = 0
+
+    while iteration < iterations and residuals[-1] > stop:
+        q = matvec(direction)
+        curvature = direction @ q
+        if curvature <= 0:
+            raise ValueError("Given matrix is not positive definite")
+        alpha = rz / curvature
+        x += np.multiply(direction, alpha, out=work)
+        r -= np.multiply(q, alpha, out=work)
+        preconditioner(r, z)
+        rz, previous = r @ z, rz
+        direction *= rz / previous
+        direction += z
+        residuals.append(np.linalg.norm(r))
+        iteration += 1
+
+    return CGResult(x, iteration, np.array(residuals), bool(residuals[-1] <= stop))
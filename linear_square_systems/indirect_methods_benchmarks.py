@@ -0,0 +1,157 @@
+import contextlib
+import io
+import re
+import time
+import numpy as np
+import scipy.sparse
+import indirect_methods
+
+
+def time_call(run: callable, repeats: int = 3) -> float:
+    """
+    Returns the best time in seconds of calling the given function with no arguments, with
+    anything it prints thrown away.
+
+    Parameters
+    ----------
+    run : callable
+        Function to time.
+    repeats : int, default 3
+        Number of calls to take the best of. Defaults to 3.
+
+    Returns
+    -------
+    float
+        Best time of one call in seconds.
+    """
+    best = np.inf
+    for i in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def inverse_sor_iteration(input_matrix: np.array, b: np.array, iterations: int = 30,
+                          w: float = 1.5) -> np.array:
+    """
+    SOR that inverts w * L + D and forms the dense iteration matrix before iterating, kept as
+    the baseline the in place sweeps are compared against.
+
+    Parameters
+    ----------
+    input_matrix : np.array
+        Matrix representing system to solve.
+    b : np.array
+        Vector of dependent values for solving the system.
+    iterations : int, default 30
+        Number of iterations. Defaults to 30.
+    w : float, default 1.5
+        Relaxation parameter. Defaults to 1.5.
+
+    Returns
+    -------
+    np.array
+        Vector of final iteration output.
+    """
+    lower = np.tril(input_matrix, -1)
+    upper = np.triu(input_matrix, 1)
+    diagonal = np.diagflat(np.diagonal(input_matrix))
+    weighted_ld_inverse = np.linalg.inv(w * lower + diagonal)
+    iter_mat = -np.matmul(weighted_ld_inverse, w * upper + (w - 1) * diagonal)
+    c = np.matmul(weighted_ld_inverse, w * b)
+    return indirect_methods.iterate_matrix(iter_mat, c, threshold=0, iterations=iterations)
+
+
+def sweep_benchmark():
+    """
+    Compares the setup and total time of SOR with an inverted iteration matrix against the
+    in place sweeps of sor_iteration and jacobi_iteration, over 30 iterations each.
+    """
+    rng = np.random.default_rng(0)
+    print("{:>6}{:>16}{:>16}{:>14}{:>14}{:>12}".format(
+        "n", "setup (s)", "inverse (s)", "sweeps (s)", "jacobi (s)", "difference"))
+    for n in [200, 1000, 3000]:
+        a = rng.normal(size=(n, n)) + n * np.eye(n)
+        b = rng.normal(size=n)
+        setup_time = time_call(lambda: np.linalg.inv(np.tril(a)), repeats=1)
+        inverse_time = time_call(lambda: inverse_sor_iteration(a, b), repeats=1)
+        sweep_time = time_call(lambda: indirect_methods.sor_iteration(a, b, threshold=0),
+                               repeats=1)
+        jacobi_time = time_call(lambda: indirect_methods.jacobi_iteration(a, b, threshold=0),
+                                repeats=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            difference = np.max(np.abs(inverse_sor_iteration(a, b)
+                                       - indirect_methods.sor_iteration(a, b, threshold=0)))
+        print("{:>6}{:>16.4f}{:>16.4f}{:>14.4f}{:>14.4f}{:>12.1e}".format(
+            n, setup_time, inverse_time, sweep_time, jacobi_time, difference))
+
+
+def sparse_benchmark():
+    """
+    Reports the memory of five point Poisson matrices in CSR form against dense form, and the
+    time of 10 Jacobi and SOR iterations on them.
+    """
+    print("{:>10}{:>14}{:>14}{:>14}{:>12}".format(
+        "n", "dense (GB)", "csr (MB)", "jacobi (s)", "sor (s)"))
+    for m in [100, 300, 1000]:
+        second = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+        poisson = (scipy.sparse.kron(scipy.sparse.eye(m), second)
+                   + scipy.sparse.kron(second, scipy.sparse.eye(m))).tocsr()
+        n = poisson.shape[0]
+        b = np.ones(n)
+        csr_bytes = poisson.data.nbytes + poisson.indices.nbytes + poisson.indptr.nbytes
+        jacobi_time = time_call(lambda: indirect_methods.jacobi_iteration(
+            poisson, b, threshold=0, iterations=10), repeats=1)
+        sor_time = time_call(lambda: indirect_methods.sor_iteration(
+            poisson, b, threshold=0, iterations=10, w=1.9), repeats=1)
+        print("{:>10}{:>14.1f}{:>14.1f}{:>14.4f}{:>12.4f}".format(
+            n, n * n * 8 / 1e9, csr_bytes / 1e6, jacobi_time, sor_time))
+
+
+def poisson_matrix(m: int) -> scipy.sparse.csr_matrix:
+    """
+    Returns the five point finite difference Laplacian on an m by m grid.
+    """
+    second = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    identity = scipy.sparse.eye(m)
+    return (scipy.sparse.kron(identity, second) + scipy.sparse.kron(second, identity)).tocsr()
+
+
+def conjugate_gradient_benchmark():
+    """
+    Compares the iterations, time, and final relative residual of Gauss-Seidel and SOR
+    against conjugate_gradient with each preconditioner on Poisson problems.
+    """
+    print("{:>8}{:>24}{:>12}{:>12}{:>12}".format("n", "method", "iterations", "time (s)",
+                                                  "residual"))
+    for m in [30, 100]:
+        poisson = poisson_matrix(m)
+        b = np.ones(m * m)
+        for name, method in [("gauss-seidel", indirect_methods.gauss_seidel_iteration),
+                             ("sor w=1.9", lambda a, b, **kwargs: indirect_methods.sor_iteration(
+                                 a, b, w=1.9, **kwargs))]:
+            output = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                sol = method(poisson, b, threshold=1e-8, iterations=20000)
+            elapsed = time.perf_counter() - start
+            count = re.search(r"This took (\d+) iterations", output.getvalue())
+            print("{:>8}{:>24}{:>12}{:>12.4f}{:>12.1e}".format(
+                m * m, name, count.group(1) if count else 20000, elapsed,
+                np.linalg.norm(poisson @ sol - b) / np.linalg.norm(b)))
+        for preconditioner in [None, "jacobi", "ssor", "incomplete_cholesky"]:
+            start = time.perf_counter()
+            result = indirect_methods.conjugate_gradient(poisson, b, threshold=1e-8,
+                                                         preconditioner=preconditioner)
+            elapsed = time.perf_counter() - start
+            print("{:>8}{:>24}{:>12}{:>12.4f}{:>12.1e}".format(
+                m * m, "cg " + str(preconditioner or "none"), result.iterations, elapsed,
+                result.residuals[-1] / np.linalg.norm(b)))
+
+
+if __name__ == "__main__":
+    sweep_benchmark()
+    sparse_benchmark()
+    conjugate_gradient_benchmark()
@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse
 import indirect_methods
 
 
@@ -166,6 +167,173 @@ def sor_iteration_tests():
         np.array([2.0002185, 1.9999319]).transpose(),
         err_msg="SOR Test 1"
     )
+    np.testing.assert_raises(ValueError, indirect_methods.sor_iteration,
+                             np.array([[0, 1], [1, 2]]), b)
+
+
+def sor_sweep_tests():
+    """
+    Tests SOR sweep function against the iteration matrix it replaces.
+    """
+    rng = np.random.default_rng(0)
+    n = 20
+    a = rng.normal(size=(n, n)) + n * np.eye(n)
+    b = rng.normal(size=n)
+    x0 = rng.normal(size=n)
+    lower = np.tril(a, -1)
+    upper = np.triu(a, 1)
+    diagonal = np.diag(np.diagonal(a))
+    for w in [1, 1.3]:
+        weighted_ld_inverse = np.linalg.inv(w * lower + diagonal)
+        expected = (-weighted_ld_inverse @ (w * upper + (w - 1) * diagonal) @ x0
+                    + weighted_ld_inverse @ (w * b))
+        np.testing.assert_allclose(
+            indirect_methods.sor_sweep(a, b, x0.copy(), w=w),
+            expected,
+            err_msg="SOR Sweep Test 1"
+        )
+
+    # A backward sweep is a forward sweep of the system with rows and columns reversed
+    np.testing.assert_allclose(
+        indirect_methods.sor_sweep(a, b, x0.copy(), w=1.3, backward=True),
+        indirect_methods.sor_sweep(a[::-1, ::-1], b[::-1], x0[::-1].copy(), w=1.3)[::-1],
+        err_msg="SOR Sweep Test 2"
+    )
+
+    x = x0.copy()
+    np.testing.assert_equal(indirect_methods.sor_sweep(a, b, x) is x, True,
+                            err_msg="SOR Sweep Test 3")
+    np.testing.assert_allclose(
+        indirect_methods.gauss_seidel_iteration(a, b, iterations=100, threshold=1e-12,
+                                                backward=True),
+        np.linalg.solve(a, b),
+        err_msg="SOR Sweep Test 4"
+    )
+
+
+def ssor_iteration_tests():
+    """
+    Tests SSOR iteration function.
+    """
+    a = np.array([[2, 1], [1, 2]])
+    b = np.array([6, 6]).transpose()
+    np.testing.assert_allclose(
+        indirect_methods.ssor_iteration(a, b, iterations=1, w=1),
+        np.array([9 / 4, 3 / 2]).transpose(),
+        err_msg="SSOR Test 1"
+    )
+    np.testing.assert_allclose(
+        indirect_methods.ssor_iteration(a, b, iterations=50, w=1.2, threshold=1e-12),
+        np.array([2, 2]).transpose(),
+        err_msg="SSOR Test 2"
+    )
+
+def sparse_matrix_tests():
+    """
+    Tests iteration functions on scipy sparse matrices against the same dense matrices.
+    """
+    rng = np.random.default_rng(1)
+    n = 30
+    a = rng.normal(size=(n, n)) * (rng.random((n, n)) < 0.2) + 4 * np.eye(n)
+    b = rng.normal(size=n)
+    x0 = rng.normal(size=n)
+    for sparse in [scipy.sparse.csr_matrix(a), scipy.sparse.csr_array(a)]:
+        for w, backward in [(1, False), (1.4, True)]:
+            np.testing.assert_allclose(
+                indirect_methods.sor_sweep(sparse, b, x0.copy(), w=w, backward=backward),
+                indirect_methods.sor_sweep(a, b, x0.copy(), w=w, backward=backward),
+                err_msg="Sparse Test 1"
+            )
+        for method in [indirect_methods.jacobi_iteration, indirect_methods.gauss_seidel_iteration,
+                       indirect_methods.sor_iteration, indirect_methods.ssor_iteration]:
+            np.testing.assert_allclose(
+                method(sparse, b, x0=x0, iterations=5),
+                method(a, b, x0=x0, iterations=5),
+                err_msg="Sparse Test 2"
+            )
+        np.testing.assert_allclose(
+            indirect_methods.neumann_iteration(sparse / 8, b, iterations=5),
+            indirect_methods.neumann_iteration(a / 8, b, iterations=5),
+            err_msg="Sparse Test 3"
+        )
+        np.testing.assert_equal(
+            indirect_methods.is_diagonally_dominant(sparse),
+            indirect_methods.is_diagonally_dominant(a),
+            err_msg="Sparse Test 4"
+        )
+
+    # Poisson problem solved to convergence
+    m = 10
+    second = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    poisson = (scipy.sparse.kron(scipy.sparse.eye(m), second)
+               + scipy.sparse.kron(second, scipy.sparse.eye(m))).tocsr()
+    b = np.ones(m * m)
+    np.testing.assert_allclose(
+        poisson @ indirect_methods.sor_iteration(poisson, b, iterations=500, threshold=1e-12,
+                                                 w=1.5),
+        b,
+        err_msg="Sparse Test 5"
+    )
+    np.testing.assert_raises(ValueError, indirect_methods.jacobi_iteration,
+                             scipy.sparse.csr_matrix(np.array([[0, 1], [1, 2]])), np.ones(2))
+
+
+def conjugate_gradient_tests():
+    """
+    Tests preconditioned conjugate gradient function and preconditioners.
+    """
+    a = np.array([[4, 1], [1, 3]])
+    b = np.array([1, 2]).transpose()
+    result = indirect_methods.conjugate_gradient(a, b, threshold=1e-12)
+    np.testing.assert_allclose(result.x, np.array([1 / 11, 7 / 11]).transpose(),
+                               err_msg="CG Test 1")
+    np.testing.assert_equal((result.iterations, result.converged), (2, True),
+                            err_msg="CG Test 2")
+    np.testing.assert_equal(len(result.residuals), 3, err_msg="CG Test 3")
+
+    m = 12
+    second = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    poisson = (scipy.sparse.kron(scipy.sparse.eye(m), second)
+               + scipy.sparse.kron(second, scipy.sparse.eye(m))).tocsr()
+    b = np.random.default_rng(2).normal(size=m * m)
+    counts = {}
+    for preconditioner in [None, "jacobi", "ssor", "incomplete_cholesky"]:
+        for matrix in [poisson, poisson.toarray(), lambda x: poisson @ x]:
+            if callable(matrix) and preconditioner is not None:
+                continue
+            result = indirect_methods.conjugate_gradient(matrix, b, threshold=1e-10,
+                                                         preconditioner=preconditioner)
+            np.testing.assert_equal(result.converged, True, err_msg="CG Test 4")
+            np.testing.assert_allclose(poisson @ result.x, b, atol=1e-8, err_msg="CG Test 5")
+            np.testing.assert_allclose(result.residuals[-1],
+                                       np.linalg.norm(poisson @ result.x - b), rtol=1e-3,
+                                       atol=1e-12, err_msg="CG Test 6")
+        counts[preconditioner] = result.iterations
+    np.testing.assert_equal(counts["incomplete_cholesky"] < counts["ssor"] < counts[None], True,
+                            err_msg="CG Test 7")
+
+    # Incomplete Cholesky of a dense matrix is the exact Cholesky factor
+    c = np.random.default_rng(3).normal(size=(10, 10))
+    spd = c @ c.T + np.eye(10)
+    result = indirect_methods.conjugate_gradient(spd, b[:10], threshold=1e-12,
+                                                 preconditioner="incomplete_cholesky")
+    np.testing.assert_equal(result.iterations, 1, err_msg="CG Test 8")
+
+    # Custom preconditioner and iteration limit
+    result = indirect_methods.conjugate_gradient(
+        poisson, b, iterations=3, preconditioner=lambda r, out: np.multiply(r, 0.25, out=out))
+    np.testing.assert_equal((result.iterations, result.converged), (3, False),
+                            err_msg="CG Test 9")
+
+    np.testing.assert_raises(ValueError, indirect_methods.conjugate_gradient,
+                             np.array([[1, 2], [2, 1]]), np.array([1, -1]))
+    np.testing.assert_raises(ValueError, indirect_methods.conjugate_gradient, poisson, b,
+                             preconditioner="ilu")
+    np.testing.assert_raises(ValueError, indirect_methods.conjugate_gradient,
+                             lambda x: poisson @ x, b, preconditioner="jacobi")
+    np.testing.assert_raises(ValueError, indirect_methods.ssor_preconditioner, poisson, w=2)
+    np.testing.assert_raises(ValueError, indirect_methods.incomplete_cholesky_preconditioner,
+                             np.array([[1, 2], [2, 1]]))
 
 
 if __name__ == "__main__":
@@ -179,4 +347,12 @@ if __name__ == "__main__":
     print("Gauss Seidel Iteration Tests Passed")
     sor_iteration_tests()
     print("SOR Iteration Tests Passed")
+    sor_sweep_tests()
+    print("SOR Sweep Tests Passed")
+    ssor_iteration_tests()
+    print("SSOR Iteration Tests Passed")
+    sparse_matrix_tests()
+    print("Sparse Matrix Tests Passed")
+    conjugate_gradient_tests()
+    print("Conjugate Gradient Tests Passed")
     print("Tests passed")
@@ -0,0 +1,598 @@
+import numpy as np
+import scipy.sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+
+
+def to_csr(input_matrix) -> scipy.sparse.csr_matrix:
+    """
+    Given a dense array or a scipy sparse matrix, returns it as a float64 CSR matrix with
+    sorted column indices and no duplicate entries.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Matrix in canonical CSR form.
+
+    Raises
+    ------
+    ValueError
+        If the given matrix is not square.
+    """
+    matrix = scipy.sparse.csr_matrix(input_matrix, dtype=np.float64)
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Given matrix is not square")
+    matrix.sum_duplicates()
+    matrix.sort_indices()
+    return matrix
+
+
+def bandwidth(input_matrix) -> tuple:
+    """
+    Given a sparse or dense square matrix, returns its lower and upper bandwidths, the
+    distance of the farthest nonzero entry below and above the main diagonal.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix.
+
+    Returns
+    -------
+    tuple
+        Lower and upper bandwidths.
+    """
+    coo = scipy.sparse.coo_matrix(input_matrix)
+    offsets = coo.col[coo.data != 0].astype(np.int64) - coo.row[coo.data != 0]
+    return int(max(-np.min(offsets, initial=0), 0)), int(max(np.max(offsets, initial=0), 0))
+
+
+def _adjacency(matrix: scipy.sparse.csr_matrix) -> tuple:
+    """
+    Given a square CSR matrix, returns the CSR index arrays of the graph of A + A.T without
+    self loops, and the degree of each node.
+
+    Parameters
+    ----------
+    matrix : scipy.sparse.csr_matrix
+        Square matrix.
+
+    Returns
+    -------
+    tuple
+        Row pointer array, column index array, and degree array of the graph.
+    """
+    pattern = scipy.sparse.csr_matrix(
+        (np.ones(matrix.nnz, dtype=np.int8), matrix.indices, matrix.indptr), shape=matrix.shape)
+    graph = (pattern + pattern.T).tocsr()
+    graph.setdiag(0)
+    graph.eliminate_zeros()
+    graph.sort_indices()
+    return graph.indptr, graph.indices, np.diff(graph.indptr)
+
+
+def _neighbors(indptr: np.array, indices: np.array, nodes: np.array) -> tuple:
+    """
+    Given CSR graph index arrays and an array of nodes, returns every neighbor of those nodes
+    and, for each neighbor, the position in nodes of the node it was reached from.
+
+    Parameters
+    ----------
+    indptr : np.array
+        Row pointer array of the graph.
+    indices : np.array
+        Column index array of the graph.
+    nodes : np.array
+        Nodes to gather the neighbors of.
+
+    Returns
+    -------
+    tuple
+        Array of neighbors and array of parent positions.
+    """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    ends = np.cumsum(counts)
+    offsets = np.repeat(starts - ends + counts, counts) + np.arange(ends[-1] if ends.size else 0)
+    return indices[offsets], np.repeat(np.arange(nodes.size), counts)
+
+
+def _level_structure(indptr: np.array, indices: np.array, degree: np.array, roots: np.array,
+                     marks: np.array, search: int) -> tuple:
+    """
+    Given a graph and one root node in each of some of its connected components, returns the
+    breadth first level structures rooted there, all found together. The nodes of each level
+    are in Cuthill-McKee order: by the position of the node they were reached from, then by
+    increasing degree. Each level of every component is found with array operations on the
+    whole previous level at once, so the cost does not grow with the number of components.
+    Every node reached is stamped with the search number in marks, so a new search only needs
+    a new number instead of a cleared array.
+
+    Parameters
+    ----------
+    indptr : np.array
+        Row pointer array of the graph.
+    indices : np.array
+        Column index array of the graph.
+    degree : np.array
+        Degree of each node.
+    roots : np.array
+        Nodes to start from, at most one per connected component.
+    marks : np.array
+        Integer array holding, for each node, the number of the last search that reached it.
+        Updated in place.
+    search : int
+        Number of this search, different from every number already in marks.
+
+    Returns
+    -------
+    tuple
+        Array of the nodes reached, level by level, with the level of each node and the
+        position in roots of the root it was reached from.
+    """
+    marks[roots] = search
+    frontier = roots
+    owner = np.arange(roots.size)
+    nodes = []
+    levels = []
+    owners = []
+    depth = 0
+    while frontier.size:
+        nodes.append(frontier)
+        levels.append(np.full(frontier.size, depth))
+        owners.append(owner)
+        reached, parents = _neighbors(indptr, indices, frontier)
+        keep = marks[reached] != search
+        reached, parents = reached[keep], parents[keep]
+        order = np.lexsort((degree[reached], parents))
+        reached, parents = reached[order], parents[order]
+        # Keep the first time each node is reached
+        unique, first = np.unique(reached, return_index=True)
+        first = np.sort(first)
+        frontier, owner = reached[first], owner[parents[first]]
+        marks[frontier] = search
+        depth += 1
+    return np.concatenate(nodes), np.concatenate(levels), np.concatenate(owners)
+
+
+def rcm_ordering(input_matrix) -> np.array:
+    """
+    Given a sparse or dense square matrix, returns the reverse Cuthill-McKee ordering of its
+    rows and columns. Reordering a matrix as matrix[perm][:, perm] gathers its nonzero entries
+    near the diagonal, which shrinks its bandwidth and the fill produced by factoring it. Each
+    connected component starts from a pseudo-peripheral node found by repeated breadth first
+    searches, and the searches of all components run together, a whole level at a time, with
+    array operations.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix. The pattern of matrix + matrix.T is used.
+
+    Returns
+    -------
+    np.array
+        Permutation vector.
+    """
+    indptr, indices, degree = _adjacency(to_csr(input_matrix))
+    n = degree.size
+    isolated = np.flatnonzero(degree == 0)
+    graph = scipy.sparse.csr_matrix((np.ones(indices.size, dtype=np.int8), indices, indptr),
+                                    shape=(n, n))
+    count, labels = connected_components(graph, directed=False)
+    # Start each component from its node of least degree, taking components in that order
+    candidates = np.argsort(degree, kind="stable")
+    candidates = candidates[degree[candidates] > 0]
+    unique, first = np.unique(labels[candidates], return_index=True)
+    roots = candidates[np.sort(first)]
+    if roots.size == 0:
+        return isolated[::-1]
+
+    marks = np.zeros(n, dtype=np.int64)
+    search = 1
+    nodes, levels, owners = _level_structure(indptr, indices, degree, roots, marks, search)
+    depth = np.zeros(roots.size, dtype=np.int64)
+    np.maximum.at(depth, owners, levels)
+    # Move to a node of least degree in the last level until the depth stops growing, keeping
+    # the level structures of the components still moving
+    active = np.arange(roots.size)
+    while active.size:
+        last = levels == depth[owners]
+        ends, end_owners = nodes[last], owners[last]
+        order = np.lexsort((degree[ends], end_owners))
+        unique, first = np.unique(end_owners[order], return_index=True)
+        new_roots = ends[order[first]]
+        search += 1
+        nodes, levels, owners = _level_structure(indptr, indices, degree, new_roots, marks,
+                                                 search)
+        new_depth = np.zeros(new_roots.size, dtype=np.int64)
+        np.maximum.at(new_depth, owners, levels)
+        grew = new_depth > depth
+        roots[active[grew]] = new_roots[grew]
+        keep = grew[owners]
+        nodes, levels = nodes[keep], levels[keep]
+        owners = (np.cumsum(grew) - 1)[owners[keep]]
+        depth = new_depth[grew]
+        active = active[grew]
+
+    search += 1
+    nodes, levels, owners = _level_structure(indptr, indices, degree, roots, marks, search)
+    # Components one after another, each level by level
+    order = np.lexsort((np.arange(nodes.size), owners))
+    return np.concatenate([isolated, nodes[order]])[::-1]
+
+
+def minimum_degree_ordering(input_matrix) -> np.array:
+    """
+    Given a sparse or dense square matrix, returns a minimum degree ordering of its rows and
+    columns, which usually produces much less fill than reverse Cuthill-McKee for matrices
+    from two and three dimensional meshes. The elimination is carried out on the quotient
+    graph of the pattern of matrix + matrix.T, where each eliminated node becomes an element
+    standing for the clique it would create, so the graph never grows. As in approximate
+    minimum degree, degrees are bounded using the sizes of the elements rather than computed
+    exactly, elements inside the newest one are absorbed, and nodes with the same neighbors
+    are merged into supervariables that are eliminated together.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix.
+
+    Returns
+    -------
+    np.array
+        Permutation vector.
+    """
+    indptr, indices, degree = _adjacency(to_csr(input_matrix))
+    n = degree.size
+    # Variable neighbors and element neighbors of each supervariable, the variables of each
+    # element with their total weight, and the nodes merged into each supervariable
+    variables = [set(indices[indptr[i]:indptr[i + 1]].tolist()) for i in range(n)]
+    elements = [None] * n
+    members = {}
+    sizes = {}
+    weight = [1] * n
+    merged = {}
+    degree = degree.tolist()
+    buckets = {}
+    for i in range(n):
+        buckets.setdefault(degree[i], set()).add(i)
+    low = min(buckets, default=0)
+    perm = []
+    remaining = n
+    while remaining:
+        while not buckets.get(low):
+            low += 1
+        p = buckets[low].pop()
+        perm.append(p)
+        perm.extend(merged.pop(p, ()))
+        remaining -= weight[p]
+
+        # The new element holds every variable reachable from p, and absorbs p's elements
+        new = variables[p]
+        absorbed = elements[p] or set()
+        for e in absorbed:
+            new |= members.pop(e)
+            del sizes[e]
+        new.discard(p)
+        # Weight of each older element outside the new one, for the approximate degrees
+        outside = {}
+        for i in new:
+            buckets[degree[i]].discard(i)
+            # Edges inside the new element are now implied by it
+            own_variables = variables[i] - new
+            own_variables.discard(p)
+            variables[i] = own_variables
+            own = elements[i]
+            if own is None:
+                elements[i] = {p}
+                continue
+            own -= absorbed
+            for e in own:
+                outside[e] = outside.get(e, sizes[e]) - weight[i]
+            own.add(p)
+        for e, size in outside.items():
+            if size == 0:
+                # Every variable of e is in the new element, so it is absorbed as well
+                for i in members.pop(e):
+                    elements[i].discard(e)
+                del sizes[e]
+
+        # Merge variables with the same neighbors, found by hashing and then comparing
+        groups = {}
+        for i in list(new):
+            key = (sum(elements[i]), sum(variables[i]), len(elements[i]), len(variables[i]))
+            group = groups.setdefault(key, [])
+            for principal in group:
+                if elements[principal] == elements[i] and variables[principal] == variables[i]:
+                    weight[principal] += weight[i]
+                    nodes = merged.setdefault(principal, [])
+                    nodes.append(i)
+                    nodes.extend(merged.pop(i, ()))
+                    new.discard(i)
+                    for e in elements[i]:
+                        if e != p:
+                            members[e].discard(i)
+                    for v in variables[i]:
+                        variables[v].discard(i)
+                    break
+            else:
+                group.append(i)
+
+        members[p] = new
+        total = sum(weight[i] for i in new)
+        sizes[p] = total
+        for i in new:
+            d = total - weight[i]
+            for v in variables[i]:
+                d += weight[v]
+            for e in elements[i]:
+                if e != p:
+                    d += outside[e]
+            d = min(d, remaining - weight[i])
+            degree[i] = d
+            buckets.setdefault(d, set()).add(i)
+            low = min(low, d)
+        variables[p] = None
+        elements[p] = None
+    return np.array(perm, dtype=np.int64)
+
+
+class SymbolicAnalysis:
+    """
+    Ordering and sparsity pattern of a square sparse matrix, computed once and reused by
+    sparse_factor for every matrix with the same pattern. When only the values change,
+    refactoring skips the ordering and reorders the new values with one gather instead of
+    permuting and converting the matrix. SuperLU still redoes its own symbolic factorization,
+    the elimination tree and the fill, each time it factors, since it cannot reuse them.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix whose pattern is analysed.
+    ordering : str, default "minimum_degree"
+        Fill reducing ordering, one of "minimum_degree", "rcm" for reverse Cuthill-McKee, or
+        "natural". Defaults to "minimum_degree".
+
+    Attributes
+    ----------
+    shape : tuple
+        Shape of the matrix.
+    perm : np.array
+        Symmetric permutation applied before factoring.
+    symmetric : bool
+        If the pattern is structurally symmetric.
+    bandwidth : tuple
+        Lower and upper bandwidths of the reordered matrix.
+
+    Raises
+    ------
+    ValueError
+        If the matrix is not square or the ordering is not recognized.
+    """
+
+    def __init__(self, input_matrix, ordering: str = "minimum_degree"):
+        if ordering not in ("rcm", "minimum_degree", "natural"):
+            raise ValueError("Unknown ordering: " + str(ordering))
+        matrix = to_csr(input_matrix)
+        self.shape = matrix.shape
+        self.ordering = ordering
+        self._indptr = matrix.indptr.copy()
+        self._indices = matrix.indices.copy()
+        pattern = scipy.sparse.csr_matrix(
+            (np.ones(matrix.nnz, dtype=np.int8), matrix.indices, matrix.indptr), shape=self.shape)
+        self.symmetric = (pattern != pattern.T).nnz == 0
+        if ordering == "minimum_degree":
+            self.perm = minimum_degree_ordering(matrix)
+        elif ordering == "rcm":
+            self.perm = rcm_ordering(matrix)
+        else:
+            self.perm = np.arange(self.shape[0])
+
+        # Factor the reordered matrix in CSC form, reading its values through one gather
+        positions = scipy.sparse.csr_matrix(
+            (np.arange(1, matrix.nnz + 1, dtype=np.float64), matrix.indices, matrix.indptr),
+            shape=matrix.shape)
+        positions = positions[self.perm][:, self.perm].tocsc()
+        positions.sort_indices()
+        self._csc_indptr = positions.indptr
+        self._csc_indices = positions.indices
+        self._value_map = positions.data.astype(np.int64) - 1
+        self.bandwidth = bandwidth(positions)
+
+    def matches(self, matrix: scipy.sparse.csr_matrix) -> bool:
+        """
+        Given a matrix in canonical CSR form, returns if it has the analysed sparsity pattern.
+
+        Parameters
+        ----------
+        matrix : scipy.sparse.csr_matrix
+            Matrix from to_csr.
+
+        Returns
+        -------
+        bool
+            If the pattern matches.
+        """
+        return (matrix.shape == self.shape and np.array_equal(matrix.indptr, self._indptr)
+                and np.array_equal(matrix.indices, self._indices))
+
+    def reordered(self, matrix: scipy.sparse.csr_matrix) -> scipy.sparse.csc_matrix:
+        """
+        Given a matrix in canonical CSR form with the analysed pattern, returns it reordered by
+        perm in CSC form.
+
+        Parameters
+        ----------
+        matrix : scipy.sparse.csr_matrix
+            Matrix from to_csr.
+
+        Returns
+        -------
+        scipy.sparse.csc_matrix
+            Reordered matrix.
+
+        Raises
+        ------
+        ValueError
+            If the matrix does not have the analysed pattern.
+        """
+        if not self.matches(matrix):
+            raise ValueError("Matrix does not have the analysed sparsity pattern")
+        return scipy.sparse.csc_matrix(
+            (matrix.data[self._value_map], self._csc_indices, self._csc_indptr), shape=self.shape)
+
+
+def symbolic_analysis(input_matrix, ordering: str = "minimum_degree") -> SymbolicAnalysis:
+    """
+    Given a square sparse matrix, returns the symbolic analysis of its sparsity pattern to pass
+    to sparse_factor for it and any other matrix with the same pattern.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix whose pattern is analysed.
+    ordering : str, default "minimum_degree"
+        One of "minimum_degree", "rcm", or "natural". Defaults to "minimum_degree".
+
+    Returns
+    -------
+    SymbolicAnalysis
+        Analysis of the pattern.
+    """
+    return SymbolicAnalysis(input_matrix, ordering=ordering)
+
+
+class SparseFactorization:
+    """
+    Sparse LU factorization of a reordered square matrix, stored in compressed form so that
+    only the nonzero entries of the factors are kept.
+
+    Parameters
+    ----------
+    analysis : SymbolicAnalysis
+        Symbolic analysis of the matrix pattern.
+    lu : scipy.sparse.linalg.SuperLU
+        Numeric factors of the reordered matrix.
+
+    Attributes
+    ----------
+    analysis : SymbolicAnalysis
+        Symbolic analysis the factorization was made with.
+    nnz : int
+        Number of nonzero entries stored in the factors.
+    """
+
+    def __init__(self, analysis: SymbolicAnalysis, lu):
+        self.analysis = analysis
+        self._lu = lu
+        self.nnz = lu.L.nnz + lu.U.nnz
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Shape of the factored matrix.
+        """
+        return self.analysis.shape
+
+    def solve(self, b: np.array) -> np.array:
+        """
+        Given a vector of dependent values, returns the solution of the factored system. A
+        matrix of dependent values can be given instead to solve for every column at once.
+
+        Parameters
+        ----------
+        b : np.array
+            Vector of dependent values, or matrix with one right hand side per column.
+
+        Returns
+        -------
+        np.array
+            Solution vector for the system, or matrix with one solution per column.
+
+        Raises
+        ------
+        ValueError
+            If the matrix and the vector of dependent values have a different number of rows.
+        """
+        if self.shape[0] != b.shape[0]:
+            raise ValueError("Both inputs must have same number of rows")
+        b = np.asarray(b, dtype=np.float64)
+        perm = self.analysis.perm
+        sol = np.empty_like(b)
+        sol[perm] = self._lu.solve(b[perm])
+        return sol
+
+
+def sparse_factor(input_matrix, analysis: SymbolicAnalysis = None,
+                  ordering: str = "minimum_degree",
+                  pivot_threshold: float = 0.1) -> SparseFactorization:
+    """
+    Given a square sparse matrix, returns its sparse LU factorization. The matrix is reordered
+    by the symbolic analysis and then factored by SuperLU, which keeps the columns in the given
+    order and pivots on rows only when a diagonal entry is smaller than pivot_threshold times
+    the largest entry in its column. Structurally symmetric matrices prefer diagonal pivots so
+    the ordering is kept. Passing an analysis from an earlier call reuses its ordering and
+    value gather for a matrix with the same pattern and new values, while SuperLU still does
+    its symbolic and numerical factorization again.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix to factor.
+    analysis : SymbolicAnalysis, optional
+        Analysis of the matrix pattern. Defaults to a new analysis with the given ordering.
+    ordering : str, default "minimum_degree"
+        One of "minimum_degree", "rcm", or "natural", used when no analysis is given.
+        Defaults to "minimum_degree".
+    pivot_threshold : float, default 0.1
+        Threshold between 0, for no pivoting, and 1, for partial pivoting. Defaults to 0.1.
+
+    Returns
+    -------
+    SparseFactorization
+        Factorization of the matrix.
+
+    Raises
+    ------
+    ValueError
+        If the matrix is not square, if it does not match the analysis, or if it is singular.
+    """
+    matrix = to_csr(input_matrix)
+    if analysis is None:
+        analysis = SymbolicAnalysis(matrix, ordering=ordering)
+    reordered = analysis.reordered(matrix)
+    options = {"SymmetricMode": analysis.symmetric}
+    try:
+        lu = splu(reordered, permc_spec="NATURAL", diag_pivot_thresh=pivot_threshold,
+                  options=options)
+    except RuntimeError as error:
+        raise ValueError("Given matrix is singular") from error
+    return SparseFactorization(analysis, lu)
+
+
+def sparse_solve(input_matrix, b: np.array, ordering: str = "minimum_degree") -> np.array:
+    """
+    Given a square sparse matrix and a vector of dependent values, returns the solution of the
+    system using a sparse LU factorization.
+
+    Parameters
+    ----------
+    input_matrix : np.array or scipy.sparse matrix
+        Square matrix.
+    b : np.array
+        Vector of dependent values, or matrix with one right hand side per column.
+    ordering : str, default "minimum_degree"
+        One of "minimum_degree", "rcm", or "natural". Defaults to "minimum_degree".
+
+    Returns
+    -------
+    np.array
+        Solution vector for the system, or matrix with one solution per column.
+    """
+    return sparse_factor(input_matrix, ordering=ordering).solve(b)
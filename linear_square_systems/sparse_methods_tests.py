@@ -0,0 +1,161 @@
+import numpy as np
+import scipy.sparse
+import sparse_methods
+
+
+def poisson_matrix(m: int) -> scipy.sparse.csr_matrix:
+    """
+    Returns the five point finite difference Laplacian on an m by m grid.
+    """
+    second = scipy.sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    identity = scipy.sparse.eye(m)
+    return (scipy.sparse.kron(identity, second) + scipy.sparse.kron(second, identity)).tocsr()
+
+
+def test_bandwidth():
+    """
+    Tests bandwidth function.
+    """
+    a = np.array(
+        [[1, 2, 0, 0],
+         [3, 4, 5, 0],
+         [6, 7, 8, 9],
+         [0, 1, 2, 3]]
+    )
+    np.testing.assert_equal(sparse_methods.bandwidth(a), (2, 1), err_msg="Bandwidth test 1 Fail")
+    np.testing.assert_equal(sparse_methods.bandwidth(np.eye(3)), (0, 0),
+                            err_msg="Bandwidth test 2 Fail")
+    np.testing.assert_equal(sparse_methods.bandwidth(poisson_matrix(5)), (5, 5),
+                            err_msg="Bandwidth test 3 Fail")
+
+
+def test_rcm_ordering():
+    """
+    Tests reverse Cuthill-McKee ordering function.
+    """
+    # A path graph numbered out of order is put back in a line
+    a = scipy.sparse.csr_matrix(np.array(
+        [[1, 0, 0, 1, 0],
+         [0, 1, 0, 1, 1],
+         [0, 0, 1, 0, 1],
+         [1, 1, 0, 1, 0],
+         [0, 1, 1, 0, 1]]
+    ))
+    perm = sparse_methods.rcm_ordering(a)
+    np.testing.assert_equal(sparse_methods.bandwidth(a[perm][:, perm]), (1, 1),
+                            err_msg="RCM test 1 Fail")
+
+    # A shuffled grid gets back the bandwidth of the natural ordering
+    rng = np.random.default_rng(0)
+    a = poisson_matrix(20)
+    shuffle = rng.permutation(a.shape[0])
+    a = a[shuffle][:, shuffle]
+    perm = sparse_methods.rcm_ordering(a)
+    np.testing.assert_equal(np.sort(perm), np.arange(a.shape[0]), err_msg="RCM test 2 Fail")
+    np.testing.assert_equal(max(sparse_methods.bandwidth(a[perm][:, perm])) <= 20, True,
+                            err_msg="RCM test 3 Fail")
+
+    # Isolated nodes and several components
+    a = scipy.sparse.block_diag([poisson_matrix(2), scipy.sparse.eye(2), poisson_matrix(2)])
+    perm = sparse_methods.rcm_ordering(a)
+    np.testing.assert_equal(np.sort(perm), np.arange(10), err_msg="RCM test 4 Fail")
+    np.testing.assert_equal(set(perm[-2:]), {4, 5}, err_msg="RCM test 5 Fail")
+
+
+def test_minimum_degree_ordering():
+    """
+    Tests minimum degree ordering function.
+    """
+    # An arrowhead matrix factors without fill once its hub is put last
+    a = np.eye(10)
+    a[0, :] = 1
+    a[:, 0] = 1
+    perm = sparse_methods.minimum_degree_ordering(a)
+    np.testing.assert_equal(perm[-1], 0, err_msg="Minimum degree test 1 Fail")
+    np.testing.assert_equal(np.sort(perm), np.arange(10), err_msg="Minimum degree test 2 Fail")
+
+    # Unsymmetric pattern with isolated nodes
+    c = scipy.sparse.random(200, 200, density=0.01, random_state=4, format="csr")
+    perm = sparse_methods.minimum_degree_ordering(c)
+    np.testing.assert_equal(np.sort(perm), np.arange(200), err_msg="Minimum degree test 3 Fail")
+
+
+def test_sparse_factor():
+    """
+    Tests sparse LU factorization and solve functions.
+    """
+    a = np.array(
+        [[4, -1, 0, -1],
+         [-1, 4, -1, 0],
+         [0, -1, 4, -1],
+         [-1, 0, -1, 4]]
+    )
+    np.testing.assert_allclose(
+        sparse_methods.sparse_solve(a, np.array([2, 2, 2, 2])),
+        np.array([1, 1, 1, 1]),
+        err_msg="Sparse factor test 1 Fail"
+    )
+
+    rng = np.random.default_rng(1)
+    a = poisson_matrix(15)
+    n = a.shape[0]
+    b = rng.normal(size=(n, 2))
+    fills = {}
+    for ordering in ["minimum_degree", "rcm", "natural"]:
+        factorization = sparse_methods.sparse_factor(a, ordering=ordering)
+        fills[ordering] = factorization.nnz
+        np.testing.assert_allclose(a @ factorization.solve(b), b, atol=1e-10,
+                                   err_msg="Sparse factor test 2 Fail")
+    np.testing.assert_equal(fills["minimum_degree"] < fills["rcm"] < fills["natural"], True,
+                            err_msg="Sparse factor test 3 Fail")
+
+    # Unsymmetric values needing row pivots
+    c = scipy.sparse.random(50, 50, density=0.1, random_state=2, format="csr")
+    c = c + scipy.sparse.eye(50, k=1) + 1e-3 * scipy.sparse.eye(50)
+    b = rng.normal(size=50)
+    np.testing.assert_allclose(c @ sparse_methods.sparse_solve(c, b), b, atol=1e-8,
+                               err_msg="Sparse factor test 4 Fail")
+
+    np.testing.assert_raises(ValueError, sparse_methods.sparse_factor,
+                             scipy.sparse.csr_matrix((3, 3)))
+    np.testing.assert_raises(ValueError, sparse_methods.sparse_factor, np.ones((2, 3)))
+    np.testing.assert_raises(ValueError, sparse_methods.symbolic_analysis, a, ordering="best")
+
+
+def test_symbolic_analysis():
+    """
+    Tests reusing a symbolic analysis for matrices with the same pattern.
+    """
+    rng = np.random.default_rng(3)
+    a = poisson_matrix(10)
+    analysis = sparse_methods.symbolic_analysis(a, ordering="rcm")
+    np.testing.assert_equal(analysis.symmetric, True, err_msg="Symbolic analysis test 1 Fail")
+    np.testing.assert_equal(analysis.bandwidth, (10, 10), err_msg="Symbolic analysis test 2 Fail")
+
+    b = rng.normal(size=a.shape[0])
+    for k in range(3):
+        changed = a.copy()
+        changed.data = changed.data * (1 + rng.random(changed.nnz))
+        factorization = sparse_methods.sparse_factor(changed, analysis=analysis)
+        np.testing.assert_equal(factorization.analysis is analysis, True,
+                                err_msg="Symbolic analysis test 3 Fail")
+        np.testing.assert_allclose(changed @ factorization.solve(b), b, atol=1e-10,
+                                   err_msg="Symbolic analysis test 4 Fail")
+
+    # Test Error with a different pattern
+    np.testing.assert_raises(ValueError, sparse_methods.sparse_factor, poisson_matrix(10)
+                             + scipy.sparse.eye(100, k=3), analysis=analysis)
+
+
+if __name__ == "__main__":
+    test_bandwidth()
+    print("Bandwidth tests passed")
+    test_rcm_ordering()
+    print("RCM ordering tests passed")
+    test_minimum_degree_ordering()
+    print("Minimum degree ordering tests passed")
+    test_sparse_factor()
+    print("Sparse factor tests passed")
+    test_symbolic_analysis()
+    print("Symbolic analysis tests passed")
+    print("Tests Passed!")
@@ -0,0 +1,334 @@
+import numpy as np
+
+
+def default_step(x: np.array, method: str = "central", richardson: int = 0) -> np.array:
+    """
+    Given a point, a difference method, and a number of Richardson extrapolation levels, returns
+    a step size for each coordinate that balances truncation error against rounding error.
+    A method whose error shrinks like h^p uses steps of about eps^(1 / (p + 1)) times the size
+    of the coordinate. Each step is adjusted so that x + h is exactly representable.
+
+    Parameters
+    ----------
+    x : np.array
+        Point the derivative is taken at.
+    method : str, default "central"
+        Difference method, one of "forward", "backward", "central", or "hessian".
+        Defaults to "central".
+    richardson : int, default 0
+        Number of Richardson extrapolation levels. Defaults to 0.
+
+    Returns
+    -------
+    np.array
+        Step size for each coordinate.
+
+    Raises
+    ------
+    ValueError
+        If the method is not recognized.
+    """
+    if method in ("forward", "backward"):
+        order = richardson + 1
+    elif method == "central":
+        order = 2 * richardson + 2
+    elif method == "hessian":
+        order = 3
+    else:
+        raise ValueError("Unknown method: " + str(method))
+    x = np.asarray(x, dtype=float)
+    h = np.finfo(float).eps ** (1 / (order + 1)) * np.maximum(1, np.abs(x))
+    return (x + h) - x
+
+
+def _evaluate_stack(f: callable(np.array), points: np.array, vectorized: bool) -> np.array:
+    """
+    Given a function and a stack of points, returns the function values as a two dimensional
+    array with one row per point. A vectorized function is called once on the whole stack.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Scalar or vector valued function.
+    points : np.array
+        Array of points, one per row.
+    vectorized : bool
+        If f takes an array of points, one per row, and returns one value or vector per row.
+
+    Returns
+    -------
+    np.array
+        Function values, one row per point.
+
+    Raises
+    ------
+    ValueError
+        If a vectorized function does not return one value per point.
+    """
+    if vectorized:
+        values = np.asarray(f(points), dtype=float)
+        if values.ndim == 0 or values.shape[0] != points.shape[0]:
+            raise ValueError("A vectorized function must return one value per row of its input")
+    else:
+        values = np.array([f(point) for point in points], dtype=float)
+    return values.reshape(points.shape[0], -1)
+
+
+def _directional_differences(f: callable(np.array), x: np.array, perturbations: np.array,
+                             method: str, richardson: int, vectorized: bool) -> np.array:
+    """
+    Given a function, a point, and a stack of perturbation vectors, returns difference
+    estimates of the derivative of f at x along each perturbation, scaled by the perturbation
+    length. Every perturbed point for every Richardson level is built into one stacked array
+    and f is evaluated once on it.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Scalar or vector valued function.
+    x : np.array
+        Point the derivative is taken at.
+    perturbations : np.array
+        Array of perturbation vectors, one per row.
+    method : str
+        Difference method, one of "forward", "backward", or "central".
+    richardson : int
+        Number of Richardson extrapolation levels. Level k halves the perturbations k times.
+    vectorized : bool
+        If f takes an array of points, one per row.
+
+    Returns
+    -------
+    np.array
+        Array with one row per perturbation holding f'(x) applied to the perturbation.
+
+    Raises
+    ------
+    ValueError
+        If the method is not recognized.
+    """
+    if method not in ("forward", "backward", "central"):
+        raise ValueError("Unknown method: " + str(method))
+    p, n = perturbations.shape
+    scales = 0.5 ** np.arange(richardson + 1)
+    steps = (scales[:, np.newaxis, np.newaxis] * perturbations).reshape(-1, n)
+
+    if method == "central":
+        points = np.concatenate([x + steps, x - steps])
+    elif method == "forward":
+        points = np.concatenate([x[np.newaxis], x + steps])
+    else:
+        points = np.concatenate([x[np.newaxis], x - steps])
+    values = _evaluate_stack(f, points, vectorized)
+
+    if method == "central":
+        plus, minus = np.split(values, 2)
+        estimates = (plus - minus).reshape(richardson + 1, p, -1) / 2
+        ratio = 4
+    elif method == "forward":
+        estimates = (values[1:] - values[0]).reshape(richardson + 1, p, -1)
+        ratio = 2
+    else:
+        estimates = (values[0] - values[1:]).reshape(richardson + 1, p, -1)
+        ratio = 2
+    estimates /= scales[:, np.newaxis, np.newaxis]
+
+    # Richardson table, each pass removing the leading error term
+    for k in range(1, richardson + 1):
+        factor = ratio ** k
+        estimates = estimates[1:] + (estimates[1:] - estimates[:-1]) / (factor - 1)
+    return estimates[-1]
+
+
+def gradient(f: callable(np.array), x: np.array, h: float or np.array = None,
+             method: str = "central", richardson: int = 0, vectorized: bool = True) -> np.array:
+    """
+    Given a scalar valued function and a point, approximates the gradient of the function at
+    the point using finite differences. All perturbed points are stacked into one array so a
+    vectorized function is evaluated only once.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Scalar valued function. If vectorized, it takes an array of points, one per row, and
+        returns an array of values, for example lambda x: x[..., 0] ** 2 + x[..., 1].
+    x : np.array
+        Point to approximate the gradient at.
+    h : float or np.array, optional
+        Step size, or a step size for each coordinate. Defaults to default_step.
+    method : str, default "central"
+        Difference method, one of "forward", "backward", or "central". Defaults to "central".
+    richardson : int, default 0
+        Number of Richardson extrapolation levels, each halving the step and raising the order
+        of accuracy. Defaults to 0.
+    vectorized : bool, default True
+        If f takes an array of points, one per row. Defaults to True.
+
+    Returns
+    -------
+    np.array
+        Approximate gradient of f at x.
+    """
+    x = np.asarray(x, dtype=float)
+    if h is None:
+        h = default_step(x, method, richardson)
+    h = np.broadcast_to(np.asarray(h, dtype=float), x.shape)
+    estimates = _directional_differences(f, x, np.diagflat(h), method, richardson, vectorized)
+    return estimates[:, 0] / h
+
+
+def column_groups(sparsity: np.array) -> np.array:
+    """
+    Given the sparsity pattern of a Jacobian, greedily assigns the columns to groups so that no
+    two columns in a group share a nonzero row. All columns of a group can then be perturbed at
+    once, so the Jacobian needs one difference per group instead of one per column.
+
+    Parameters
+    ----------
+    sparsity : np.array
+        Boolean array of the same shape as the Jacobian, True where an entry may be nonzero.
+
+    Returns
+    -------
+    np.array
+        Group number of each column.
+    """
+    sparsity = np.asarray(sparsity, dtype=bool)
+    m, n = sparsity.shape
+    groups = np.empty(n, dtype=int)
+    occupied = np.zeros((0, m), dtype=bool)
+    for j in range(n):
+        free = np.flatnonzero(~np.any(occupied & sparsity[:, j], axis=1))
+        if free.size == 0:
+            occupied = np.vstack([occupied, np.zeros(m, dtype=bool)])
+            group = occupied.shape[0] - 1
+        else:
+            group = free[0]
+        occupied[group] |= sparsity[:, j]
+        groups[j] = group
+    return groups
+
+
+def band_sparsity(n: int, lower: int, upper: int) -> np.array:
+    """
+    Given a size and lower and upper bandwidths, returns the sparsity pattern of an n by n
+    banded matrix.
+
+    Parameters
+    ----------
+    n : int
+        Number of rows and columns.
+    lower : int
+        Number of nonzero diagonals below the main diagonal.
+    upper : int
+        Number of nonzero diagonals above the main diagonal.
+
+    Returns
+    -------
+    np.array
+        Boolean array, True inside the band.
+    """
+    offsets = np.arange(n)[np.newaxis, :] - np.arange(n)[:, np.newaxis]
+    return (-lower <= offsets) & (offsets <= upper)
+
+
+def jacobian(f: callable(np.array), x: np.array, h: float or np.array = None,
+             method: str = "central", richardson: int = 0, sparsity: np.array = None,
+             bandwidth: tuple = None, vectorized: bool = True) -> np.array:
+    """
+    Given a vector valued function and a point, approximates the Jacobian of the function at
+    the point using finite differences. All perturbed points are stacked into one array so a
+    vectorized function is evaluated only once. If the sparsity pattern or bandwidth of the
+    Jacobian is known, columns that share no nonzero rows are perturbed together, so a
+    tridiagonal Jacobian needs only 3 perturbation directions regardless of its size.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Vector valued function. If vectorized, it takes an array of points, one per row, and
+        returns an array of function values, one per row.
+    x : np.array
+        Point to approximate the Jacobian at.
+    h : float or np.array, optional
+        Step size, or a step size for each coordinate. Defaults to default_step.
+    method : str, default "central"
+        Difference method, one of "forward", "backward", or "central". Defaults to "central".
+    richardson : int, default 0
+        Number of Richardson extrapolation levels. Defaults to 0.
+    sparsity : np.array, optional
+        Boolean array, True where an entry of the Jacobian may be nonzero.
+    bandwidth : tuple, optional
+        Lower and upper bandwidth of a square banded Jacobian, used instead of sparsity.
+    vectorized : bool, default True
+        If f takes an array of points, one per row. Defaults to True.
+
+    Returns
+    -------
+    np.array
+        Approximate Jacobian of f at x with one row per output.
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    if h is None:
+        h = default_step(x, method, richardson)
+    h = np.broadcast_to(np.asarray(h, dtype=float), x.shape)
+    if bandwidth is not None:
+        sparsity = band_sparsity(n, bandwidth[0], bandwidth[1])
+    if sparsity is None:
+        return (_directional_differences(f, x, np.diagflat(h), method, richardson,
+                                         vectorized) / h[:, np.newaxis]).T
+
+    sparsity = np.asarray(sparsity, dtype=bool)
+    groups = column_groups(sparsity)
+    perturbations = np.zeros((groups.max() + 1, n))
+    perturbations[groups, np.arange(n)] = h
+    estimates = _directional_differences(f, x, perturbations, method, richardson, vectorized)
+    # Each column reads its entries from its group's difference in the rows it touches
+    return np.where(sparsity, estimates[groups].T / h, 0)
+
+
+def hessian(f: callable(np.array), x: np.array, h: float or np.array = None,
+            vectorized: bool = True) -> np.array:
+    """
+    Given a scalar valued function and a point, approximates the Hessian of the function at
+    the point using central second differences. The four perturbed points needed for every
+    entry on or above the diagonal are stacked into one array so a vectorized function is
+    evaluated only once.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Scalar valued function. If vectorized, it takes an array of points, one per row, and
+        returns an array of values.
+    x : np.array
+        Point to approximate the Hessian at.
+    h : float or np.array, optional
+        Step size, or a step size for each coordinate. Defaults to default_step.
+    vectorized : bool, default True
+        If f takes an array of points, one per row. Defaults to True.
+
+    Returns
+    -------
+    np.array
+        Approximate symmetric Hessian of f at x.
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    if h is None:
+        h = default_step(x, "hessian")
+    h = np.broadcast_to(np.asarray(h, dtype=float), x.shape)
+    rows, cols = np.triu_indices(n)
+    count = rows.size
+    step_i = np.zeros((count, n))
+    step_j = np.zeros((count, n))
+    step_i[np.arange(count), rows] = h[rows]
+    step_j[np.arange(count), cols] = h[cols]
+    points = np.concatenate([x + step_i + step_j, x + step_i - step_j,
+                             x - step_i + step_j, x - step_i - step_j])
+    values = _evaluate_stack(f, points, vectorized)[:, 0].reshape(4, count)
+
+    upper = (values[0] - values[1] - values[2] + values[3]) / (4 * h[rows] * h[cols])
+    result = np.empty((n, n))
+    result[rows, cols] = upper
+    result[cols, rows] = upper
+    return result
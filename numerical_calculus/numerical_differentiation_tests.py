@@ -0,0 +1,185 @@
+import numpy as np
+import numerical_differentiation
+
+
+def gradient_tests():
+    """
+    Tests finite difference gradient function.
+    """
+
+    def f(x): return np.sin(x[..., 0]) * np.exp(x[..., 1]) + x[..., 2] ** 3
+
+    x = np.array([0.3, -0.2, 1.1])
+    sol = np.array([np.cos(0.3) * np.exp(-0.2), np.sin(0.3) * np.exp(-0.2), 3 * 1.1 ** 2])
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(f, x),
+        sol,
+        rtol=1e-9,
+        err_msg="Gradient Test 1 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(f, x, method="forward"),
+        sol,
+        rtol=1e-6,
+        err_msg="Gradient Test 2 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(f, x, method="forward", richardson=2),
+        sol,
+        rtol=1e-10,
+        err_msg="Gradient Test 3 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(f, x, richardson=1),
+        sol,
+        rtol=1e-12,
+        err_msg="Gradient Test 4 Fail"
+    )
+
+    # f(x) = x^2 with h = 0.01 matches the scalar forward and backward approximations
+    def g(x): return x[..., 0] ** 2
+
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(g, np.array([3.0]), h=0.01, method="forward"),
+        np.array([6.01]),
+        err_msg="Gradient Test 5 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(g, np.array([3.0]), h=0.01, method="backward"),
+        np.array([5.99]),
+        err_msg="Gradient Test 6 Fail"
+    )
+
+    # A function of one point at a time
+    calls = []
+
+    def f_scalar(x):
+        calls.append(x)
+        return np.sin(x[0]) * np.exp(x[1]) + x[2] ** 3
+
+    np.testing.assert_allclose(
+        numerical_differentiation.gradient(f_scalar, x, vectorized=False),
+        sol,
+        rtol=1e-9,
+        err_msg="Gradient Test 7 Fail"
+    )
+    np.testing.assert_equal(len(calls), 6, err_msg="Gradient Test 8 Fail")
+    np.testing.assert_raises(ValueError, numerical_differentiation.gradient, f_scalar, x)
+    np.testing.assert_raises(ValueError, numerical_differentiation.gradient, f, x,
+                             method="sideways")
+
+
+def jacobian_tests():
+    """
+    Tests finite difference Jacobian function.
+    """
+    calls = []
+
+    def f(x):
+        calls.append(x.shape[0])
+        out = 2 * x ** 2
+        out[:, 1:] -= x[:, :-1]
+        out[:, :-1] -= np.sin(x[:, 1:])
+        return out
+
+    n = 40
+    x = np.linspace(0, 1, n)
+    sol = np.diag(4 * x) + np.diag(-np.ones(n - 1), -1) + np.diag(-np.cos(x[1:]), 1)
+    np.testing.assert_allclose(
+        numerical_differentiation.jacobian(f, x),
+        sol,
+        atol=1e-9,
+        err_msg="Jacobian Test 1 Fail"
+    )
+    np.testing.assert_equal(calls, [2 * n], err_msg="Jacobian Test 2 Fail")
+
+    # A tridiagonal Jacobian needs only three perturbation directions
+    calls.clear()
+    np.testing.assert_allclose(
+        numerical_differentiation.jacobian(f, x, bandwidth=(1, 1)),
+        sol,
+        atol=1e-9,
+        err_msg="Jacobian Test 3 Fail"
+    )
+    np.testing.assert_equal(calls, [6], err_msg="Jacobian Test 4 Fail")
+    np.testing.assert_allclose(
+        numerical_differentiation.jacobian(f, x, sparsity=sol != 0, richardson=1),
+        sol,
+        atol=1e-11,
+        err_msg="Jacobian Test 5 Fail"
+    )
+
+    # Non-square Jacobian
+    def g(x): return np.stack([x[:, 0] * x[:, 1], x[:, 0] + x[:, 1], x[:, 1] ** 2], axis=1)
+
+    np.testing.assert_allclose(
+        numerical_differentiation.jacobian(g, np.array([2.0, 3.0])),
+        np.array([[3, 2], [1, 1], [0, 6]]),
+        atol=1e-9,
+        err_msg="Jacobian Test 6 Fail"
+    )
+
+
+def column_groups_tests():
+    """
+    Tests Jacobian column grouping function.
+    """
+    np.testing.assert_equal(
+        numerical_differentiation.column_groups(numerical_differentiation.band_sparsity(7, 1, 1)),
+        np.array([0, 1, 2, 0, 1, 2, 0]),
+        err_msg="Column Groups Test 1 Fail"
+    )
+    np.testing.assert_equal(
+        numerical_differentiation.column_groups(np.eye(4)),
+        np.zeros(4),
+        err_msg="Column Groups Test 2 Fail"
+    )
+    np.testing.assert_equal(
+        numerical_differentiation.column_groups(np.ones((3, 3))),
+        np.array([0, 1, 2]),
+        err_msg="Column Groups Test 3 Fail"
+    )
+
+
+def hessian_tests():
+    """
+    Tests finite difference Hessian function.
+    """
+
+    def f(x): return np.sin(x[..., 0]) * np.exp(x[..., 1]) + x[..., 2] ** 3
+
+    x = np.array([0.3, -0.2, 1.1])
+    a = np.sin(0.3) * np.exp(-0.2)
+    b = np.cos(0.3) * np.exp(-0.2)
+    sol = np.array(
+        [[-a, b, 0],
+         [b, a, 0],
+         [0, 0, 6.6]]
+    )
+    np.testing.assert_allclose(
+        numerical_differentiation.hessian(f, x),
+        sol,
+        atol=1e-7,
+        err_msg="Hessian Test 1 Fail"
+    )
+
+    def g(x): return x[..., 0] ** 2 + 3 * x[..., 0] * x[..., 1]
+
+    np.testing.assert_allclose(
+        numerical_differentiation.hessian(g, np.array([1.0, 2.0]), h=0.1),
+        np.array([[2, 3], [3, 0]]),
+        atol=1e-10,
+        err_msg="Hessian Test 2 Fail"
+    )
+
+
+if __name__ == "__main__":
+    gradient_tests()
+    print("Gradient Tests Passed")
+    jacobian_tests()
+    print("Jacobian Tests Passed")
+    column_groups_tests()
+    print("Column Groups Tests Passed")
+    hessian_tests()
+    print("Hessian Tests Passed")
+    print("Tests Passed")
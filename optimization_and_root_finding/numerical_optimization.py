@@ -1,4 +1,70 @@
+import os
+import queue
+import threading
+import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import NamedTuple
 import numpy as np
+from scipy.stats import qmc
+
+
+class OptimizeResult(NamedTuple):
+    """
+    Result of a multidimensional minimization.
+
+    Attributes
+    ----------
+    x : np.array
+        Approximate input coordinates where f is at a minimum.
+    fun : float
+        Function value at x, or None if the function was never evaluated.
+    iterations : int
+        Number of iterations performed.
+    f_evals : int
+        Number of function evaluations.
+    df_evals : int
+        Number of gradient evaluations.
+    converged : bool
+        If a stopping threshold was reached before the iteration limit.
+    """
+    x: np.array
+    fun: float
+    iterations: int
+    f_evals: int
+    df_evals: int
+    converged: bool
+
+
+class MultiStartResult(NamedTuple):
+    """
+    Result of a multi-start minimization.
+
+    Attributes
+    ----------
+    x : np.array
+        Best minimum found, taken from the converged runs if there are any.
+    fun : float
+        Function value at x.
+    table : np.array
+        Structured array with fields x, fun, hits (number of starts that converged to the
+        minimum), f_evals (function evaluations spent by those starts), and converged. The
+        distinct minima of the converged runs come first, sorted by function value, followed
+        by the end points of runs that stopped before converging, also sorted by function
+        value. Runs that did not converge are never merged and never eliminate starts.
+    f_evals : int
+        Total number of function evaluations across all starts.
+    runs : int
+        Number of starts that were run.
+    skipped : int
+        Number of starts eliminated because they fell in the basin of a minimum already found
+        or because the evaluation budget ran out.
+    """
+    x: np.array
+    fun: float
+    table: np.array
+    f_evals: int
+    runs: int
+    skipped: int
 
 
 def three_point_search(f: callable(float), a: float, b: float,
@@ -58,7 +124,8 @@ def successive_parabolic_interpolation(f: callable(float), samples: np.array,
     of the minimum value of the function using the successive parabolic interpolation search.
     This is assuming the function is continuous over the interval of the given points,
     the function is unimodal, and there is a minimum to solve for. This method
-    often has issues however, and may fail. The search will iterate until
+    often has issues however, and may fail. See brent_minimize for a safeguarded
+    alternative that always keeps the minimum bracketed. The search will iterate until
     successive approximations of x are less than 1e-5 or until 30 iterations are reached. These
     stopping criteria values can be specified by the user.
 
@@ -94,8 +161,391 @@ def successive_parabolic_interpolation(f: callable(float), samples: np.array,
     return float((max(samples) + min(samples)) / 2)
 
 
+def brent_minimize(f: callable(float), a: float, b: float,
+                   threshold: float = 1e-5, iterations: int = 100) -> float:
+    """
+    Given a function, a minimum x value, and a maximum x value, returns the approximate x value
+    of the minimum value of the function using Brent's method. Parabolic interpolation steps
+    through the three best points found so far are taken when they are acceptable, and a golden
+    section step is taken otherwise, so the minimum always stays bracketed by [a, b]. Only one
+    new function evaluation is made per iteration. This is assuming the function is continuous
+    over the given interval and is unimodal. The search will iterate until the bracket around
+    the minimum is smaller than about 1e-5 or until 100 iterations are reached. These stopping
+    criteria values can be specified by the user.
+
+    Parameters
+    ----------
+    f : callable(float)
+        Function to find x coordinate of minimum value.
+    a : float
+        Lower x bound of interval to find minimum.
+    b : float
+        Upper x bound of interval to find minimum.
+    threshold : float, default 1e-5
+        Absolute tolerance on the location of the minimum. Defaults to 1e-5.
+    iterations : int, default 100
+        Number of iterations until algorythm stops iterating. Defaults to 100.
+
+    Returns
+    -------
+    float
+        Approximate x coordinate where f is at a minimum.
+
+    Raises
+    ------
+    ValueError
+        If the lower bound is not less than the upper bound.
+    """
+    if a >= b:
+        raise ValueError("Lower bound must be less than upper bound")
+    golden = (3 - np.sqrt(5)) / 2
+    rel_tol = np.sqrt(np.finfo(float).eps)
+
+    # x is the best point so far, w the second best, and v the previous value of w
+    x = w = v = a + golden * (b - a)
+    f_x = f_w = f_v = f(x)
+    step = 0.0
+    prev_step = 0.0
+    for iteration in range(iterations):
+        mid = (a + b) / 2
+        # The search stops once x is within tol_2 of both ends of the bracket
+        tol_1 = rel_tol * abs(x) + threshold / 2
+        tol_2 = 2 * tol_1
+        if abs(x - mid) <= tol_2 - (b - a) / 2:
+            break
+
+        use_golden = True
+        if abs(prev_step) > tol_1:
+            # Fit a parabola through x, w, and v
+            r = (x - w) * (f_x - f_v)
+            q = (x - v) * (f_x - f_w)
+            p = (x - v) * q - (x - w) * r
+            q = 2 * (q - r)
+            if q > 0:
+                p = -p
+            q = abs(q)
+            older_step = prev_step
+            prev_step = step
+            # Only accept the parabolic step if it falls inside the bracket and is
+            # less than half of the step before last
+            if abs(p) < abs(q * older_step / 2) and q * (a - x) < p < q * (b - x):
+                step = p / q
+                u = x + step
+                if u - a < tol_2 or b - u < tol_2:
+                    step = np.copysign(tol_1, mid - x)
+                use_golden = False
+        if use_golden:
+            prev_step = a - x if x >= mid else b - x
+            step = golden * prev_step
+
+        u = x + step if abs(step) >= tol_1 else x + np.copysign(tol_1, step)
+        f_u = f(u)
+        if f_u <= f_x:
+            if u >= x:
+                a = x
+            else:
+                b = x
+            v, w, x = w, x, u
+            f_v, f_w, f_x = f_w, f_x, f_u
+        else:
+            if u < x:
+                a = u
+            else:
+                b = u
+            if f_u <= f_w or w == x:
+                v, w = w, u
+                f_v, f_w = f_w, f_u
+            elif f_u <= f_v or v == x or v == w:
+                v = u
+                f_v = f_u
+    return float(x)
+
+
+def _plain_step(step: np.array, gradient: np.array, state: dict, learning_rate: float) -> None:
+    """
+    Writes the plain gradient descent step into the given step array.
+
+    Parameters
+    ----------
+    step : np.array
+        Array to write the step into.
+    gradient : np.array
+        Gradient at the current point.
+    state : dict
+        Optimizer state. Unused by this rule.
+    learning_rate : float
+        Learning rate for the step.
+    """
+    np.multiply(gradient, -learning_rate, out=step)
+
+
+def _momentum_step(step: np.array, gradient: np.array, state: dict, learning_rate: float) -> None:
+    """
+    Writes the heavy ball momentum step into the given step array. The velocity is stored in
+    the optimizer state and updated in place.
+
+    Parameters
+    ----------
+    step : np.array
+        Array to write the step into.
+    gradient : np.array
+        Gradient at the current point.
+    state : dict
+        Optimizer state holding the momentum coefficient beta_1 and the velocity.
+    learning_rate : float
+        Learning rate for the step.
+    """
+    if "velocity" not in state:
+        state["velocity"] = np.zeros_like(step)
+    velocity = state["velocity"]
+    velocity *= state["beta_1"]
+    np.multiply(gradient, learning_rate, out=step)
+    velocity -= step
+    np.copyto(step, velocity)
+
+
+def _nesterov_step(step: np.array, gradient: np.array, state: dict, learning_rate: float) -> None:
+    """
+    Writes the Nesterov accelerated gradient step into the given step array. The look ahead
+    gradient is avoided by tracking the shifted iterate, so the gradient at the current point
+    is all that is needed. The velocity is stored in the optimizer state and updated in place.
+
+    Parameters
+    ----------
+    step : np.array
+        Array to write the step into.
+    gradient : np.array
+        Gradient at the current point.
+    state : dict
+        Optimizer state holding the momentum coefficient beta_1, the velocity, and a scratch
+        array.
+    learning_rate : float
+        Learning rate for the step.
+    """
+    if "velocity" not in state:
+        state["velocity"] = np.zeros_like(step)
+        state["scratch"] = np.empty_like(step)
+    velocity = state["velocity"]
+    scratch = state["scratch"]
+    mu = state["beta_1"]
+    velocity *= mu
+    np.multiply(gradient, learning_rate, out=step)
+    velocity -= step
+    # The shifted iterate moves by mu * v_new - lr * g
+    np.multiply(velocity, mu, out=scratch)
+    np.subtract(scratch, step, out=step)
+
+
+def _rmsprop_step(step: np.array, gradient: np.array, state: dict, learning_rate: float) -> None:
+    """
+    Writes the RMSProp step into the given step array. The running average of the squared
+    gradient is stored in the optimizer state and updated in place.
+
+    Parameters
+    ----------
+    step : np.array
+        Array to write the step into.
+    gradient : np.array
+        Gradient at the current point.
+    state : dict
+        Optimizer state holding the decay rate beta_2, epsilon, and the second moment.
+    learning_rate : float
+        Learning rate for the step.
+    """
+    if "second_moment" not in state:
+        state["second_moment"] = np.zeros_like(step)
+    second_moment = state["second_moment"]
+    beta_2 = state["beta_2"]
+    np.multiply(gradient, gradient, out=step)
+    step *= 1 - beta_2
+    second_moment *= beta_2
+    second_moment += step
+    np.sqrt(second_moment, out=step)
+    step += state["epsilon"]
+    np.divide(gradient, step, out=step)
+    step *= -learning_rate
+
+
+def _adam_step(step: np.array, gradient: np.array, state: dict, learning_rate: float) -> None:
+    """
+    Writes the Adam step into the given step array. The bias corrected first and second
+    moments of the gradient are stored in the optimizer state and updated in place.
+
+    Parameters
+    ----------
+    step : np.array
+        Array to write the step into.
+    gradient : np.array
+        Gradient at the current point.
+    state : dict
+        Optimizer state holding beta_1, beta_2, epsilon, the iteration count, and the moments.
+    learning_rate : float
+        Learning rate for the step.
+    """
+    if "first_moment" not in state:
+        state["first_moment"] = np.zeros_like(step)
+        state["second_moment"] = np.zeros_like(step)
+    first_moment = state["first_moment"]
+    second_moment = state["second_moment"]
+    beta_1 = state["beta_1"]
+    beta_2 = state["beta_2"]
+    t = state["iteration"] + 1
+
+    np.multiply(gradient, gradient, out=step)
+    step *= 1 - beta_2
+    second_moment *= beta_2
+    second_moment += step
+    np.multiply(gradient, 1 - beta_1, out=step)
+    first_moment *= beta_1
+    first_moment += step
+
+    np.sqrt(second_moment, out=step)
+    step /= np.sqrt(1 - beta_2 ** t)
+    step += state["epsilon"]
+    np.divide(first_moment, step, out=step)
+    step *= -learning_rate / (1 - beta_1 ** t)
+
+
+_STEP_RULES = {
+    "plain": _plain_step,
+    "momentum": _momentum_step,
+    "nesterov": _nesterov_step,
+    "rmsprop": _rmsprop_step,
+    "adam": _adam_step,
+}
+
+
+def _armijo_backtracking(f: callable(np.array), x: np.array, f_x: float, gradient: np.array,
+                         step: np.array, trial: np.array, c_1: float = 1e-4,
+                         shrink: float = 0.5, max_halvings: int = 30) -> float:
+    """
+    Given a function, the current point, its function value and gradient, and a search
+    direction, backtracks along the direction until the Armijo sufficient decrease condition
+    holds and returns the accepted step length.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function being minimized.
+    x : np.array
+        Current point.
+    f_x : float
+        Function value at the current point.
+    gradient : np.array
+        Gradient at the current point.
+    step : np.array
+        Search direction, tried first with a step length of 1.
+    trial : np.array
+        Preallocated array the trial points are written into.
+    c_1 : float, default 1e-4
+        Sufficient decrease constant. Defaults to 1e-4.
+    shrink : float, default 0.5
+        Factor the step length is multiplied by after each rejected trial. Defaults to 0.5.
+    max_halvings : int, default 30
+        Maximum number of rejected trials before giving up. Defaults to 30.
+
+    Returns
+    -------
+    float
+        Accepted step length, or 0 if no decrease was found.
+    """
+    slope = np.dot(gradient.ravel(), step.ravel())
+    alpha = 1.0
+    for i in range(max_halvings):
+        np.multiply(step, alpha, out=trial)
+        trial += x
+        if f(trial) <= f_x + c_1 * alpha * slope:
+            return alpha
+        alpha *= shrink
+    return 0.0
+
+
+def _wolfe_bisection(f: callable(np.array), df: callable(np.array), x: np.array, f_x: float,
+                     gradient: np.array, step: np.array, trial: np.array, c_1: float = 1e-4,
+                     c_2: float = 0.9, max_trials: int = 30) -> float:
+    """
+    Given a function, its gradient, the current point, its function value and gradient, and a
+    search direction, finds a step length satisfying the weak Wolfe conditions by bracketing
+    and bisection and returns it.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function being minimized.
+    df : callable(np.array)
+        Gradient of the function being minimized.
+    x : np.array
+        Current point.
+    f_x : float
+        Function value at the current point.
+    gradient : np.array
+        Gradient at the current point.
+    step : np.array
+        Search direction, tried first with a step length of 1.
+    trial : np.array
+        Preallocated array the trial points are written into.
+    c_1 : float, default 1e-4
+        Sufficient decrease constant. Defaults to 1e-4.
+    c_2 : float, default 0.9
+        Curvature constant. Defaults to 0.9.
+    max_trials : int, default 30
+        Maximum number of trial step lengths. Defaults to 30.
+
+    Returns
+    -------
+    float
+        Accepted step length, or the last trial if the conditions could not be met.
+    """
+    slope = np.dot(gradient.ravel(), step.ravel())
+    low = 0.0
+    high = np.inf
+    alpha = 1.0
+    for i in range(max_trials):
+        np.multiply(step, alpha, out=trial)
+        trial += x
+        if f(trial) > f_x + c_1 * alpha * slope:
+            high = alpha
+        elif np.dot(np.ravel(df(trial)), step.ravel()) < c_2 * slope:
+            low = alpha
+        else:
+            return alpha
+        alpha = 2 * low if high == np.inf else (low + high) / 2
+    return alpha
+
+
+def _restart_step(step: np.array, gradient: np.array, state: dict,
+                  learning_rate: float) -> None:
+    """
+    Writes the steepest descent step into step in place and forgets the momentum and moment
+    estimates of the update rule, so the next update starts over from this step.
+
+    Parameters
+    ----------
+    step : np.array
+        Array the step is written into.
+    gradient : np.array
+        Gradient at the current point.
+    state : dict
+        Optimizer state of the update rule.
+    learning_rate : float
+        Learning rate the gradient is scaled by.
+    """
+    np.multiply(gradient, -learning_rate, out=step)
+    if "velocity" in state:
+        np.copyto(state["velocity"], step)
+    if "first_moment" in state:
+        state["first_moment"].fill(0)
+        state["second_moment"].fill(0)
+        # Counted back up to 0 after the step, so the next update is bias corrected as the
+        # first one
+        state["iteration"] = -1
+
+
 def gradient_descent(df: callable(np.array), x_0: np.array,
-                     learning_rate: float, threshold: float = 1e-5, iterations: int = 30) -> float:
+                     learning_rate: float, threshold: float = 1e-5, iterations: int = 30,
+                     method: str or callable = "plain", f: callable(np.array) = None,
+                     line_search: str = None, beta_1: float = 0.9, beta_2: float = 0.999,
+                     epsilon: float = 1e-8) -> np.array:
     """
     Given the gradient of a function, a starting point, and a learning rate,
     returns the approximate point of the minimum value of the function using
@@ -103,6 +553,14 @@ def gradient_descent(df: callable(np.array), x_0: np.array,
     successive approximations of x are less than 1e-5 or until 30 iterations are reached.
     These stopping criteria values can be specified by the user.
 
+    The update rule can be plain steps, heavy ball momentum, Nesterov momentum, RMSProp,
+    or Adam, and the steps can be scaled by an Armijo or Wolfe line search when the function
+    itself is given. All optimizer state is allocated once and updated in place, so no new
+    arrays the size of x are created per iteration by the optimizer itself. When the Armijo
+    search finds no decrease along the step of the update rule, it falls back to the steepest
+    descent step, and if there is no decrease along that either the search stops with a
+    RuntimeWarning.
+
     Parameters
     ----------
     df : callable(np.array)
@@ -116,18 +574,1284 @@ def gradient_descent(df: callable(np.array), x_0: np.array,
         Defaults to 1e-5
     iterations : int, default 30
         Number of iterations until algorythm stops iterating. Defaults to 30.
+    method : str or callable, default "plain"
+        Update rule, one of "plain", "momentum", "nesterov", "rmsprop", or "adam". A callable
+        with the signature rule(step, gradient, state, learning_rate) that writes the step into
+        step in place can also be given. Defaults to "plain".
+    f : callable(np.array), optional
+        Function to minimize. Only needed for line searches.
+    line_search : str, optional
+        Line search used to scale each step, either "armijo" or "wolfe". Defaults to no line
+        search, in which case the step from the update rule is taken as is.
+    beta_1 : float, default 0.9
+        Momentum coefficient for momentum, Nesterov, and Adam. Defaults to 0.9.
+    beta_2 : float, default 0.999
+        Decay rate of the squared gradient average for RMSProp and Adam. Defaults to 0.999.
+    epsilon : float, default 1e-8
+        Small constant preventing division by zero in RMSProp and Adam. Defaults to 1e-8.
 
     Returns
     -------
-    float
+    np.array
         Approximate input coordinates where f is at a minimum.
+
+    Raises
+    ------
+    ValueError
+        If the method or line search is not recognized, or if a line search is requested
+        without the function.
     """
-    x_1 = x_0 - np.multiply(learning_rate, df(x_0))
-    iteration = 1
-    dist = np.linalg.norm(x_1 - x_0)
+    if callable(method):
+        rule = method
+    elif method in _STEP_RULES:
+        rule = _STEP_RULES[method]
+    else:
+        raise ValueError("Unknown method: " + str(method))
+    if line_search not in (None, "armijo", "wolfe"):
+        raise ValueError("Unknown line search: " + str(line_search))
+    if line_search is not None and f is None:
+        raise ValueError("A line search needs the function to minimize")
+
+    x = np.array(x_0, dtype=float)
+    step = np.empty_like(x)
+    trial = np.empty_like(x) if line_search is not None else None
+    state = {"iteration": 0, "beta_1": beta_1, "beta_2": beta_2, "epsilon": epsilon}
+
+    iteration = 0
+    dist = np.inf
     while iteration < iterations and threshold < dist:
-        x_0 = x_1
-        x_1 = x_0 - np.multiply(learning_rate, df(x_0))
+        gradient = np.asarray(df(x), dtype=float)
+        rule(step, gradient, state, learning_rate)
+        if line_search is not None:
+            restarted = rule is _plain_step
+            if np.dot(gradient.ravel(), step.ravel()) >= 0:
+                # Accumulated momentum is not a descent direction so restart from the gradient
+                # and forget the memory that produced it
+                _restart_step(step, gradient, state, learning_rate)
+                restarted = True
+            f_x = f(x)
+            if line_search == "armijo":
+                alpha = _armijo_backtracking(f, x, f_x, gradient, step, trial)
+                if alpha == 0 and not restarted:
+                    _restart_step(step, gradient, state, learning_rate)
+                    alpha = _armijo_backtracking(f, x, f_x, gradient, step, trial)
+                if alpha == 0:
+                    warnings.warn("Armijo line search found no decrease along the gradient, "
+                                  "stopping before convergence", RuntimeWarning)
+                    break
+            else:
+                alpha = _wolfe_bisection(f, df, x, f_x, gradient, step, trial)
+            step *= alpha
+            if "velocity" in state:
+                # Keep the momentum equal to the step actually taken
+                state["velocity"] *= alpha
+        x += step
+        state["iteration"] += 1
         iteration += 1
-        dist = np.linalg.norm(x_1 - x_0)
-    return x_1
+        dist = np.linalg.norm(step)
+    return x
+
+
+def memmap_batches(paths: str or list[str], batch_size: int) -> iter:
+    """
+    Given one or more .npy files and a batch size, yields consecutive batches of rows from the
+    files without loading them into memory. Each file is memory mapped and only the rows of
+    the current batch are read from disk when the batch is used.
+
+    Parameters
+    ----------
+    paths : str or list[str]
+        Path or list of paths to .npy files whose first axis indexes the records.
+    batch_size : int
+        Number of records in each batch. The last batch of each file may be smaller.
+
+    Returns
+    -------
+    iter
+        Iterator over batches of records.
+
+    Raises
+    ------
+    ValueError
+        If the batch size is not positive.
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    if isinstance(paths, str):
+        paths = [paths]
+    for path in paths:
+        data = np.load(path, mmap_mode="r")
+        for start in range(0, data.shape[0], batch_size):
+            yield data[start:start + batch_size]
+
+
+def step_decay_schedule(learning_rate: float, factor: float, every: int) -> callable(int):
+    """
+    Given an initial learning rate, a decay factor, and a number of steps, returns a schedule
+    that multiplies the learning rate by the factor after every given number of steps.
+
+    Parameters
+    ----------
+    learning_rate : float
+        Initial learning rate.
+    factor : float
+        Factor the learning rate is multiplied by at each drop.
+    every : int
+        Number of steps between drops.
+
+    Returns
+    -------
+    callable(int)
+        Function of the step number returning the learning rate.
+    """
+    return lambda step: learning_rate * factor ** (step // every)
+
+
+def exponential_decay_schedule(learning_rate: float, decay: float) -> callable(int):
+    """
+    Given an initial learning rate and a decay rate, returns a schedule where the learning
+    rate at step k is learning_rate * exp(-decay * k).
+
+    Parameters
+    ----------
+    learning_rate : float
+        Initial learning rate.
+    decay : float
+        Decay rate per step.
+
+    Returns
+    -------
+    callable(int)
+        Function of the step number returning the learning rate.
+    """
+    return lambda step: learning_rate * np.exp(-decay * step)
+
+
+def inverse_time_schedule(learning_rate: float, decay: float) -> callable(int):
+    """
+    Given an initial learning rate and a decay rate, returns a schedule where the learning
+    rate at step k is learning_rate / (1 + decay * k).
+
+    Parameters
+    ----------
+    learning_rate : float
+        Initial learning rate.
+    decay : float
+        Decay rate per step.
+
+    Returns
+    -------
+    callable(int)
+        Function of the step number returning the learning rate.
+    """
+    return lambda step: learning_rate / (1 + decay * step)
+
+
+def _prefetch(batches: iter, depth: int) -> iter:
+    """
+    Given an iterator of batches, yields the same batches while a background thread reads
+    up to depth batches ahead. Memory mapped batches are copied into memory on the background
+    thread so that disk reads overlap with the gradient computations.
+
+    Parameters
+    ----------
+    batches : iter
+        Iterator over batches.
+    depth : int
+        Maximum number of batches read ahead.
+
+    Returns
+    -------
+    iter
+        Iterator over the same batches.
+    """
+    done = object()
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for batch in batches:
+                if isinstance(batch, np.memmap):
+                    batch = np.array(batch)
+                if not put(batch):
+                    return
+            put(done)
+        except BaseException as error:
+            put(error)
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            batch = buffer.get()
+            if batch is done:
+                return
+            if isinstance(batch, BaseException):
+                raise batch
+            yield batch
+    finally:
+        stop.set()
+        worker.join()
+
+
+def save_optimizer_state(path: str, x: np.array, state: dict) -> None:
+    """
+    Given a path, the current point, and an optimizer state, saves them to a .npz checkpoint.
+    The checkpoint is written to a temporary file first and then moved into place, so an
+    interrupted save never leaves a corrupt checkpoint behind.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+    x : np.array
+        Current point.
+    state : dict
+        Optimizer state of numbers and arrays.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        np.savez(file, x=x, **{"state_" + key: value for key, value in state.items()})
+    os.replace(temp_path, path)
+
+
+def load_optimizer_state(path: str) -> tuple:
+    """
+    Given the path of a checkpoint written by save_optimizer_state, returns the saved point
+    and optimizer state.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+
+    Returns
+    -------
+    tuple
+        Saved point and optimizer state.
+    """
+    with np.load(path) as checkpoint:
+        x = checkpoint["x"]
+        state = {}
+        for key in checkpoint.files:
+            if key.startswith("state_"):
+                value = checkpoint[key]
+                state[key[len("state_"):]] = value if value.ndim > 0 else value.item()
+    return x, state
+
+
+def stochastic_gradient_descent(df: callable(np.array), x_0: np.array, batches: iter,
+                                learning_rate: float or callable(int), method: str = "plain",
+                                beta_1: float = 0.9, beta_2: float = 0.999,
+                                epsilon: float = 1e-8, prefetch: int = 2,
+                                checkpoint_path: str = None, checkpoint_every: int = 100,
+                                resume: bool = False) -> np.array:
+    """
+    Given the gradient of a sum of per record losses, a starting point, an iterator of batches
+    of records, and a learning rate or learning rate schedule, takes one gradient step per batch
+    and returns the final point. This allows minimizing objectives over more records than fit
+    in memory, such as batches from memmap_batches. The next batches are read on a background
+    thread while the current gradient is computed, and the point and optimizer state can be
+    checkpointed to disk and resumed later.
+
+    Parameters
+    ----------
+    df : callable(np.array)
+        Function of the point and a batch returning the gradient of the loss over the batch.
+    x_0 : np.array
+        Initial starting input.
+    batches : iter
+        Iterator over batches of records.
+    learning_rate : float or callable(int)
+        Learning rate, or a function of the step number returning the learning rate such as
+        step_decay_schedule.
+    method : str, default "plain"
+        Update rule, one of "plain", "momentum", "nesterov", "rmsprop", or "adam". Defaults
+        to "plain".
+    beta_1 : float, default 0.9
+        Momentum coefficient for momentum, Nesterov, and Adam. Defaults to 0.9.
+    beta_2 : float, default 0.999
+        Decay rate of the squared gradient average for RMSProp and Adam. Defaults to 0.999.
+    epsilon : float, default 1e-8
+        Small constant preventing division by zero in RMSProp and Adam. Defaults to 1e-8.
+    prefetch : int, default 2
+        Number of batches read ahead on a background thread. 0 reads batches on the calling
+        thread. Defaults to 2.
+    checkpoint_path : str, optional
+        Path of a .npz file the point and optimizer state are saved to every checkpoint_every
+        steps and at the end. Defaults to no checkpointing.
+    checkpoint_every : int, default 100
+        Number of steps between checkpoints. Defaults to 100.
+    resume : bool, default False
+        If the checkpoint file exists, restart from the saved point and optimizer state. The
+        batches already used before the checkpoint are skipped, so the same batch iterator
+        should be passed again. Defaults to False.
+
+    Returns
+    -------
+    np.array
+        Point reached after the last batch.
+
+    Raises
+    ------
+    ValueError
+        If the method is not recognized or resume is requested without a checkpoint path.
+    """
+    if method not in _STEP_RULES:
+        raise ValueError("Unknown method: " + str(method))
+    if resume and checkpoint_path is None:
+        raise ValueError("Resuming needs a checkpoint path")
+    rule = _STEP_RULES[method]
+    schedule = learning_rate if callable(learning_rate) else lambda step: learning_rate
+
+    x = np.array(x_0, dtype=float)
+    state = {"iteration": 0, "beta_1": beta_1, "beta_2": beta_2, "epsilon": epsilon}
+    if resume and os.path.exists(checkpoint_path):
+        saved_x, saved_state = load_optimizer_state(checkpoint_path)
+        np.copyto(x, saved_x)
+        state.update(saved_state)
+    step = np.empty_like(x)
+
+    batches = iter(batches)
+    for i in range(state["iteration"]):
+        next(batches, None)
+    if prefetch > 0:
+        batches = _prefetch(batches, prefetch)
+
+    for batch in batches:
+        gradient = np.asarray(df(x, batch), dtype=float)
+        rule(step, gradient, state, schedule(state["iteration"]))
+        x += step
+        state["iteration"] += 1
+        if checkpoint_path is not None and state["iteration"] % checkpoint_every == 0:
+            save_optimizer_state(checkpoint_path, x, state)
+    if checkpoint_path is not None:
+        save_optimizer_state(checkpoint_path, x, state)
+    return x
+
+
+def _strong_wolfe_search(f: callable(np.array), df: callable(np.array), x: np.array, f_x: float,
+                         gradient: np.array, direction: np.array, trial: np.array,
+                         alpha: float = 1.0, c_1: float = 1e-4, c_2: float = 0.9,
+                         max_trials: int = 30) -> tuple:
+    """
+    Given a function, its gradient, the current point, its function value and gradient, and a
+    descent direction, finds a step length satisfying the strong Wolfe conditions using the
+    bracketing and zoom line search of Nocedal and Wright. If the function is not given, only
+    the strong curvature condition is enforced. The returned point is left in trial.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function being minimized, or None.
+    df : callable(np.array)
+        Gradient of the function being minimized.
+    x : np.array
+        Current point.
+    f_x : float
+        Function value at the current point, or None.
+    gradient : np.array
+        Gradient at the current point.
+    direction : np.array
+        Descent direction.
+    trial : np.array
+        Preallocated array the trial points are written into.
+    alpha : float, default 1.0
+        First step length to try. Defaults to 1.
+    c_1 : float, default 1e-4
+        Sufficient decrease constant. Defaults to 1e-4.
+    c_2 : float, default 0.9
+        Curvature constant. Defaults to 0.9.
+    max_trials : int, default 30
+        Maximum number of trial step lengths. Defaults to 30.
+
+    Returns
+    -------
+    tuple
+        Step length, function value and gradient at the returned point, the number of function
+        and gradient evaluations used, and whether the conditions were met. If they were not,
+        the returned point is the best step length evaluated, which may be 0.
+    """
+    f_evals = 0
+    df_evals = 0
+    slope = np.dot(gradient.ravel(), direction.ravel())
+
+    def evaluate(step_length):
+        nonlocal f_evals
+        np.multiply(direction, step_length, out=trial)
+        np.add(trial, x, out=trial)
+        value = None
+        if f is not None:
+            value = f(trial)
+            f_evals += 1
+        return value
+
+    def gradient_at_trial():
+        nonlocal df_evals
+        df_evals += 1
+        new_gradient = np.asarray(df(trial), dtype=float)
+        return new_gradient, np.dot(new_gradient.ravel(), direction.ravel())
+
+    def zoom(low, value_low, slope_low, high, value_high):
+        for i in range(max_trials):
+            # Minimizer of the quadratic through the low end, safeguarded to the interior
+            width = high - low
+            new = low
+            if value_high is not None and value_low is not None:
+                denominator = 2 * (value_high - value_low - slope_low * width)
+                if denominator > 0:
+                    new = low - slope_low * width ** 2 / denominator
+            if not min(low, high) + 0.1 * abs(width) <= new <= max(low, high) - 0.1 * abs(width):
+                new = (low + high) / 2
+            value = evaluate(new)
+            if value is not None and (value > f_x + c_1 * new * slope or value >= value_low):
+                high, value_high = new, value
+                continue
+            new_gradient, new_slope = gradient_at_trial()
+            if abs(new_slope) <= -c_2 * slope:
+                return new, value, new_gradient, True
+            if new_slope * (high - low) >= 0:
+                high, value_high = low, value_low
+            low, value_low, slope_low = new, value, new_slope
+        evaluate(low)
+        new_gradient, new_slope = gradient_at_trial()
+        return low, value_low, new_gradient, False
+
+    prev_alpha = 0.0
+    prev_value = f_x
+    prev_slope = slope
+    for i in range(max_trials):
+        value = evaluate(alpha)
+        if value is not None and (value > f_x + c_1 * alpha * slope
+                                  or (i > 0 and value >= prev_value)):
+            step_length, value, new_gradient, found = zoom(prev_alpha, prev_value, prev_slope,
+                                                           alpha, value)
+            return step_length, value, new_gradient, f_evals, df_evals, found
+        new_gradient, new_slope = gradient_at_trial()
+        if abs(new_slope) <= -c_2 * slope:
+            return alpha, value, new_gradient, f_evals, df_evals, True
+        if new_slope >= 0:
+            step_length, value, new_gradient, found = zoom(alpha, value, new_slope, prev_alpha,
+                                                           prev_value)
+            return step_length, value, new_gradient, f_evals, df_evals, found
+        prev_alpha, prev_value, prev_slope = alpha, value, new_slope
+        alpha *= 2
+    # Still descending steeply at the last trial, which is the point left in trial
+    return prev_alpha, prev_value, new_gradient, f_evals, df_evals, False
+
+
+def lbfgs(df: callable(np.array), x_0: np.array, f: callable(np.array) = None,
+          history: int = 10, threshold: float = 1e-5, iterations: int = 100) -> OptimizeResult:
+    """
+    Given the gradient of a function, a starting point, and optionally the function itself,
+    returns the approximate point of the minimum value of the function using the limited memory
+    BFGS quasi-Newton method with a strong Wolfe line search. Only the last few curvature pairs
+    are kept, in a circular buffer of preallocated arrays, so the memory used is proportional to
+    the history length times the dimension. The search will iterate until successive
+    approximations of x or the gradient norm are less than 1e-5 or until 100 iterations are
+    reached. These stopping criteria values can be specified by the user.
+
+    Parameters
+    ----------
+    df : callable(np.array)
+        Gradient of function to minimize.
+    x_0 : np.array
+        Initial starting input.
+    f : callable(np.array), optional
+        Function to minimize. Without it the line search only enforces the curvature
+        condition.
+    history : int, default 10
+        Number of curvature pairs kept. Defaults to 10.
+    threshold : float, default 1e-5
+        Minimum distance between successive estimations for x, or minimum gradient norm,
+        until the algorythm stops iterating. Defaults to 1e-5.
+    iterations : int, default 100
+        Number of iterations until algorythm stops iterating. Defaults to 100.
+
+    Returns
+    -------
+    OptimizeResult
+        Approximate minimum along with the number of iterations, function evaluations, and
+        gradient evaluations. It is not converged if the line search fails even along the
+        steepest descent direction.
+
+    Raises
+    ------
+    ValueError
+        If the history length is not positive.
+    """
+    if history <= 0:
+        raise ValueError("History length must be positive")
+    x = np.array(x_0, dtype=float).ravel()
+    n = x.size
+    s_history = np.empty((history, n))
+    y_history = np.empty((history, n))
+    rho = np.empty(history)
+    coefs = np.empty(history)
+    direction = np.empty(n)
+    trial = np.empty(n)
+    s_new = np.empty(n)
+    y_new = np.empty(n)
+
+    f_x = f(x) if f is not None else None
+    f_evals = 1 if f is not None else 0
+    gradient = np.asarray(df(x), dtype=float).ravel()
+    df_evals = 1
+    stored = 0
+    newest = -1
+    iteration = 0
+    converged = np.linalg.norm(gradient) <= threshold
+    while iteration < iterations and not converged:
+        # Two loop recursion for direction = -H * gradient
+        np.negative(gradient, out=direction)
+        for k in range(stored):
+            slot = (newest - k) % history
+            coefs[slot] = rho[slot] * np.dot(s_history[slot], direction)
+            direction -= coefs[slot] * y_history[slot]
+        if stored > 0:
+            direction *= 1 / (rho[newest] * np.dot(y_history[newest], y_history[newest]))
+        for k in range(stored - 1, -1, -1):
+            slot = (newest - k) % history
+            beta = rho[slot] * np.dot(y_history[slot], direction)
+            direction += (coefs[slot] - beta) * s_history[slot]
+
+        slope = np.dot(gradient, direction)
+        if slope >= 0:
+            # Lost descent from a bad curvature pair, so drop the history
+            stored = 0
+            np.negative(gradient, out=direction)
+            slope = np.dot(gradient, direction)
+        first_alpha = 1.0 if stored > 0 else min(1.0, 1 / np.linalg.norm(gradient))
+        alpha, f_new, gradient_new, used_f, used_df, found = _strong_wolfe_search(
+            f, df, x, f_x, gradient, direction, trial, alpha=first_alpha)
+        f_evals += used_f
+        df_evals += used_df
+        iteration += 1
+        if not found and alpha == 0:
+            if stored == 0:
+                # Not even the steepest descent direction gave an acceptable step
+                break
+            # Retry from the gradient with the history dropped
+            stored = 0
+            continue
+        gradient_new = gradient_new.ravel()
+
+        # The pair only enters the buffer once accepted, so a rejected pair never overwrites
+        # the oldest live one
+        np.subtract(trial, x, out=s_new)
+        np.subtract(gradient_new, gradient, out=y_new)
+        curvature = np.dot(s_new, y_new)
+        if curvature > np.finfo(float).eps * np.dot(y_new, y_new):
+            newest = (newest + 1) % history
+            np.copyto(s_history[newest], s_new)
+            np.copyto(y_history[newest], y_new)
+            rho[newest] = 1 / curvature
+            stored = min(stored + 1, history)
+        dist = np.linalg.norm(s_new)
+
+        np.copyto(x, trial)
+        gradient = gradient_new
+        f_x = f_new
+        # A short step only means convergence when the line search succeeded
+        converged = (found and dist < threshold) or np.linalg.norm(gradient) <= threshold
+    return OptimizeResult(x.reshape(np.shape(x_0)), f_x, iteration, f_evals, df_evals,
+                          bool(converged))
+
+
+def _evaluate_points(f: callable(np.array), points: np.array, vectorized: bool = False,
+                     executor=None) -> np.array:
+    """
+    Given a function and a stack of points, returns the function evaluated at every point.
+    Vectorized functions are called once on the whole stack, an executor evaluates the points
+    in parallel through its map method, and otherwise the points are evaluated one at a time.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function to evaluate.
+    points : np.array
+        Array of points, one per row.
+    vectorized : bool, default False
+        If f takes an array of points, one per row, and returns an array of values.
+        Defaults to False.
+    executor : concurrent.futures.Executor, optional
+        Worker pool to evaluate the points in parallel. Ignored if f is vectorized.
+
+    Returns
+    -------
+    np.array
+        Function values at the points.
+    """
+    if vectorized:
+        return np.asarray(f(points), dtype=float).reshape(points.shape[0])
+    if executor is not None:
+        return np.fromiter(executor.map(f, points), dtype=float, count=points.shape[0])
+    return np.fromiter((f(point) for point in points), dtype=float, count=points.shape[0])
+
+
+def nelder_mead(f: callable(np.array), x_0: np.array, step: float = 0.1,
+                threshold: float = 1e-5, iterations: int = 1000, max_evals: int = None,
+                vectorized: bool = False, executor=None) -> OptimizeResult:
+    """
+    Given a function and a starting point, returns the approximate point of the minimum value
+    of the function using the Nelder-Mead simplex method, which needs no derivatives. The
+    simplex is stored as a single (n + 1, n) array. When f is vectorized or an executor is
+    given, the reflection, expansion, and both contraction points are evaluated together as
+    one batch each iteration, as are the points of a shrink. The search will iterate until the
+    simplex and its function values are within 1e-5 of the best vertex or until 1000 iterations
+    are reached. These stopping criteria values can be specified by the user.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function to minimize.
+    x_0 : np.array
+        Initial starting input.
+    step : float, default 0.1
+        Size of the initial simplex along each coordinate. Defaults to 0.1.
+    threshold : float, default 1e-5
+        Size of the simplex and spread of its function values until the algorythm stops
+        iterating. Defaults to 1e-5.
+    iterations : int, default 1000
+        Number of iterations until algorythm stops iterating. Defaults to 1000.
+    max_evals : int, optional
+        Maximum number of function evaluations, never exceeded. The search stops before any
+        batch of evaluations that would go over it. With fewer than n + 1 evaluations only
+        x_0 is evaluated. Defaults to no limit.
+    vectorized : bool, default False
+        If f takes an array of points, one per row, and returns an array of values.
+        Defaults to False.
+    executor : concurrent.futures.Executor, optional
+        Worker pool to evaluate independent trial points in parallel.
+
+    Returns
+    -------
+    OptimizeResult
+        Approximate minimum along with the number of iterations and function evaluations.
+
+    Raises
+    ------
+    ValueError
+        If max_evals is less than 1.
+    """
+    x_0 = np.asarray(x_0, dtype=float)
+    n = x_0.size
+    batched = vectorized or executor is not None
+    if max_evals is None:
+        max_evals = np.inf
+    if max_evals < 1:
+        raise ValueError("max_evals must be at least 1")
+    if max_evals < n + 1:
+        # Not enough evaluations to build the simplex
+        f_x = float(_evaluate_points(f, x_0.ravel()[np.newaxis], vectorized)[0])
+        return OptimizeResult(x_0.copy(), f_x, 0, 1, 0, False)
+
+    simplex = np.empty((n + 1, n))
+    simplex[:] = x_0.ravel()
+    simplex[np.arange(1, n + 1), np.arange(n)] += step
+    values = _evaluate_points(f, simplex, vectorized, executor)
+    f_evals = n + 1
+    centroid = np.empty(n)
+    trials = np.empty((4, n))
+    # Coefficients for reflection, expansion, outside contraction, and inside contraction
+    coefs = np.array([1, 2, 0.5, -0.5])[:, np.newaxis]
+
+    iteration = 0
+    converged = False
+    while iteration < iterations and f_evals < max_evals:
+        order = np.argsort(values)
+        simplex[:] = simplex[order]
+        values[:] = values[order]
+        if (np.max(np.abs(simplex[1:] - simplex[0])) <= threshold
+                and values[-1] - values[0] <= threshold):
+            converged = True
+            break
+
+        np.mean(simplex[:-1], axis=0, out=centroid)
+        np.subtract(centroid, simplex[-1], out=trials[0])
+        np.multiply(coefs, trials[0], out=trials)
+        trials += centroid
+        if f_evals + (4 if batched else 1) > max_evals:
+            break
+        if batched:
+            trial_values = _evaluate_points(f, trials, vectorized, executor)
+            f_evals += 4
+        else:
+            trial_values = np.full(4, np.inf)
+            trial_values[0] = f(trials[0])
+            f_evals += 1
+
+        reflected = trial_values[0]
+        if values[0] <= reflected < values[-2]:
+            accepted = 0
+        elif reflected < values[0]:
+            if not batched and f_evals < max_evals:
+                trial_values[1] = f(trials[1])
+                f_evals += 1
+            accepted = 1 if trial_values[1] < reflected else 0
+        else:
+            contraction = 2 if reflected < values[-1] else 3
+            if not batched and f_evals < max_evals:
+                trial_values[contraction] = f(trials[contraction])
+                f_evals += 1
+            target = min(reflected, values[-1])
+            accepted = contraction if trial_values[contraction] <= target else None
+
+        if accepted is not None:
+            simplex[-1] = trials[accepted]
+            values[-1] = trial_values[accepted]
+        else:
+            if f_evals + n > max_evals:
+                break
+            # Shrink every vertex towards the best one
+            simplex[1:] -= simplex[0]
+            simplex[1:] *= 0.5
+            simplex[1:] += simplex[0]
+            values[1:] = _evaluate_points(f, simplex[1:], vectorized, executor)
+            f_evals += n
+        iteration += 1
+
+    best = np.argmin(values)
+    return OptimizeResult(simplex[best].reshape(x_0.shape), float(values[best]), iteration,
+                          f_evals, 0, converged)
+
+
+def pattern_search(f: callable(np.array), x_0: np.array, step: float = 0.5,
+                   threshold: float = 1e-5, iterations: int = 1000, max_evals: int = None,
+                   vectorized: bool = False, executor=None) -> OptimizeResult:
+    """
+    Given a function and a starting point, returns the approximate point of the minimum value
+    of the function using compass pattern search, which needs no derivatives. Each iteration
+    polls the 2n points one step away along each coordinate direction, all evaluated together
+    as one batch, and moves to the best one if it improves on the current point. Otherwise the
+    step is halved. The search will iterate until the step is less than 1e-5 or until 1000
+    iterations are reached. These stopping criteria values can be specified by the user.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function to minimize.
+    x_0 : np.array
+        Initial starting input.
+    step : float, default 0.5
+        Initial poll step. Defaults to 0.5.
+    threshold : float, default 1e-5
+        Minimum step until the algorythm stops iterating. Defaults to 1e-5.
+    iterations : int, default 1000
+        Number of iterations until algorythm stops iterating. Defaults to 1000.
+    max_evals : int, optional
+        Maximum number of function evaluations. Defaults to no limit.
+    vectorized : bool, default False
+        If f takes an array of points, one per row, and returns an array of values.
+        Defaults to False.
+    executor : concurrent.futures.Executor, optional
+        Worker pool to evaluate the poll points in parallel.
+
+    Returns
+    -------
+    OptimizeResult
+        Approximate minimum along with the number of iterations and function evaluations.
+    """
+    x_0 = np.asarray(x_0, dtype=float)
+    n = x_0.size
+    if max_evals is None:
+        max_evals = np.inf
+    x = x_0.ravel().copy()
+    f_x = float(_evaluate_points(f, x[np.newaxis], vectorized)[0])
+    f_evals = 1
+    poll = np.empty((2 * n, n))
+    diagonal = np.arange(n)
+
+    iteration = 0
+    while iteration < iterations and threshold <= step and f_evals + 2 * n <= max_evals:
+        poll[:] = x
+        poll[diagonal, diagonal] += step
+        poll[n + diagonal, diagonal] -= step
+        poll_values = _evaluate_points(f, poll, vectorized, executor)
+        f_evals += 2 * n
+        best = np.argmin(poll_values)
+        if poll_values[best] < f_x:
+            x[:] = poll[best]
+            f_x = float(poll_values[best])
+        else:
+            step /= 2
+        iteration += 1
+    return OptimizeResult(x.reshape(x_0.shape), f_x, iteration, f_evals, 0, step < threshold)
+
+
+def _local_run(local_method: callable, f: callable(np.array), x_0: np.array, max_evals: int,
+               options: dict) -> OptimizeResult:
+    """
+    Runs one local minimization of a multi-start search. Defined at module level so it can be
+    sent to worker processes.
+
+    Parameters
+    ----------
+    local_method : callable
+        Local minimizer such as nelder_mead.
+    f : callable(np.array)
+        Function to minimize.
+    x_0 : np.array
+        Starting point.
+    max_evals : int
+        Maximum number of function evaluations, or None for no limit.
+    options : dict
+        Extra keyword arguments for the local minimizer.
+
+    Returns
+    -------
+    OptimizeResult
+        Result of the local minimization.
+    """
+    return local_method(f, x_0, max_evals=max_evals, **options)
+
+
+def multi_start(f: callable(np.array), bounds: np.array, n_starts: int = 100,
+                local_method: callable = nelder_mead, sampling: str = "lhs", workers: int = None,
+                max_evals: int = None, local_max_evals: int = None, basin_radius: float = None,
+                tolerance: float = 1e-4, seed: int = None, **options) -> MultiStartResult:
+    """
+    Given a function and box bounds, searches for its global minimum by running a local
+    minimizer from many starting points spread over the box with Latin hypercube or Sobol
+    sampling. Starts can be dispatched to a pool of worker processes. A start that lies within
+    basin_radius of a minimum already found is eliminated without running it, and converged
+    points within tolerance of each other are merged into one minimum. The total number of
+    function evaluations across all workers can be capped.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function to minimize. Must be defined at module level if workers are used.
+    bounds : np.array
+        Array of shape (n, 2) with the lower and upper bound of each coordinate.
+    n_starts : int, default 100
+        Number of starting points. Sobol sampling rounds this up to a power of two.
+        Defaults to 100.
+    local_method : callable, default nelder_mead
+        Local minimizer called as local_method(f, x_0, max_evals=..., **options) and
+        returning an OptimizeResult, such as nelder_mead or pattern_search.
+        Defaults to nelder_mead.
+    sampling : str, default "lhs"
+        Either "lhs" for Latin hypercube or "sobol" for a scrambled Sobol sequence.
+        Defaults to "lhs".
+    workers : int, optional
+        Number of worker processes. Defaults to running every start in this process.
+    max_evals : int, optional
+        Maximum number of function evaluations across all starts. Defaults to no limit.
+    local_max_evals : int, optional
+        Maximum number of function evaluations for any single start. Defaults to no limit.
+    basin_radius : float, optional
+        Starts closer than this to a minimum already found are skipped. Defaults to never
+        skipping starts.
+    tolerance : float, default 1e-4
+        Distance under which two converged points count as the same minimum.
+        Defaults to 1e-4.
+    seed : int, optional
+        Seed for the starting point sampler.
+    **options
+        Extra keyword arguments for the local minimizer.
+
+    Returns
+    -------
+    MultiStartResult
+        Best minimum found and a table of all distinct minima.
+
+    Raises
+    ------
+    ValueError
+        If the bounds are not an (n, 2) array with lower bounds below upper bounds, or if the
+        sampling method is not recognized.
+    """
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim != 2 or bounds.shape[1] != 2 or np.any(bounds[:, 0] >= bounds[:, 1]):
+        raise ValueError("Bounds must be an (n, 2) array with lower bounds below upper bounds")
+    n = bounds.shape[0]
+    if sampling == "lhs":
+        unit_starts = qmc.LatinHypercube(d=n, seed=seed).random(n_starts)
+    elif sampling == "sobol":
+        unit_starts = qmc.Sobol(d=n, seed=seed).random_base2(int(np.ceil(np.log2(n_starts))))
+    else:
+        raise ValueError("Unknown sampling method: " + str(sampling))
+    starts = qmc.scale(unit_starts, bounds[:, 0], bounds[:, 1])
+    if max_evals is None:
+        max_evals = np.inf
+
+    minima_x = []
+    minima_fun = []
+    minima_hits = []
+    minima_evals = []
+    unconverged = []
+    used_evals = 0
+    reserved_evals = 0
+    runs = 0
+    skipped = 0
+
+    def record(result):
+        nonlocal used_evals
+        used_evals += result.f_evals
+        x = np.ravel(result.x)
+        if not result.converged:
+            # A run cut short by its budget has not found a minimum, so it is kept apart
+            unconverged.append((x, result.fun, 1, result.f_evals, False))
+            return
+        for i in range(len(minima_x)):
+            if np.linalg.norm(minima_x[i] - x) <= tolerance:
+                minima_hits[i] += 1
+                minima_evals[i] += result.f_evals
+                if result.fun < minima_fun[i]:
+                    minima_x[i] = x
+                    minima_fun[i] = result.fun
+                return
+        minima_x.append(x)
+        minima_fun.append(result.fun)
+        minima_hits.append(1)
+        minima_evals.append(result.f_evals)
+
+    def next_budget(free_workers=1):
+        budget_left = local_max_evals
+        if max_evals != np.inf:
+            # Share the unreserved budget between the workers that are free
+            share = (max_evals - used_evals - reserved_evals) // free_workers
+            budget_left = share if budget_left is None else min(budget_left, share)
+        return None if budget_left is None else int(budget_left)
+
+    def in_known_basin(start):
+        return (basin_radius is not None and len(minima_x) > 0
+                and np.min(np.linalg.norm(np.array(minima_x) - start, axis=1)) < basin_radius)
+
+    pending = list(starts[::-1])
+    if workers is None or workers <= 1:
+        while pending:
+            start = pending.pop()
+            budget = next_budget()
+            if in_known_basin(start) or (budget is not None and budget <= 0):
+                skipped += 1
+                continue
+            record(_local_run(local_method, f, start, budget, options))
+            runs += 1
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            while pending or running:
+                # Keep every worker busy with starts outside the basins found so far
+                while pending and len(running) < workers:
+                    start = pending.pop()
+                    budget = next_budget(workers - len(running))
+                    if in_known_basin(start) or (budget is not None and budget <= 0):
+                        skipped += 1
+                        continue
+                    future = pool.submit(_local_run, local_method, f, start, budget, options)
+                    running[future] = budget if budget is not None else 0
+                    reserved_evals += running[future]
+                if not running:
+                    break
+                done, not_done = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    reserved_evals -= running.pop(future)
+                    record(future.result())
+                    runs += 1
+
+    rows = [(minima_x[i], minima_fun[i], minima_hits[i], minima_evals[i], True)
+            for i in np.argsort(minima_fun)]
+    rows += sorted(unconverged, key=lambda row: row[1])
+    table = np.empty(len(rows), dtype=[("x", float, (n,)), ("fun", float), ("hits", int),
+                                       ("f_evals", int), ("converged", bool)])
+    for i, row in enumerate(rows):
+        table[i] = row
+    if len(table) == 0:
+        return MultiStartResult(None, None, table, used_evals, runs, skipped)
+    return MultiStartResult(table["x"][0].copy(), float(table["fun"][0]), table, used_evals,
+                            runs, skipped)
+
+
+def project_box(x: np.array, lower: np.array or float, upper: np.array or float,
+                out: np.array = None) -> np.array:
+    """
+    Given points and lower and upper bounds, returns the closest points inside the box.
+    Works on a single point or on a stack of points, one per row.
+
+    Parameters
+    ----------
+    x : np.array
+        Point or array of points, one per row.
+    lower : np.array or float
+        Lower bounds, broadcast against x.
+    upper : np.array or float
+        Upper bounds, broadcast against x.
+    out : np.array, optional
+        Array to write the projection into, which may be x itself.
+
+    Returns
+    -------
+    np.array
+        Projection of x onto the box.
+    """
+    return np.clip(x, lower, upper, out=out)
+
+
+def project_simplex(x: np.array, radius: float = 1.0) -> np.array:
+    """
+    Given points, returns the closest points on the probability simplex, the set of
+    nonnegative vectors whose entries sum to the given radius. Works on a single point or on a
+    stack of points, one per row, using the sort based algorithm of Duchi et al.
+
+    Parameters
+    ----------
+    x : np.array
+        Point or array of points, one per row.
+    radius : float, default 1.0
+        Sum of the entries of the projected points. Defaults to 1.
+
+    Returns
+    -------
+    np.array
+        Projection of x onto the simplex.
+
+    Raises
+    ------
+    ValueError
+        If the radius is not positive.
+    """
+    if radius <= 0:
+        raise ValueError("Radius must be positive")
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    descending = -np.sort(-x, axis=-1)
+    excess = np.cumsum(descending, axis=-1) - radius
+    # Number of entries that stay positive after subtracting the shift
+    count = np.sum(descending * np.arange(1, n + 1) > excess, axis=-1, keepdims=True)
+    shift = np.take_along_axis(excess, count - 1, axis=-1) / count
+    return np.maximum(x - shift, 0)
+
+
+def projected_gradient(f: callable(np.array), df: callable(np.array), x_0: np.array,
+                       project: callable(np.array), learning_rate: float = 1.0,
+                       threshold: float = 1e-5, iterations: int = 500) -> OptimizeResult:
+    """
+    Given a function, its gradient, a starting point, and a projection onto the feasible set,
+    returns the approximate point of the minimum value of the function over the feasible set
+    using projected gradient descent. Each step moves against the gradient and projects back
+    onto the feasible set, and the step length is found by Armijo backtracking along the
+    projection arc starting from a Barzilai-Borwein estimate. The search will iterate until
+    successive approximations of x are less than 1e-5 or until 500 iterations are reached.
+    These stopping criteria values can be specified by the user.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function to minimize.
+    df : callable(np.array)
+        Gradient of function to minimize.
+    x_0 : np.array
+        Initial starting input. It is projected onto the feasible set first.
+    project : callable(np.array)
+        Function returning the projection of a point onto the feasible set, such as
+        lambda x: project_box(x, lower, upper) or project_simplex.
+    learning_rate : float, default 1.0
+        First step length tried. Defaults to 1.
+    threshold : float, default 1e-5
+        Minimum distance between successive estimations for x until the algorythm stops
+        iterating. Defaults to 1e-5.
+    iterations : int, default 500
+        Number of iterations until algorythm stops iterating. Defaults to 500.
+
+    Returns
+    -------
+    OptimizeResult
+        Approximate constrained minimum along with the number of iterations, function
+        evaluations, and gradient evaluations. It is not converged if the backtracking finds
+        no decrease.
+    """
+    x = np.array(project(np.asarray(x_0, dtype=float)), dtype=float)
+    f_x = f(x)
+    gradient = np.asarray(df(x), dtype=float)
+    f_evals = 1
+    df_evals = 1
+    step = np.empty_like(x)
+    alpha = learning_rate
+
+    iteration = 0
+    converged = False
+    while iteration < iterations and not converged:
+        found = False
+        for i in range(50):
+            trial = project(x - alpha * gradient)
+            np.subtract(trial, x, out=step)
+            f_trial = f(trial)
+            f_evals += 1
+            if f_trial <= f_x + 1e-4 * np.dot(gradient.ravel(), step.ravel()):
+                found = True
+                break
+            alpha /= 2
+        if not found:
+            # No decrease along the projection arc, which is a failure rather than convergence
+            break
+        new_gradient = np.asarray(df(trial), dtype=float)
+        df_evals += 1
+
+        # Barzilai-Borwein estimate of the next step length
+        change = np.dot(step.ravel(), (new_gradient - gradient).ravel())
+        alpha = np.dot(step.ravel(), step.ravel()) / change if change > 0 else learning_rate
+
+        x = trial
+        f_x = f_trial
+        gradient = new_gradient
+        iteration += 1
+        converged = np.linalg.norm(step) < threshold
+    return OptimizeResult(x, f_x, iteration, f_evals, df_evals, converged)
+
+
+def projected_lbfgs(f: callable(np.array), df: callable(np.array), x_0: np.array,
+                    lower: np.array or float, upper: np.array or float, history: int = 10,
+                    threshold: float = 1e-5, iterations: int = 500) -> OptimizeResult:
+    """
+    Given a function, its gradient, a starting point, and lower and upper bounds, returns the
+    approximate point of the minimum value of the function inside the box using a projected
+    limited memory BFGS method in the style of L-BFGS-B. Coordinates held at a bound by the
+    gradient form the active set and are fixed for the iteration, so the quasi-Newton direction
+    is only computed over the free coordinates. The step is found by Armijo backtracking along
+    the projection of the direction onto the box. The search will iterate until the projected
+    gradient or successive approximations of x are less than 1e-5 or until 500 iterations are
+    reached. These stopping criteria values can be specified by the user.
+
+    Parameters
+    ----------
+    f : callable(np.array)
+        Function to minimize.
+    df : callable(np.array)
+        Gradient of function to minimize.
+    x_0 : np.array
+        Initial starting input. It is projected onto the box first.
+    lower : np.array or float
+        Lower bounds. Use -np.inf for unbounded coordinates.
+    upper : np.array or float
+        Upper bounds. Use np.inf for unbounded coordinates.
+    history : int, default 10
+        Number of curvature pairs kept. Defaults to 10.
+    threshold : float, default 1e-5
+        Minimum projected gradient norm, or distance between successive estimations for x,
+        until the algorythm stops iterating. Defaults to 1e-5.
+    iterations : int, default 500
+        Number of iterations until algorythm stops iterating. Defaults to 500.
+
+    Returns
+    -------
+    OptimizeResult
+        Approximate constrained minimum along with the number of iterations, function
+        evaluations, and gradient evaluations. It is not converged if the backtracking finds
+        no decrease even along the projected steepest descent direction.
+
+    Raises
+    ------
+    ValueError
+        If the history length is not positive or a lower bound is above an upper bound.
+    """
+    if history <= 0:
+        raise ValueError("History length must be positive")
+    x = np.array(x_0, dtype=float).ravel()
+    n = x.size
+    lower = np.broadcast_to(np.asarray(lower, dtype=float).ravel(), (n,))
+    upper = np.broadcast_to(np.asarray(upper, dtype=float).ravel(), (n,))
+    if np.any(lower > upper):
+        raise ValueError("Lower bounds must not be above upper bounds")
+    project_box(x, lower, upper, out=x)
+
+    s_history = np.empty((history, n))
+    y_history = np.empty((history, n))
+    coefs = np.empty(history)
+    direction = np.empty(n)
+    trial = np.empty(n)
+    step = np.empty(n)
+    y_new = np.empty(n)
+
+    f_x = f(x)
+    gradient = np.asarray(df(x), dtype=float).ravel()
+    f_evals = 1
+    df_evals = 1
+    stored = 0
+    newest = -1
+
+    def projected_gradient_norm():
+        np.subtract(x, gradient, out=trial)
+        project_box(trial, lower, upper, out=trial)
+        return np.max(np.abs(trial - x))
+
+    iteration = 0
+    converged = projected_gradient_norm() <= threshold
+    while iteration < iterations and not converged:
+        active = ((x <= lower) & (gradient > 0)) | ((x >= upper) & (gradient < 0))
+        free = np.flatnonzero(~active)
+
+        # Two loop recursion restricted to the free coordinates, using the curvature of the
+        # reduced pairs and skipping those without positive curvature there
+        direction[:] = 0
+        d_free = -gradient[free]
+        slots = np.array([(newest - k) % history for k in range(stored)], dtype=int)
+        s_free = s_history[np.ix_(slots, free)]
+        y_free = y_history[np.ix_(slots, free)]
+        curvatures = np.einsum("ij,ij->i", s_free, y_free)
+        y_norms = np.einsum("ij,ij->i", y_free, y_free)
+        usable = np.flatnonzero(curvatures > np.finfo(float).eps * y_norms)
+        for k in usable:
+            coefs[k] = np.dot(s_free[k], d_free) / curvatures[k]
+            d_free -= coefs[k] * y_free[k]
+        if usable.size > 0:
+            d_free *= curvatures[usable[0]] / y_norms[usable[0]]
+        for k in usable[::-1]:
+            beta = np.dot(y_free[k], d_free) / curvatures[k]
+            d_free += (coefs[k] - beta) * s_free[k]
+        if np.dot(d_free, gradient[free]) >= 0:
+            # Lost descent from the reduced curvature pairs, so drop the history
+            stored = 0
+            d_free = -gradient[free]
+        direction[free] = d_free
+
+        alpha = 1.0 if stored > 0 else min(1.0, 1 / max(np.linalg.norm(d_free), 1e-12))
+        found = False
+        for i in range(50):
+            np.multiply(direction, alpha, out=trial)
+            trial += x
+            project_box(trial, lower, upper, out=trial)
+            np.subtract(trial, x, out=step)
+            f_trial = f(trial)
+            f_evals += 1
+            if f_trial <= f_x + 1e-4 * np.dot(gradient, step):
+                found = True
+                break
+            alpha /= 2
+        iteration += 1
+        if not found:
+            if stored == 0:
+                # Not even the projected steepest descent direction gave a decrease
+                break
+            # Retry from the gradient with the history dropped
+            stored = 0
+            continue
+        new_gradient = np.asarray(df(trial), dtype=float).ravel()
+        df_evals += 1
+
+        # The pair only enters the buffer once accepted, so a rejected pair never overwrites
+        # the oldest live one
+        np.subtract(new_gradient, gradient, out=y_new)
+        curvature = np.dot(step, y_new)
+        if curvature > np.finfo(float).eps * np.dot(y_new, y_new):
+            newest = (newest + 1) % history
+            np.copyto(s_history[newest], step)
+            np.copyto(y_history[newest], y_new)
+            stored = min(stored + 1, history)
+
+        np.copyto(x, trial)
+        f_x = f_trial
+        gradient = new_gradient
+        converged = np.linalg.norm(step) < threshold or projected_gradient_norm() <= threshold
+    return OptimizeResult(x.reshape(np.shape(x_0)), f_x, iteration, f_evals, df_evals, converged)
@@ -0,0 +1,83 @@
+import time
+import numpy as np
+import numerical_optimization
+
+
+def count_calls(f: callable(float)) -> tuple:
+    """
+    Wraps a function so that the number of points it is evaluated at is recorded.
+
+    Parameters
+    ----------
+    f : callable(float)
+        Function to wrap.
+
+    Returns
+    -------
+    tuple
+        Wrapped function and a one element list holding the number of evaluated points.
+    """
+    count = [0]
+
+    def wrapped(x):
+        count[0] += np.size(x)
+        return f(x)
+
+    return wrapped, count
+
+
+def time_call(run: callable, repeats: int = 200) -> float:
+    """
+    Returns the average time in seconds of calling the given function with no arguments.
+
+    Parameters
+    ----------
+    run : callable
+        Function to time.
+    repeats : int, default 200
+        Number of calls to average over. Defaults to 200.
+
+    Returns
+    -------
+    float
+        Average time of one call in seconds.
+    """
+    start = time.perf_counter()
+    for i in range(repeats):
+        run()
+    return (time.perf_counter() - start) / repeats
+
+
+def brent_vs_spi_benchmark():
+    """
+    Compares Brent's method against successive parabolic interpolation on accuracy,
+    number of function evaluations, and run time.
+    """
+    problems = [
+        ("1 - x + x^3", lambda x: 1 - x + x ** 3, 0.5, 1.5, 1 / np.sqrt(3)),
+        ("(x - 1)^2 + e^x", lambda x: (x - 1) ** 2 + np.exp(x), -2, 2, 0.3149230578454061),
+        ("|x - 0.3|", lambda x: np.abs(x - 0.3), -1, 1, 0.3),
+    ]
+    print("{:<18}{:<8}{:>14}{:>10}{:>14}".format("problem", "method", "error", "evals", "time (us)"))
+    for name, f, a, b, x_true in problems:
+        counted, count = count_calls(f)
+        x_spi = numerical_optimization.successive_parabolic_interpolation(
+            counted, np.array([a, (a + b) / 2, b]), threshold=1e-7)
+        spi_evals = count[0]
+        spi_time = time_call(lambda: numerical_optimization.successive_parabolic_interpolation(
+            f, np.array([a, (a + b) / 2, b]), threshold=1e-7))
+
+        counted, count = count_calls(f)
+        x_brent = numerical_optimization.brent_minimize(counted, a, b, threshold=1e-7)
+        brent_evals = count[0]
+        brent_time = time_call(lambda: numerical_optimization.brent_minimize(f, a, b, threshold=1e-7))
+
+        print("{:<18}{:<8}{:>14.2e}{:>10}{:>14.1f}".format(
+            name, "SPI", abs(x_spi - x_true), spi_evals, spi_time * 1e6))
+        print("{:<18}{:<8}{:>14.2e}{:>10}{:>14.1f}".format(
+            name, "Brent", abs(x_brent - x_true), brent_evals, brent_time * 1e6))
+
+
+if __name__ == "__main__":
+    with np.errstate(all="ignore"):
+        brent_vs_spi_benchmark()
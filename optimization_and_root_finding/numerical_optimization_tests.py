@@ -1,3 +1,8 @@
+import itertools
+import os
+import tempfile
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 import numerical_optimization
 import numpy as np
 
@@ -58,6 +63,59 @@ def successive_parabolic_interpolation_tests():
     )
 
 
+def brent_minimize_tests():
+    """
+    Tests Brent's method minimization function.
+    """
+
+    def f(x): return 1 - x + x ** 3
+
+    np.testing.assert_almost_equal(
+        numerical_optimization.brent_minimize(f, 0, 2, threshold=1e-8),
+        1 / np.sqrt(3),
+        err_msg="Brent Test 1 Fail"
+    )
+
+    evaluations = []
+
+    def f(x):
+        evaluations.append(x)
+        return (x - 1) ** 2
+
+    np.testing.assert_almost_equal(
+        numerical_optimization.brent_minimize(f, -8, 8, iterations=10),
+        1,
+        err_msg="Brent Test 2 Fail"
+    )
+    np.testing.assert_equal(
+        len(evaluations) <= 11,
+        True,
+        err_msg="Brent Test 3 Fail"
+    )
+
+    # Minimum on the boundary must stay inside the bracket
+    def f(x): return x
+
+    x_min = numerical_optimization.brent_minimize(f, 2, 3)
+    np.testing.assert_equal(
+        2 <= x_min <= 3,
+        True,
+        err_msg="Brent Test 4 Fail"
+    )
+    np.testing.assert_almost_equal(x_min, 2, decimal=4, err_msg="Brent Test 5 Fail")
+
+    # Non-smooth function where parabolic steps are rejected
+    def f(x): return np.abs(x - 0.3)
+
+    np.testing.assert_almost_equal(
+        numerical_optimization.brent_minimize(f, -1, 1, threshold=1e-7),
+        0.3,
+        decimal=6,
+        err_msg="Brent Test 6 Fail"
+    )
+    np.testing.assert_raises(ValueError, numerical_optimization.brent_minimize, f, 1, 1)
+
+
 def gradient_descent_tests():
     """
     Tests gradient descent function.
@@ -128,11 +186,446 @@ def gradient_descent_tests():
     )
 
 
+def gradient_descent_methods_tests():
+    """
+    Tests gradient descent update rules and line searches.
+    """
+
+    def f(x): return 0.5 * (x[0] ** 2 + 100 * x[1] ** 2)
+
+    def df(x): return np.array([x[0], 100 * x[1]])
+
+    x_0 = np.array([1.0, 1.0])
+    np.testing.assert_allclose(
+        numerical_optimization.gradient_descent(df, x_0, 0.01, iterations=1, method="momentum"),
+        np.array([0.99, 0]),
+        atol=1e-12,
+        err_msg="Gradient Descent Methods Test 1 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_optimization.gradient_descent(df, x_0, 0.01, iterations=1, method="nesterov"),
+        np.array([1 - 0.019, -0.9]),
+        err_msg="Gradient Descent Methods Test 2 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_optimization.gradient_descent(df, x_0, 0.01, iterations=1, method="adam"),
+        np.array([0.99, 0.99]),
+        err_msg="Gradient Descent Methods Test 3 Fail"
+    )
+
+    for method in ["plain", "momentum", "nesterov", "rmsprop", "adam"]:
+        for line_search in [None, "armijo", "wolfe"]:
+            x_min = numerical_optimization.gradient_descent(
+                df, x_0, 0.01, threshold=1e-12, iterations=2000, method=method, f=f,
+                line_search=line_search)
+            np.testing.assert_allclose(
+                x_min,
+                np.array([0, 0]),
+                atol=1e-5,
+                err_msg="Gradient Descent Methods Test 4 Fail: " + method + " " + str(line_search)
+            )
+
+    # Line search should beat a fixed learning rate on an ill-conditioned problem
+    fixed = numerical_optimization.gradient_descent(df, x_0, 0.01)
+    searched = numerical_optimization.gradient_descent(df, x_0, 0.01, f=f, line_search="wolfe")
+    np.testing.assert_equal(
+        f(searched) < f(fixed),
+        True,
+        err_msg="Gradient Descent Methods Test 5 Fail"
+    )
+
+    def halved_step(step, gradient, state, learning_rate):
+        np.multiply(gradient, -learning_rate / 2, out=step)
+
+    np.testing.assert_allclose(
+        numerical_optimization.gradient_descent(df, x_0, 0.01, iterations=1, method=halved_step),
+        np.array([0.995, 0.5]),
+        err_msg="Gradient Descent Methods Test 6 Fail"
+    )
+
+    states = []
+
+    def recorded_momentum(step, gradient, state, learning_rate):
+        states.append(state)
+        numerical_optimization._momentum_step(step, gradient, state, learning_rate)
+
+    def g(x): return 0.5 * np.sum(x ** 2)
+
+    # The velocity should match the step scaled by the line search, and be cleared when the
+    # momentum stops being a descent direction
+    numerical_optimization.gradient_descent(lambda x: x, np.array([1.0]), 3, iterations=1,
+                                            method=recorded_momentum, f=g, line_search="armijo")
+    np.testing.assert_allclose(
+        states[-1]["velocity"],
+        np.array([-1.5]),
+        err_msg="Gradient Descent Methods Test 7 Fail"
+    )
+    numerical_optimization.gradient_descent(lambda x: x, np.array([1.0]), 1, iterations=2,
+                                            method=recorded_momentum, f=g, line_search="armijo")
+    np.testing.assert_allclose(
+        states[-1]["velocity"],
+        np.array([0.0]),
+        err_msg="Gradient Descent Methods Test 8 Fail"
+    )
+
+    def sideways_step(step, gradient, state, learning_rate):
+        step[:] = [-1e-3, 1e12]
+
+    # A rule step with no decrease falls back to the steepest descent step
+    np.testing.assert_allclose(
+        numerical_optimization.gradient_descent(lambda x: x, np.array([1.0, 0.0]), 0.5,
+                                                iterations=1, method=sideways_step, f=g,
+                                                line_search="armijo"),
+        np.array([0.5, 0.0]),
+        err_msg="Gradient Descent Methods Test 9 Fail"
+    )
+
+    # With no decrease along the gradient either, the search stops with a warning
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        x = numerical_optimization.gradient_descent(lambda x: -x, np.array([1.0]), 0.5,
+                                                    f=g, line_search="armijo")
+    np.testing.assert_equal([w.category for w in caught], [RuntimeWarning],
+                            err_msg="Gradient Descent Methods Test 10 Fail")
+    np.testing.assert_allclose(x, np.array([1.0]), err_msg="Gradient Descent Methods Test 11 Fail")
+
+    np.testing.assert_raises(ValueError, numerical_optimization.gradient_descent,
+                             df, x_0, 0.01, method="newton")
+    np.testing.assert_raises(ValueError, numerical_optimization.gradient_descent,
+                             df, x_0, 0.01, line_search="armijo")
+
+
+def stochastic_gradient_descent_tests():
+    """
+    Tests mini-batch stochastic gradient descent, batch streaming, schedules, and checkpoints.
+    """
+    rng = np.random.default_rng(0)
+    weights = np.array([2, -1, 0.5])
+    records = rng.normal(size=(2000, 3))
+    data = np.column_stack([records, records @ weights])
+
+    def df(x, batch): return batch[:, :3].T @ (batch[:, :3] @ x - batch[:, 3]) / len(batch)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "data.npy")
+        np.save(path, data)
+
+        batches = list(numerical_optimization.memmap_batches(path, 300))
+        np.testing.assert_equal(len(batches), 7, err_msg="SGD Test 1 Fail")
+        np.testing.assert_allclose(np.concatenate(batches), data, err_msg="SGD Test 2 Fail")
+
+        x_min = numerical_optimization.stochastic_gradient_descent(
+            df, np.zeros(3), numerical_optimization.memmap_batches(path, 20), 0.1)
+        np.testing.assert_allclose(x_min, weights, atol=1e-4, err_msg="SGD Test 3 Fail")
+
+        schedule = numerical_optimization.inverse_time_schedule(0.1, 0.01)
+        x_min = numerical_optimization.stochastic_gradient_descent(
+            df, np.zeros(3), numerical_optimization.memmap_batches(path, 20), schedule,
+            method="adam")
+        np.testing.assert_allclose(x_min, weights, atol=1e-2, err_msg="SGD Test 4 Fail")
+
+        # Prefetching must not change the result
+        x_threaded = numerical_optimization.stochastic_gradient_descent(
+            df, np.zeros(3), numerical_optimization.memmap_batches(path, 50), 0.05,
+            method="momentum")
+        x_serial = numerical_optimization.stochastic_gradient_descent(
+            df, np.zeros(3), numerical_optimization.memmap_batches(path, 50), 0.05,
+            method="momentum", prefetch=0)
+        np.testing.assert_allclose(x_threaded, x_serial, err_msg="SGD Test 5 Fail")
+
+        # Stopping half way and resuming from the checkpoint matches an uninterrupted run
+        checkpoint = os.path.join(directory, "checkpoint.npz")
+        numerical_optimization.stochastic_gradient_descent(
+            df, np.zeros(3), itertools.islice(numerical_optimization.memmap_batches(path, 50), 15),
+            0.05, method="momentum", checkpoint_path=checkpoint, checkpoint_every=5)
+        x_resumed = numerical_optimization.stochastic_gradient_descent(
+            df, np.zeros(3), numerical_optimization.memmap_batches(path, 50), 0.05,
+            method="momentum", checkpoint_path=checkpoint, resume=True)
+        np.testing.assert_allclose(x_resumed, x_serial, err_msg="SGD Test 6 Fail")
+        x_saved, state = numerical_optimization.load_optimizer_state(checkpoint)
+        np.testing.assert_equal(state["iteration"], 40, err_msg="SGD Test 7 Fail")
+
+    schedule = numerical_optimization.step_decay_schedule(1, 0.5, 10)
+    np.testing.assert_allclose([schedule(0), schedule(9), schedule(10), schedule(25)],
+                               [1, 1, 0.5, 0.25], err_msg="SGD Test 8 Fail")
+    schedule = numerical_optimization.exponential_decay_schedule(1, 0.1)
+    np.testing.assert_allclose(schedule(10), np.exp(-1), err_msg="SGD Test 9 Fail")
+
+    def failing_batches():
+        yield data[:10]
+        raise OSError("Disk read failed")
+
+    np.testing.assert_raises(OSError, numerical_optimization.stochastic_gradient_descent,
+                             df, np.zeros(3), failing_batches(), 0.1)
+    np.testing.assert_raises(ValueError, numerical_optimization.stochastic_gradient_descent,
+                             df, np.zeros(3), [data], 0.1, resume=True)
+
+
+def lbfgs_tests():
+    """
+    Tests L-BFGS function.
+    """
+
+    def f(x): return np.sum(100 * (x[1:] - x[:-1] ** 2) ** 2 + (1 - x[:-1]) ** 2)
+
+    def df(x):
+        gradient = np.zeros_like(x)
+        gradient[:-1] = -400 * x[:-1] * (x[1:] - x[:-1] ** 2) - 2 * (1 - x[:-1])
+        gradient[1:] += 200 * (x[1:] - x[:-1] ** 2)
+        return gradient
+
+    result = numerical_optimization.lbfgs(df, np.zeros(2), f=f, threshold=1e-8)
+    np.testing.assert_allclose(result.x, np.ones(2), atol=1e-6, err_msg="L-BFGS Test 1 Fail")
+    np.testing.assert_equal(result.converged, True, err_msg="L-BFGS Test 2 Fail")
+    np.testing.assert_equal(result.df_evals >= result.iterations, True,
+                            err_msg="L-BFGS Test 3 Fail")
+    np.testing.assert_almost_equal(result.fun, 0, err_msg="L-BFGS Test 4 Fail")
+
+    # Gradient only, with a short history
+    result = numerical_optimization.lbfgs(df, np.zeros(10), history=3, threshold=1e-8,
+                                          iterations=500)
+    np.testing.assert_allclose(result.x, np.ones(10), atol=1e-6, err_msg="L-BFGS Test 5 Fail")
+    np.testing.assert_equal(result.f_evals, 0, err_msg="L-BFGS Test 6 Fail")
+    np.testing.assert_equal(result.fun, None, err_msg="L-BFGS Test 7 Fail")
+
+    # Ill-conditioned quadratic where gradient descent stalls
+    scales = np.linspace(1, 1000, 2000)
+    result = numerical_optimization.lbfgs(lambda x: scales * x - 1, np.zeros(2000),
+                                          f=lambda x: 0.5 * np.dot(scales * x, x) - np.sum(x),
+                                          threshold=1e-10, iterations=1000)
+    np.testing.assert_allclose(result.x, 1 / scales, atol=1e-6, err_msg="L-BFGS Test 8 Fail")
+
+    # The iteration limit is reported as not converged
+    result = numerical_optimization.lbfgs(df, np.zeros(10), f=f, iterations=3)
+    np.testing.assert_equal((result.iterations, result.converged), (3, False),
+                            err_msg="L-BFGS Test 9 Fail")
+
+    # A jump the gradient cannot see stalls the line search, which is not convergence
+    result = numerical_optimization.lbfgs(lambda x: 2 * (x - 1), np.zeros(1),
+                                          f=lambda x: (x[0] - 1) ** 2 + 5 * (x[0] > 0.5))
+    np.testing.assert_equal(result.converged, False, err_msg="L-BFGS Test 10 Fail")
+    np.testing.assert_allclose(result.x, np.array([0.5]), atol=1e-6,
+                               err_msg="L-BFGS Test 11 Fail")
+
+    # The step length returned after running out of trials is the one left in trial
+    trial = np.empty(1)
+    alpha, value, gradient, f_evals, df_evals, found = numerical_optimization._strong_wolfe_search(
+        lambda x: -x[0], lambda x: -np.ones(1), np.zeros(1), 0.0, -np.ones(1), np.ones(1),
+        trial, max_trials=5)
+    np.testing.assert_equal((alpha, trial[0], value, found), (16.0, 16.0, -16.0, False),
+                            err_msg="L-BFGS Test 12 Fail")
+    np.testing.assert_raises(ValueError, numerical_optimization.lbfgs, df, np.zeros(2),
+                             history=0)
+
+
+def derivative_free_tests():
+    """
+    Tests Nelder-Mead and pattern search functions.
+    """
+
+    def f(x): return 100 * (x[1] - x[0] ** 2) ** 2 + (1 - x[0]) ** 2
+
+    def f_vectorized(x): return 100 * (x[:, 1] - x[:, 0] ** 2) ** 2 + (1 - x[:, 0]) ** 2
+
+    result = numerical_optimization.nelder_mead(f, np.array([-1.0, 2.0]), threshold=1e-10)
+    np.testing.assert_allclose(result.x, np.ones(2), atol=1e-6, err_msg="Nelder-Mead Test 1 Fail")
+    np.testing.assert_equal(result.converged, True, err_msg="Nelder-Mead Test 2 Fail")
+    np.testing.assert_equal(result.df_evals, 0, err_msg="Nelder-Mead Test 3 Fail")
+
+    # Batched evaluation visits the same simplices
+    batched = numerical_optimization.nelder_mead(f_vectorized, np.array([-1.0, 2.0]),
+                                                 threshold=1e-10, vectorized=True)
+    np.testing.assert_allclose(batched.x, result.x, err_msg="Nelder-Mead Test 4 Fail")
+    np.testing.assert_equal(batched.iterations, result.iterations,
+                            err_msg="Nelder-Mead Test 5 Fail")
+    with ThreadPoolExecutor(2) as executor:
+        pooled = numerical_optimization.nelder_mead(f, np.array([-1.0, 2.0]), threshold=1e-10,
+                                                    executor=executor)
+    np.testing.assert_allclose(pooled.x, result.x, err_msg="Nelder-Mead Test 6 Fail")
+
+    # The evaluation cap is hard, including for batches and shrinks
+    for max_evals in [2, 20, 50, 101]:
+        limited = numerical_optimization.nelder_mead(f, np.array([-1.0, 2.0]),
+                                                     max_evals=max_evals)
+        np.testing.assert_equal(limited.f_evals <= max_evals, True,
+                                err_msg="Nelder-Mead Test 7 Fail")
+        limited = numerical_optimization.nelder_mead(f_vectorized, np.array([-1.0, 2.0]),
+                                                     max_evals=max_evals, vectorized=True)
+        np.testing.assert_equal(limited.f_evals <= max_evals, True,
+                                err_msg="Nelder-Mead Test 8 Fail")
+    np.testing.assert_raises(ValueError, numerical_optimization.nelder_mead, f,
+                             np.array([-1.0, 2.0]), max_evals=0)
+
+    def g(x): return np.sum((x - np.array([1, -2, 3])) ** 2, axis=-1)
+
+    result = numerical_optimization.pattern_search(g, np.zeros(3), threshold=1e-8)
+    np.testing.assert_allclose(result.x, np.array([1, -2, 3]), atol=1e-7,
+                               err_msg="Pattern Search Test 1 Fail")
+    np.testing.assert_equal(result.converged, True, err_msg="Pattern Search Test 2 Fail")
+    batched = numerical_optimization.pattern_search(g, np.zeros(3), threshold=1e-8,
+                                                    vectorized=True)
+    np.testing.assert_allclose(batched.x, result.x, err_msg="Pattern Search Test 3 Fail")
+    np.testing.assert_equal(batched.f_evals, result.f_evals, err_msg="Pattern Search Test 4 Fail")
+    limited = numerical_optimization.pattern_search(g, np.zeros(3), max_evals=20)
+    np.testing.assert_equal(limited.f_evals <= 20, True, err_msg="Pattern Search Test 5 Fail")
+
+
+def projected_optimization_tests():
+    """
+    Tests projections, projected gradient, and projected L-BFGS functions.
+    """
+    np.testing.assert_allclose(
+        numerical_optimization.project_box(np.array([-1, 0.5, 3]), 0, 1),
+        np.array([0, 0.5, 1]),
+        err_msg="Projection Test 1 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_optimization.project_simplex(np.array([[0.5, 0.5, 0.5], [3, 0, 0],
+                                                         [-1, 2, 0.2], [0.2, 0.3, 0.1]])),
+        np.array([[1 / 3, 1 / 3, 1 / 3], [1, 0, 0], [0, 1, 0], [1 / 3, 13 / 30, 7 / 30]]),
+        err_msg="Projection Test 2 Fail"
+    )
+    np.testing.assert_allclose(
+        numerical_optimization.project_simplex(np.array([1, 1]), radius=4),
+        np.array([2, 2]),
+        err_msg="Projection Test 3 Fail"
+    )
+
+    # Minimize |x - c|^2 over the box [0, 1]^3 where c is partly outside
+    target = np.array([-1, 0.25, 2])
+
+    def f(x): return np.sum((x - target) ** 2)
+
+    def df(x): return 2 * (x - target)
+
+    def project(x): return numerical_optimization.project_box(x, 0, 1)
+
+    result = numerical_optimization.projected_gradient(f, df, np.full(3, 0.5), project,
+                                                       threshold=1e-10)
+    np.testing.assert_allclose(result.x, np.array([0, 0.25, 1]), atol=1e-8,
+                               err_msg="Projected Gradient Test 1 Fail")
+    result = numerical_optimization.projected_gradient(
+        f, df, np.full(3, 1 / 3), numerical_optimization.project_simplex, threshold=1e-10)
+    np.testing.assert_allclose(result.x, np.array([0, 0, 1]), atol=1e-8,
+                               err_msg="Projected Gradient Test 2 Fail")
+
+    result = numerical_optimization.projected_lbfgs(f, df, np.full(3, 0.5), 0, 1, threshold=1e-10)
+    np.testing.assert_allclose(result.x, np.array([0, 0.25, 1]), atol=1e-8,
+                               err_msg="Projected L-BFGS Test 1 Fail")
+    np.testing.assert_equal(result.converged, True, err_msg="Projected L-BFGS Test 2 Fail")
+
+    # Bounded least squares compared against the unconstrained solution clipped after the fact
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(60, 20))
+    b = rng.normal(size=60)
+
+    def f(x): return 0.5 * np.sum((a @ x - b) ** 2)
+
+    def df(x): return a.T @ (a @ x - b)
+
+    result = numerical_optimization.projected_lbfgs(f, df, np.zeros(20), 0, 0.2, threshold=1e-10)
+    clipped = np.clip(np.linalg.lstsq(a, b, rcond=None)[0], 0, 0.2)
+    np.testing.assert_equal(result.fun < f(clipped), True, err_msg="Projected L-BFGS Test 3 Fail")
+    np.testing.assert_equal(np.all((result.x >= 0) & (result.x <= 0.2)), True,
+                            err_msg="Projected L-BFGS Test 4 Fail")
+    gradient = df(result.x)
+    interior = (result.x > 1e-8) & (result.x < 0.2 - 1e-8)
+    np.testing.assert_allclose(gradient[interior], 0, atol=1e-6,
+                               err_msg="Projected L-BFGS Test 5 Fail")
+
+    # A gradient of the wrong sign never gives a decrease, which must not count as convergence
+    def g(x): return np.sum(x ** 2)
+
+    def dg(x): return -2 * x
+
+    result = numerical_optimization.projected_gradient(g, dg, np.ones(2),
+                                                       lambda x: np.clip(x, -5, 5))
+    np.testing.assert_equal((result.converged, result.x), (False, np.ones(2)),
+                            err_msg="Projected Gradient Test 3 Fail")
+    result = numerical_optimization.projected_lbfgs(g, dg, np.ones(2), -5, 5)
+    np.testing.assert_equal((result.converged, result.x), (False, np.ones(2)),
+                            err_msg="Projected L-BFGS Test 6 Fail")
+    np.testing.assert_raises(ValueError, numerical_optimization.projected_lbfgs, f, df,
+                             np.zeros(20), 1, 0)
+
+
+def rastrigin(x):
+    """
+    Multimodal test function with its global minimum of 0 at the origin. Defined at module level
+    so it can be sent to worker processes.
+    """
+    return 10 * len(x) + np.sum(x ** 2 - 10 * np.cos(2 * np.pi * x))
+
+
+def multi_start_tests():
+    """
+    Tests multi-start global optimization function.
+    """
+    bounds = np.array([[-5.12, 5.12], [-5.12, 5.12]])
+    result = numerical_optimization.multi_start(rastrigin, bounds, n_starts=200, seed=0,
+                                                threshold=1e-8)
+    np.testing.assert_allclose(result.x, np.zeros(2), atol=1e-6, err_msg="Multi-start Test 1 Fail")
+    np.testing.assert_equal(result.runs, 200, err_msg="Multi-start Test 2 Fail")
+    converged = result.table[result.table["converged"]]
+    np.testing.assert_equal(np.all(np.diff(converged["fun"]) >= 0), True,
+                            err_msg="Multi-start Test 3 Fail")
+    np.testing.assert_equal(np.sum(result.table["hits"]), 200, err_msg="Multi-start Test 4 Fail")
+    np.testing.assert_equal(np.sum(result.table["f_evals"]), result.f_evals,
+                            err_msg="Multi-start Test 5 Fail")
+
+    # Duplicate minima are merged
+    np.testing.assert_equal(
+        len(np.unique(np.round(converged["x"], 3), axis=0)),
+        len(converged),
+        err_msg="Multi-start Test 6 Fail"
+    )
+
+    # Worker processes with basin elimination and an evaluation cap
+    result = numerical_optimization.multi_start(rastrigin, bounds, n_starts=64, seed=0,
+                                                sampling="sobol", workers=2, basin_radius=0.5,
+                                                max_evals=2000)
+    np.testing.assert_equal(result.f_evals <= 2000, True, err_msg="Multi-start Test 7 Fail")
+    np.testing.assert_equal(result.runs + result.skipped, 64, err_msg="Multi-start Test 8 Fail")
+    np.testing.assert_equal(result.skipped > 0, True, err_msg="Multi-start Test 9 Fail")
+
+    result = numerical_optimization.multi_start(rastrigin, bounds, n_starts=20, seed=1,
+                                                local_method=numerical_optimization.pattern_search)
+    np.testing.assert_equal(result.fun <= np.min(result.table["fun"][result.table["converged"]]),
+                            True, err_msg="Multi-start Test 10 Fail")
+
+    # Runs cut short by their budget are kept apart and never eliminate starts
+    result = numerical_optimization.multi_start(rastrigin, bounds, n_starts=10, seed=0,
+                                                local_max_evals=10, basin_radius=100)
+    np.testing.assert_equal((result.runs, result.skipped, len(result.table)), (10, 0, 10),
+                            err_msg="Multi-start Test 11 Fail")
+    np.testing.assert_equal(np.any(result.table["converged"]), False,
+                            err_msg="Multi-start Test 12 Fail")
+
+    np.testing.assert_raises(ValueError, numerical_optimization.multi_start, rastrigin,
+                             np.array([[1, 0]]))
+    np.testing.assert_raises(ValueError, numerical_optimization.multi_start, rastrigin, bounds,
+                             sampling="grid")
+
+
 if __name__ == "__main__":
     three_point_search_tests()
     print("Three Point Search Tests Passed")
     successive_parabolic_interpolation_tests()
     print("SPI Tests Passed")
+    brent_minimize_tests()
+    print("Brent Tests Passed")
     gradient_descent_tests()
     print("Gradient Descent Tests Passed")
+    gradient_descent_methods_tests()
+    print("Gradient Descent Methods Tests Passed")
+    stochastic_gradient_descent_tests()
+    print("SGD Tests Passed")
+    lbfgs_tests()
+    print("L-BFGS Tests Passed")
+    derivative_free_tests()
+    print("Derivative Free Tests Passed")
+    projected_optimization_tests()
+    print("Projected Optimization Tests Passed")
+    multi_start_tests()
+    print("Multi-start Tests Passed")
     print("Tests Passed")